@@ -0,0 +1,90 @@
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+import pandas as pd
+
+from fuzzy_allocator.normalize import flatten_columns
+
+DEFAULT_STORE_ROOT = Path("~/.cache/fuzzy_allocator/bars").expanduser()
+
+
+class BarStore:
+    """
+    Local on-disk OHLCV store keyed by (ticker, interval) and backed by Parquet.
+
+    Each (ticker, interval) pair is stored as `<root>/<interval>/<ticker>.parquet`
+    with flat OHLCV columns and a sorted DatetimeIndex. Writing requires a Parquet
+    engine such as `pyarrow`.
+
+    Args:
+        root (Union[str, Path]): Directory that holds the store.
+    """
+
+    def __init__(self, root: Union[str, Path] = DEFAULT_STORE_ROOT) -> None:
+        self.root = Path(root)
+
+    def path(self, ticker: str, interval: str) -> Path:
+        """
+        Returns the Parquet file backing (ticker, interval).
+        """
+        # Tickers such as "BRK/B" would otherwise create subdirectories
+        safe_ticker = ticker.replace("/", "_")
+        return self.root / interval / f"{safe_ticker}.parquet"
+
+    def load(self, ticker: str, interval: str) -> Optional[pd.DataFrame]:
+        """
+        Loads all stored bars for (ticker, interval), or None if nothing is stored.
+        """
+        path = self.path(ticker, interval)
+        if not path.exists():
+            return None
+        return pd.read_parquet(path)
+
+    def last_timestamp(self, ticker: str, interval: str) -> Optional[pd.Timestamp]:
+        """
+        Returns the timestamp of the newest stored bar, or None if nothing is stored.
+        """
+        df = self.load(ticker, interval)
+        if df is None or df.empty:
+            return None
+        return df.index[-1]
+
+    def append(
+        self,
+        ticker: str,
+        interval: str,
+        new_bars: pd.DataFrame,
+        stored: Optional[pd.DataFrame] = None,
+    ) -> pd.DataFrame:
+        """
+        Merges `new_bars` into the stored bars for (ticker, interval) and writes the
+        result back to disk.
+
+        Bars that share a timestamp with stored bars replace them, since the newest
+        stored bar may have been captured before it closed.
+
+        Args:
+            stored (Optional[pd.DataFrame]): The stored bars, if the caller has
+                already loaded them; saves reading the file again.
+
+        Returns:
+            pd.DataFrame: The full merged history.
+        """
+        new_bars = flatten_columns(new_bars)
+        if stored is None:
+            stored = self.load(ticker, interval)
+        if stored is not None and not stored.empty:
+            merged = pd.concat([stored, new_bars])
+            merged = merged[~merged.index.duplicated(keep="last")]
+        else:
+            merged = new_bars
+        merged = merged.sort_index()
+
+        path = self.path(ticker, interval)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so a crash never leaves a truncated store
+        tmp_path = path.with_suffix(".parquet.tmp")
+        merged.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+        return merged
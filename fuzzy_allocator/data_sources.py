@@ -0,0 +1,214 @@
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Union
+
+import pandas as pd
+import yfinance as yf
+
+from fuzzy_allocator.utils.periods import period_start
+
+
+def _chunks(items: List[str], size: int) -> List[List[str]]:
+    """
+    Splits a list of tickers into consecutive chunks of at most `size` items.
+    """
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def _split_batch(raw: pd.DataFrame, batch: List[str]) -> Dict[str, pd.DataFrame]:
+    """
+    Splits a multi-ticker `yf.download` result into one frame per ticker.
+
+    The batched download returns `MultiIndex` columns of (Ticker, Price); each
+    ticker's slice is returned with flat OHLCV columns. Tickers that failed to
+    download (all-NaN rows) are skipped.
+    """
+    data: Dict[str, pd.DataFrame] = {}
+    if raw.empty:
+        return data
+
+    for ticker in batch:
+        if isinstance(raw.columns, pd.MultiIndex):
+            if ticker not in raw.columns.get_level_values(0):
+                continue
+            frame = raw[ticker]
+        else:
+            # A single-ticker batch may come back with flat columns already
+            frame = raw
+        frame = frame.dropna(how="all")
+        if frame.empty:
+            continue
+        frame.columns.name = None
+        data[ticker] = frame.copy()
+    return data
+
+
+def _slice_window(
+    df: pd.DataFrame, period: str, start: Optional[pd.Timestamp] = None
+) -> pd.DataFrame:
+    """
+    Restricts a stored history to bars from `start`, or to the last `period` when
+    no start is given. The period is measured back from the newest bar rather than
+    from the wall clock, so stale offline archives still return a full window.
+    """
+    if df.empty:
+        return df
+    if start is None:
+        start = period_start(period, df.index[-1])
+    if start is None:
+        return df
+    return df[df.index >= start]
+
+
+class DataSource(ABC):
+    """
+    Interface for anything that can supply OHLCV bars for a ticker.
+
+    Implementations return frames indexed by timestamp with at least a "Close"
+    column, in the same shape the indicators in `trading_funcs` accept.
+    """
+
+    @abstractmethod
+    def fetch(
+        self,
+        ticker: str,
+        period: str,
+        interval: str,
+        start: Optional[pd.Timestamp] = None,
+    ) -> pd.DataFrame:
+        """
+        Returns bars for `ticker` at `interval`, covering the last `period` or, if
+        `start` is given, every bar from `start` (inclusive) onwards.
+        """
+
+    def fetch_many(
+        self,
+        tickers: List[str],
+        period: str,
+        interval: str,
+        batch_size: Optional[int] = None,
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Returns bars for several tickers. Sources that support multi-symbol
+        requests override this; the default fetches one ticker at a time.
+        """
+        return {ticker: self.fetch(ticker, period, interval) for ticker in tickers}
+
+
+class YFinanceSource(DataSource):
+    """
+    Downloads bars from Yahoo Finance via `yf.download`.
+    """
+
+    def fetch(
+        self,
+        ticker: str,
+        period: str,
+        interval: str,
+        start: Optional[pd.Timestamp] = None,
+    ) -> pd.DataFrame:
+        if start is not None:
+            return yf.download(ticker, start=start, interval=interval, progress=False)
+        return yf.download(ticker, period=period, interval=interval, progress=False)
+
+    def fetch_many(
+        self,
+        tickers: List[str],
+        period: str,
+        interval: str,
+        batch_size: Optional[int] = None,
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Requests up to `batch_size` symbols per `yf.download` call and splits the
+        result into per-ticker frames with flat OHLCV columns.
+        """
+        data: Dict[str, pd.DataFrame] = {}
+        for batch in _chunks(tickers, batch_size or len(tickers) or 1):
+            print(f"Downloading data for {len(batch)} tickers: {', '.join(batch)}...")
+            raw = yf.download(
+                batch,
+                period=period,
+                interval=interval,
+                group_by="ticker",
+                progress=False,
+            )
+            data.update(_split_batch(raw, batch))
+        return data
+
+
+class LocalDirectorySource(DataSource):
+    """
+    Serves bars from a local directory of CSV or Parquet files.
+
+    Files are expected at `<root>/<interval>/<ticker>.<ext>`, the layout written by
+    `BarStore`, so a store directory can be used directly as an offline archive.
+
+    Args:
+        root (Union[str, Path]): Archive directory.
+        file_format (str): Either "parquet" or "csv".
+    """
+
+    def __init__(self, root: Union[str, Path], file_format: str = "parquet") -> None:
+        if file_format not in ("parquet", "csv"):
+            raise ValueError(f"Unsupported file format: {file_format!r}")
+        self.root = Path(root)
+        self.file_format = file_format
+
+    def path(self, ticker: str, interval: str) -> Path:
+        """
+        Returns the file holding bars for (ticker, interval).
+        """
+        safe_ticker = ticker.replace("/", "_")
+        return self.root / interval / f"{safe_ticker}.{self.file_format}"
+
+    def _read(self, path: Path) -> pd.DataFrame:
+        if self.file_format == "parquet":
+            return pd.read_parquet(path)
+        df = pd.read_csv(path, index_col=0)
+        # Exchange-local timestamps carry mixed UTC offsets across DST changes
+        df.index = pd.to_datetime(df.index, utc=True)
+        return df
+
+    def fetch(
+        self,
+        ticker: str,
+        period: str,
+        interval: str,
+        start: Optional[pd.Timestamp] = None,
+    ) -> pd.DataFrame:
+        path = self.path(ticker, interval)
+        if not path.exists():
+            raise FileNotFoundError(f"No {interval} bars for {ticker} at {path}")
+        return _slice_window(self._read(path).sort_index(), period, start)
+
+
+class InMemorySource(DataSource):
+    """
+    Serves bars from frames held in memory, e.g. for tests and benchmarks.
+
+    Args:
+        frames (Mapping[str, pd.DataFrame]): Bars per ticker. The same frame is
+            returned for every interval.
+        latency (float): Seconds to sleep before each fetch, to simulate a slow
+            remote source when exercising the concurrent fetch paths.
+    """
+
+    def __init__(
+        self, frames: Mapping[str, pd.DataFrame], latency: float = 0.0
+    ) -> None:
+        self.frames = dict(frames)
+        self.latency = latency
+
+    def fetch(
+        self,
+        ticker: str,
+        period: str,
+        interval: str,
+        start: Optional[pd.Timestamp] = None,
+    ) -> pd.DataFrame:
+        if self.latency:
+            time.sleep(self.latency)
+        if ticker not in self.frames:
+            raise KeyError(f"No bars for {ticker}")
+        return _slice_window(self.frames[ticker], period, start)
@@ -1,13 +1,36 @@
-from typing import List
+from typing import Dict, List, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
-from fuzzy_allocator.fetch_historical_data import download_ticker_data
-from fuzzy_allocator.trading_funcs import (
-    compute_bb_percentile,
-    compute_ema_trend,
-    compute_pmarp,
+from fuzzy_allocator.bar_store import BarStore
+from fuzzy_allocator.data_sources import DataSource, YFinanceSource
+from fuzzy_allocator.fetch_historical_data import (
+    download_multi_interval,
+    download_ticker_data,
+    download_ticker_data_async,
+    fetch_bars,
+    iter_ticker_data,
 )
+from fuzzy_allocator.fetch_planner import plan_period
+from fuzzy_allocator.frame_cache import FrameCache
+from fuzzy_allocator.indicator_pipeline import IndicatorPipeline, IndicatorResult
+from fuzzy_allocator.memo import IndicatorMemo, run_pipeline
+from fuzzy_allocator.normalize import normalize_frame
+from fuzzy_allocator.panel import compute_panel
+from fuzzy_allocator.parallel import analyze_parallel
+from fuzzy_allocator.signals import (
+    TickerAnalysis,
+    buy_signal,
+    classify_final,
+    evaluate_signals,
+    final_signal,
+    final_signal_labels,
+    take_profit_signal,
+)
+from fuzzy_allocator.staged_pipeline import Stage, StageError, run_stages
+from fuzzy_allocator.utils.cache_dir import cache_dir
+from fuzzy_allocator.utils.rate_limit import TokenBucket
 
 
 def generate_take_profit_signal(
@@ -17,23 +40,21 @@ def generate_take_profit_signal(
 ) -> str:
     """
     Generates a take profit signal based on the PMARP percentile.
+
+    See `signals.take_profit_signal` for the structured record.
     """
-    if pmarp_percentile >= long_term_threshold:
-        return f"Long-term signal: PMARP percentile at {pmarp_percentile:.1f}%. Consider selling (take profit)."
-    elif pmarp_percentile >= standard_threshold:
-        return f"Standard signal: PMARP percentile at {pmarp_percentile:.1f}%. Potential take profit signal."
-    else:
-        return f"No take profit signal: PMARP percentile at {pmarp_percentile:.1f}%."
+    return str(
+        take_profit_signal(pmarp_percentile, standard_threshold, long_term_threshold)
+    )
 
 
 def generate_buy_signal(pmarp_percentile: float, buy_threshold: float = 25) -> str:
     """
     Generates a buy signal based on the PMARP percentile.
+
+    See `signals.buy_signal` for the structured record.
     """
-    if pmarp_percentile <= buy_threshold:
-        return f"Buy signal: PMARP percentile is {pmarp_percentile:.1f}%, which is below the buy threshold of {buy_threshold}%."
-    else:
-        return f"No buy signal: PMARP percentile is {pmarp_percentile:.1f}% (buy threshold is {buy_threshold}%)."
+    return str(buy_signal(pmarp_percentile, buy_threshold))
 
 
 def generate_final_signal(
@@ -47,30 +68,34 @@ def generate_final_signal(
     A final signal of "Buy" is returned if both indicators are below the buy threshold,
     "Sell" if both are above the sell threshold, and "Hold" otherwise.
     """
-    if pmarp_percentile <= buy_threshold and bb_percentile <= buy_threshold:
-        return "Buy"
-    elif pmarp_percentile >= sell_threshold and bb_percentile >= sell_threshold:
-        return "Sell"
-    else:
-        return "Hold"
+    return str(
+        final_signal(pmarp_percentile, bb_percentile, buy_threshold, sell_threshold)
+    )
+
 
+_DEFAULT_PIPELINE = IndicatorPipeline(
+    pmarp_period=50,
+    pmarp_lookback=100,
+    bb_period=20,
+    bb_lookback=100,
+    short_period=50,
+    long_period=200,
+)
 
-def analyze_ticker(df: pd.DataFrame) -> None:
+
+def print_analysis(analysis: TickerAnalysis) -> None:
     """
-    Analyzes a ticker's DataFrame and prints the PMARP, Bollinger Bands percentile,
-    EMA trend, buy signal, take profit signal, and final signal.
+    Prints a ticker's PMARP, Bollinger Bands percentile, EMA trend, buy signal,
+    take profit signal, and final signal.
     """
-    # Compute PMARP and Bollinger Bands results
-    pmarp_results = compute_pmarp(df, ma_period=50, lookback=100)
-    bb_results = compute_bb_percentile(df, ma_period=20, lookback=100)
+    pmarp_results, bb_results, trend = analysis.indicators
 
     if pmarp_results:
         current_ratio, pmarp_percentile = pmarp_results
         print(f"[INFO] PMARP: {current_ratio:.4f}, Percentile: {pmarp_percentile:.1f}%")
-        tp_signal = generate_take_profit_signal(pmarp_percentile)
-        buy_signal = generate_buy_signal(pmarp_percentile, buy_threshold=25)
-        print(f"[INFO] {tp_signal}")
-        print(f"[INFO] {buy_signal}")
+        # Signal records are only turned into messages when printed
+        print(f"[INFO] {analysis.take_profit}")
+        print(f"[INFO] {analysis.buy}")
     else:
         print("[ERROR] Insufficient data for PMARP computation.")
 
@@ -82,23 +107,333 @@ def analyze_ticker(df: pd.DataFrame) -> None:
     else:
         print("[ERROR] Insufficient data for Bollinger Bands percentile computation.")
 
-    # Compute trend using EMAs
-    trend = compute_ema_trend(df, short_period=50, long_period=200)
     print(f"[INFO] Trend: {trend}")
 
-    # If both PMARP and Bollinger Bands results are available, generate a final signal.
-    if pmarp_results and bb_results:
-        final_signal = generate_final_signal(
-            pmarp_percentile, bb_percentile, buy_threshold=25, sell_threshold=90
+    # If both PMARP and Bollinger Bands results are available, there is a final signal.
+    if analysis.final is not None:
+        print(f"[INFO] Final Signal: {analysis.final}")
+
+
+def analyze_ticker(
+    df: pd.DataFrame,
+    pipeline: Optional[IndicatorPipeline] = None,
+    memo: Optional[IndicatorMemo] = None,
+) -> None:
+    """
+    Analyzes a ticker's DataFrame and prints the PMARP, Bollinger Bands percentile,
+    EMA trend, buy signal, take profit signal, and final signal.
+
+    Args:
+        df (pd.DataFrame): Historical price data for one ticker.
+        pipeline (Optional[IndicatorPipeline]): Indicator settings; defaults to
+            PMARP(50, 100), Bollinger Bands(20, 100) and EMAs(50, 200).
+        memo (Optional[IndicatorMemo]): Reuses the indicators computed earlier for
+            the same closes and settings.
+    """
+    pipeline = pipeline or _DEFAULT_PIPELINE
+    # PMARP, Bollinger Bands and the EMA trend in one pass over the closes
+    if memo is not None:
+        indicators = run_pipeline(pipeline, df, memo)
+    else:
+        indicators = pipeline.run(df)
+    print_analysis(evaluate_signals(indicators, buy_threshold=25, sell_threshold=90))
+
+
+# Default pace of `main`'s concurrent requests to Yahoo Finance: requests per
+# second and burst size
+DEFAULT_REQUEST_RATE = 2.0
+DEFAULT_REQUEST_BURST = 8
+
+# Default worker threads per stage of the staged `main`
+STAGE_WORKERS = {"fetch": 8, "normalize": 1, "indicators": 2, "signals": 1}
+
+
+def _analysis_stages(
+    period: str,
+    interval: str,
+    stage_workers: Dict[str, int],
+    queue_size: int,
+    store: Optional[BarStore],
+    source: Optional[DataSource],
+    cache: Optional[FrameCache],
+    memo: Optional[IndicatorMemo],
+    rate_limiter: Optional[TokenBucket],
+) -> List[Stage]:
+    """
+    Builds the fetch, normalize, indicators and signals stages of the staged
+    `main`, which turn a ticker into its `TickerAnalysis`.
+    """
+    source = source or YFinanceSource()
+    workers = {**STAGE_WORKERS, **stage_workers}
+
+    def fetch(ticker: str) -> Tuple[str, pd.DataFrame, bool]:
+        df = cache.get(ticker, period, interval) if cache is not None else None
+        if df is not None:
+            return ticker, df, True
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        return ticker, fetch_bars(ticker, period, interval, source, store), False
+
+    def normalize(fetched: Tuple[str, pd.DataFrame, bool]) -> pd.DataFrame:
+        ticker, df, cached = fetched
+        if cached:
+            return df
+        df = normalize_frame(df, ticker)
+        if cache is not None:
+            cache.put(ticker, period, interval, df)
+        return df
+
+    def indicators(df: pd.DataFrame) -> IndicatorResult:
+        if memo is not None:
+            return run_pipeline(_DEFAULT_PIPELINE, df, memo)
+        return _DEFAULT_PIPELINE.run(df)
+
+    def signals(result: IndicatorResult) -> TickerAnalysis:
+        return evaluate_signals(result, buy_threshold=25, sell_threshold=90)
+
+    return [
+        Stage("fetch", fetch, workers["fetch"], queue_size),
+        Stage("normalize", normalize, workers["normalize"], queue_size),
+        Stage("indicators", indicators, workers["indicators"], queue_size),
+        Stage("signals", signals, workers["signals"], queue_size),
+    ]
+
+
+def _print_result(ticker: str, result: Union[TickerAnalysis, StageError]) -> None:
+    """
+    Sink of the staged `main`: prints a ticker's analysis or why it has none.
+    """
+    if isinstance(result, StageError):
+        if result.stage == "fetch":
+            print(f"[ERROR] Failed to download {ticker}: {result.error}")
+        else:
+            print(f"[ERROR] {result.stage} failed for {ticker}: {result.error}")
+        return
+    print(f"\n=== {ticker} Analysis ===")
+    print_analysis(result)
+
+
+def main(
+    tickers: List[str],
+    period: Optional[str],
+    interval: str,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    store: Optional[BarStore] = None,
+    source: Optional[DataSource] = None,
+    cache: Optional[FrameCache] = None,
+    memo: Optional[IndicatorMemo] = None,
+    processes: Optional[int] = None,
+    stage_workers: Optional[Dict[str, int]] = None,
+    queue_size: int = 16,
+    rate_limiter: Optional[TokenBucket] = None,
+) -> None:
+    """
+    Downloads and analyzes every ticker.
+
+    With `period` None, only as much history as the indicators need is requested,
+    as planned by `plan_period`.
+
+    By default tickers are streamed one at a time so only one frame is held in
+    memory. With `max_workers` set, the universe is downloaded concurrently first
+    and then analyzed. With a `memo`, tickers whose bars are unchanged since an
+    earlier scan reuse their indicators, and a persistent memo is saved at the end.
+
+    With `processes` set, the downloaded universe is analyzed on that many worker
+    processes reading the prices from shared memory (see `analyze_parallel`); the
+    output is the same, in ticker order.
+
+    With `stage_workers` set, tickers flow through fetch, normalize, indicators,
+    signals and output stages connected by queues of `queue_size` (see
+    `run_stages`), so downloads, computation and printing overlap. It maps stage
+    names to thread counts; stages left out use `STAGE_WORKERS`. Output is in
+    ticker order.
+
+    Concurrent downloads (`max_workers`, `processes` or `stage_workers`) share
+    `rate_limiter`. Against the default yfinance source they are paced at
+    `DEFAULT_REQUEST_RATE` requests per second when none is given.
+    """
+    if rate_limiter is None and source is None:
+        rate_limiter = TokenBucket(DEFAULT_REQUEST_RATE, DEFAULT_REQUEST_BURST)
+
+    if period is None:
+        period = plan_period(_DEFAULT_PIPELINE.warmup_bars, interval)
+        print(f"[INFO] Requesting period={period} of {interval} bars.")
+
+    if stage_workers is not None:
+        stages = _analysis_stages(
+            period,
+            interval,
+            stage_workers,
+            queue_size,
+            store,
+            source,
+            cache,
+            memo,
+            rate_limiter,
         )
-        print(f"[INFO] Final Signal: {final_signal}")
+        run_stages(((ticker, ticker) for ticker in tickers), stages, _print_result)
+        if memo is not None:
+            memo.save()
+        return
+
+    if max_workers or processes:
+        data = download_ticker_data(
+            tickers,
+            period,
+            interval,
+            max_workers=max_workers,
+            rate_limiter=rate_limiter,
+            timeout=timeout,
+            store=store,
+            source=source,
+            cache=cache,
+        )
+        stream = iter(data.items())
+    else:
+        stream = iter_ticker_data(
+            tickers, period, interval, store=store, source=source, cache=cache
+        )
+
+    if processes:
+        analyses = analyze_parallel(data, processes, _DEFAULT_PIPELINE, memo)
+        for ticker, analysis in analyses.items():
+            print(f"\n=== {ticker} Analysis ===")
+            print_analysis(analysis)
+    else:
+        for ticker, df in stream:
+            print(f"\n=== {ticker} Analysis ===")
+            analyze_ticker(df, memo=memo)
+
+    if memo is not None:
+        memo.save()
+
+
+def _per_ticker(
+    thresholds: Union[float, Dict[str, float]], tickers: pd.Index, default: float
+) -> Union[float, np.ndarray]:
+    """
+    Expands a per-ticker threshold mapping into an array aligned with `tickers`.
+    """
+    if isinstance(thresholds, dict):
+        return np.array([thresholds.get(ticker, default) for ticker in tickers])
+    return thresholds
+
+
+def main_panel(
+    tickers: List[str],
+    period: str,
+    interval: str,
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    store: Optional[BarStore] = None,
+    source: Optional[DataSource] = None,
+    cache: Optional[FrameCache] = None,
+    pipeline: Optional[IndicatorPipeline] = None,
+    buy_thresholds: Union[float, Dict[str, float]] = 25,
+    sell_thresholds: Union[float, Dict[str, float]] = 90,
+) -> pd.DataFrame:
+    """
+    Downloads the universe and computes the `analyze_ticker` indicators and final
+    signal for every ticker at once on a (time x ticker) panel, printing one table
+    instead of a block per ticker.
+
+    Args:
+        buy_thresholds (Union[float, Dict[str, float]]): Final signal buy
+            threshold, shared or per ticker (tickers missing from the mapping use
+            25).
+        sell_thresholds (Union[float, Dict[str, float]]): Final signal sell
+            threshold, shared or per ticker (default 90).
+
+    Returns:
+        pd.DataFrame: One row per ticker, see `panel_indicators`, plus a
+        "Final_Signal" column that is None where a percentile is missing.
+    """
+    data = download_ticker_data(
+        tickers,
+        period,
+        interval,
+        max_workers=max_workers,
+        timeout=timeout,
+        store=store,
+        source=source,
+        cache=cache,
+    )
+    result = compute_panel(data, pipeline)
+
+    codes = classify_final(
+        result["PMARP_Percentile"].to_numpy(),
+        result["BB_Percentile"].to_numpy(),
+        _per_ticker(buy_thresholds, result.index, 25),
+        _per_ticker(sell_thresholds, result.index, 90),
+    )
+    labels = final_signal_labels(codes)
+    labels[result[["PMARP_Percentile", "BB_Percentile"]].isna().any(axis=1)] = None
+    result["Final_Signal"] = labels
+    print(f"\n=== Panel Analysis ({len(result)} tickers) ===")
+    print(result.to_string(float_format="{:.4f}".format))
+    return result
+
+
+def main_multi_interval(
+    tickers: List[str],
+    period: str,
+    intervals: List[str],
+    base_interval: str = "1h",
+    source: Optional[DataSource] = None,
+) -> None:
+    """
+    Runs the analysis for every interval in `intervals` from one download of
+    `base_interval` bars, resampling locally for the coarser intervals.
+    """
+    data = download_multi_interval(
+        tickers, period, intervals, base_interval=base_interval, source=source
+    )
+    for interval, frames in data.items():
+        for ticker, df in frames.items():
+            print(f"\n=== {ticker} Analysis ({interval}) ===")
+            analyze_ticker(df)
+
+
+async def main_async(
+    tickers: List[str],
+    period: Optional[str],
+    interval: str,
+    max_concurrency: int = 8,
+    rate_limiter: Optional[TokenBucket] = None,
+    source: Optional[DataSource] = None,
+    store: Optional[BarStore] = None,
+    memo: Optional[IndicatorMemo] = None,
+) -> None:
+    """
+    Asynchronous variant of `main` that analyzes each ticker as soon as its download
+    completes, while the remaining downloads are still in flight. Output is in
+    completion order; failed downloads are reported and skipped.
+
+    Run it with `asyncio.run(main_async(...))`. As in `main`, requests to the
+    default yfinance source are paced at `DEFAULT_REQUEST_RATE` requests per
+    second unless `rate_limiter` is given.
+    """
+    if rate_limiter is None and source is None:
+        rate_limiter = TokenBucket(DEFAULT_REQUEST_RATE, DEFAULT_REQUEST_BURST)
 
+    if period is None:
+        period = plan_period(_DEFAULT_PIPELINE.warmup_bars, interval)
+        print(f"[INFO] Requesting period={period} of {interval} bars.")
 
-def main(tickers: List[str], period: str, interval: str) -> None:
-    data = download_ticker_data(tickers, period, interval)
-    for ticker, df in data.items():
+    async for ticker, df in download_ticker_data_async(
+        tickers,
+        period,
+        interval,
+        max_concurrency=max_concurrency,
+        rate_limiter=rate_limiter,
+        source=source,
+        store=store,
+    ):
         print(f"\n=== {ticker} Analysis ===")
-        analyze_ticker(df)
+        analyze_ticker(df, memo=memo)
+    if memo is not None:
+        memo.save()
 
 
 if __name__ == "__main__":
@@ -113,4 +448,15 @@ if __name__ == "__main__":
         "CMG",
         "PANW",
     ]  # Example: using NVDA for testing
-    main(tickers, period="1y", interval="4h")
+    # Bars and indicator results persist between runs only when a cache
+    # directory is configured
+    root = cache_dir()
+    main(
+        tickers,
+        period=None,
+        interval="4h",
+        max_workers=4,
+        timeout=60,
+        store=BarStore(root / "bars") if root else None,
+        memo=IndicatorMemo(path=root / "indicators.pkl" if root else None),
+    )
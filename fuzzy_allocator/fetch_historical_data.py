@@ -1,27 +1,452 @@
-from typing import Dict, List
+import asyncio
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
 import pandas as pd
-import yfinance as yf
+
+from fuzzy_allocator.bar_store import BarStore
+from fuzzy_allocator.data_sources import DataSource, YFinanceSource
+from fuzzy_allocator.frame_cache import FrameCache
+from fuzzy_allocator.normalize import normalize_frame
+from fuzzy_allocator.resample import resample_ohlcv
+from fuzzy_allocator.utils.periods import interval_to_timedelta, period_start
+from fuzzy_allocator.utils.rate_limit import TokenBucket
 
 tickers = ["AAPL", "MSFT", "NVDA", "GOOGL", "AMZN", "META", "TSLA"]
 
 
-def download_ticker_data(
-    tickers: List[str], period=str, interval=str
+def _fetch_incremental(
+    ticker: str, period: str, interval: str, source: DataSource, store: BarStore
+) -> pd.DataFrame:
+    """
+    Tops up the stored bars for (ticker, interval) and returns the last `period`.
+
+    Only bars from the newest stored timestamp onwards are downloaded; the newest
+    stored bar is re-fetched because it may have been captured before it closed.
+    A ticker with nothing stored yet is seeded with a full `period` download.
+    Requesting a longer `period` than the store was seeded with does not backfill.
+    """
+    # The stored bars are read once and reused for the merge
+    history = store.load(ticker, interval)
+    if history is None:
+        history = pd.DataFrame()
+    if history.empty:
+        new_bars = source.fetch(ticker, period, interval)
+    else:
+        new_bars = source.fetch(ticker, period, interval, start=history.index[-1])
+
+    if new_bars.empty:
+        if history.empty:
+            return new_bars
+    else:
+        history = store.append(ticker, interval, new_bars, stored=history)
+
+    start = period_start(period, history.index[-1])
+    if start is not None:
+        history = history[history.index >= start]
+    return history
+
+
+def fetch_bars(
+    ticker: str,
+    period: str,
+    interval: str,
+    source: DataSource,
+    store: Optional[BarStore] = None,
+) -> pd.DataFrame:
+    """
+    Fetches one ticker's bars from `source`, topping up `store` instead when one
+    is given. The frame is returned as the source delivers it, before
+    `normalize_frame`.
+    """
+    if store is None:
+        return source.fetch(ticker, period, interval)
+    return _fetch_incremental(ticker, period, interval, source, store)
+
+
+def _fetch(
+    ticker: str,
+    period: str,
+    interval: str,
+    source: DataSource,
+    store: Optional[BarStore] = None,
+    float32: bool = False,
+) -> pd.DataFrame:
+    """
+    Fetches one ticker (see `fetch_bars`) and normalizes the result (see
+    `normalize_frame`).
+    """
+    df = fetch_bars(ticker, period, interval, source, store)
+    return normalize_frame(df, ticker, float32=float32)
+
+
+def download_ticker_data_concurrent(
+    tickers: List[str],
+    period: str,
+    interval: str,
+    max_workers: int = 8,
+    max_in_flight: Optional[int] = None,
+    rate_limiter: Optional[TokenBucket] = None,
+    timeout: Optional[float] = None,
+    source: Optional[DataSource] = None,
+    store: Optional[BarStore] = None,
+    float32: bool = False,
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, Exception]]:
+    """
+    Downloads ticker data concurrently over a bounded thread pool.
+
+    Args:
+        tickers (List[str]): Ticker symbols to download.
+        period (str): yfinance period string.
+        interval (str): yfinance interval string.
+        max_workers (int): Number of worker threads.
+        max_in_flight (Optional[int]): Maximum number of requests outstanding at the
+            data source at once. Defaults to `max_workers`.
+        rate_limiter (Optional[TokenBucket]): Limiter shared by all requests to the
+            source; each request consumes one token before it is sent.
+        timeout (Optional[float]): Overall deadline in seconds. Tickers that have not
+            finished by then are reported as `TimeoutError` instead of blocking the run.
+        source (Optional[DataSource]): Where bars come from. Defaults to yfinance;
+            an `InMemorySource` with `latency` set gives a local fake for testing.
+        store (Optional[BarStore]): If set, top up the store incrementally.
+        float32 (bool): Store the normalized frames as float32.
+
+    Returns:
+        Tuple containing:
+          - mapping of ticker to DataFrame for every successful download
+          - mapping of ticker to the exception raised for every failed download
+    """
+    source = source or YFinanceSource()
+    in_flight = threading.BoundedSemaphore(max_in_flight or max_workers)
+
+    def fetch_one(ticker: str) -> pd.DataFrame:
+        with in_flight:
+            if rate_limiter is not None:
+                rate_limiter.acquire()
+            return _fetch(ticker, period, interval, source, store, float32)
+
+    data: Dict[str, pd.DataFrame] = {}
+    errors: Dict[str, Exception] = {}
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {executor.submit(fetch_one, ticker): ticker for ticker in tickers}
+        pending = set(futures)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while pending:
+            remaining = (
+                None if deadline is None else max(0.0, deadline - time.monotonic())
+            )
+            done, pending = wait(
+                pending, timeout=remaining, return_when=FIRST_COMPLETED
+            )
+            if not done:
+                # Deadline reached; report the stragglers and stop waiting on them
+                for future in pending:
+                    future.cancel()
+                    errors[futures[future]] = TimeoutError(
+                        f"No data received within {timeout}s"
+                    )
+                break
+            for future in done:
+                ticker = futures[future]
+                try:
+                    data[ticker] = future.result()
+                except Exception as exc:  # pylint: disable=broad-except
+                    errors[ticker] = exc
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return data, errors
+
+
+async def download_ticker_data_async(
+    tickers: List[str],
+    period: str,
+    interval: str,
+    max_concurrency: int = 8,
+    rate_limiter: Optional[TokenBucket] = None,
+    source: Optional[DataSource] = None,
+    store: Optional[BarStore] = None,
+    float32: bool = False,
+) -> AsyncIterator[Tuple[str, pd.DataFrame]]:
+    """
+    Asynchronously downloads ticker data, yielding each ticker as soon as its
+    download finishes.
+
+    Downloads run in worker threads so the event loop stays free for the consumer
+    to process completed tickers while others are still in flight.
+
+    Args:
+        tickers (List[str]): Ticker symbols to download.
+        period (str): yfinance period string.
+        interval (str): yfinance interval string.
+        max_concurrency (int): Maximum number of downloads in flight at once.
+        rate_limiter (Optional[TokenBucket]): Limiter shared by all requests.
+        source (Optional[DataSource]): Where bars come from. Defaults to yfinance.
+        store (Optional[BarStore]): If set, top up the store incrementally.
+        float32 (bool): Store the normalized frames as float32.
+
+    Yields:
+        Tuple of (ticker, DataFrame) in completion order. Failed downloads are
+        reported and skipped.
+    """
+    source = source or YFinanceSource()
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    def fetch_blocking(ticker: str) -> pd.DataFrame:
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        return _fetch(ticker, period, interval, source, store, float32)
+
+    async def fetch_one(ticker: str) -> Tuple[str, pd.DataFrame]:
+        async with semaphore:
+            return ticker, await asyncio.to_thread(fetch_blocking, ticker)
+
+    tasks = {asyncio.ensure_future(fetch_one(ticker)): ticker for ticker in tickers}
+    try:
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                try:
+                    yield task.result()
+                except Exception as exc:  # pylint: disable=broad-except
+                    print(f"[ERROR] Failed to download {tasks[task]}: {exc}")
+    finally:
+        # The consumer may stop early; don't leave downloads running unattended
+        for task in tasks:
+            task.cancel()
+
+
+def _download(
+    tickers: List[str],
+    period: str,
+    interval: str,
+    batch_size: Optional[int],
+    max_workers: Optional[int],
+    rate_limiter: Optional[TokenBucket],
+    timeout: Optional[float],
+    store: Optional[BarStore],
+    source: DataSource,
+    float32: bool,
 ) -> Dict[str, pd.DataFrame]:
     """
-    Download ticker data
+    Downloads `tickers` through the batched, concurrent or serial path.
     """
+    if batch_size:
+        raw = source.fetch_many(tickers, period, interval, batch_size=batch_size)
+        return {
+            ticker: normalize_frame(df, ticker, float32=float32)
+            for ticker, df in raw.items()
+        }
+
+    if max_workers:
+        data, errors = download_ticker_data_concurrent(
+            tickers,
+            period,
+            interval,
+            max_workers=max_workers,
+            rate_limiter=rate_limiter,
+            timeout=timeout,
+            source=source,
+            store=store,
+            float32=float32,
+        )
+        for ticker, exc in errors.items():
+            print(f"[ERROR] Failed to download {ticker}: {exc}")
+        return data
+
     data: Dict[str, pd.DataFrame] = {}
     for ticker in tickers:
         print(f"Downloading data for {ticker}...")
-        data[ticker] = yf.download(ticker, period=period, interval=interval)
+        data[ticker] = _fetch(ticker, period, interval, source, store, float32)
     return data
 
 
+def download_ticker_data(
+    tickers: List[str],
+    period: str,
+    interval: str,
+    batch_size: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    rate_limiter: Optional[TokenBucket] = None,
+    timeout: Optional[float] = None,
+    store: Optional[BarStore] = None,
+    source: Optional[DataSource] = None,
+    cache: Optional[FrameCache] = None,
+    float32: bool = False,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Download ticker data
+
+    Args:
+        tickers (List[str]): Ticker symbols to download.
+        period (str): yfinance period string, e.g. "6mo" or "1y".
+        interval (str): yfinance interval string, e.g. "1h" or "1d".
+        batch_size (Optional[int]): If set, request up to `batch_size` symbols per
+            call via `source.fetch_many` instead of one call per ticker. Each
+            ticker's frame is returned with flat OHLCV columns.
+        max_workers (Optional[int]): If set, download tickers concurrently over a
+            thread pool of this size (see `download_ticker_data_concurrent`).
+            Failed tickers are reported and left out of the result.
+        rate_limiter (Optional[TokenBucket]): Rate limiter for the concurrent path.
+        timeout (Optional[float]): Overall deadline in seconds for the concurrent path.
+        store (Optional[BarStore]): If set, only bars newer than the last stored
+            timestamp are downloaded and appended to the store; the returned frames
+            cover `period` from the stored history. Cannot be combined with
+            `batch_size`.
+        source (Optional[DataSource]): Where bars come from. Defaults to yfinance.
+        cache (Optional[FrameCache]): If set, tickers with a live cached frame for
+            (ticker, period, interval) are served from it and only the rest are
+            downloaded. Cached frames are shared and must not be modified.
+        float32 (bool): Store the frames as float32 to halve their memory.
+
+    Returns:
+        Dict[str, pd.DataFrame]: Mapping of ticker to its historical data, each
+        normalized to flat OHLCV columns over a sorted, de-duplicated
+        DatetimeIndex (see `normalize_frame`).
+    """
+    if batch_size and store is not None:
+        raise ValueError("batch_size cannot be combined with store")
+
+    source = source or YFinanceSource()
+    if cache is None:
+        return _download(
+            tickers,
+            period,
+            interval,
+            batch_size,
+            max_workers,
+            rate_limiter,
+            timeout,
+            store,
+            source,
+            float32,
+        )
+
+    cached: Dict[str, pd.DataFrame] = {}
+    for ticker in tickers:
+        df = cache.get(ticker, period, interval, float32)
+        if df is not None:
+            cached[ticker] = df
+    misses = [ticker for ticker in tickers if ticker not in cached]
+
+    fetched = _download(
+        misses,
+        period,
+        interval,
+        batch_size,
+        max_workers,
+        rate_limiter,
+        timeout,
+        store,
+        source,
+        float32,
+    )
+    for ticker, df in fetched.items():
+        cache.put(ticker, period, interval, df, float32)
+
+    # Keep the caller's ticker order
+    merged = {**cached, **fetched}
+    return {ticker: merged[ticker] for ticker in tickers if ticker in merged}
+
+
+def iter_ticker_data(
+    tickers: List[str],
+    period: str,
+    interval: str,
+    store: Optional[BarStore] = None,
+    source: Optional[DataSource] = None,
+    cache: Optional[FrameCache] = None,
+    float32: bool = False,
+) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    Streaming variant of `download_ticker_data` that downloads and yields one
+    ticker at a time.
+
+    No reference to a frame is kept once it has been yielded, so peak memory is
+    bounded by the largest single frame instead of the whole universe, provided
+    the consumer drops each frame before asking for the next one.
+
+    Args:
+        tickers (List[str]): Ticker symbols to download.
+        period (str): yfinance period string.
+        interval (str): yfinance interval string.
+        store (Optional[BarStore]): If set, top up the store incrementally.
+        source (Optional[DataSource]): Where bars come from. Defaults to yfinance.
+        cache (Optional[FrameCache]): If set, serve live cached frames from it and
+            cache newly downloaded ones.
+        float32 (bool): Store the normalized frames as float32.
+
+    Yields:
+        Tuple of (ticker, DataFrame) in `tickers` order. Failed downloads are
+        reported and skipped.
+    """
+    source = source or YFinanceSource()
+    for ticker in tickers:
+        if cache is not None:
+            df = cache.get(ticker, period, interval, float32)
+        else:
+            df = None
+        if df is None:
+            print(f"Downloading data for {ticker}...")
+            try:
+                df = _fetch(ticker, period, interval, source, store, float32)
+            except Exception as exc:  # pylint: disable=broad-except
+                print(f"[ERROR] Failed to download {ticker}: {exc}")
+                continue
+            if cache is not None:
+                cache.put(ticker, period, interval, df, float32)
+        yield ticker, df
+        del df
+
+
+def download_multi_interval(
+    tickers: List[str],
+    period: str,
+    intervals: List[str],
+    base_interval: str = "1h",
+    **kwargs,
+) -> Dict[str, Dict[str, pd.DataFrame]]:
+    """
+    Serves several intervals from a single download of `base_interval` bars.
+
+    Bars for every other interval are resampled locally from the base bars (see
+    `resample_ohlcv`), so running a universe at 1h, 4h and 1d costs one 1h
+    download. Each interval must be at least as coarse as `base_interval`, and the
+    history covered is limited to what yfinance serves at `base_interval` (about
+    two years for 1h bars).
+
+    Keyword arguments are forwarded to `download_ticker_data`.
+
+    Returns:
+        Dict[str, Dict[str, pd.DataFrame]]: Mapping of interval to a mapping of
+        ticker to its bars.
+    """
+    base = interval_to_timedelta(base_interval)
+    for interval in intervals:
+        if interval_to_timedelta(interval) < base:
+            raise ValueError(
+                f"Cannot derive {interval} bars from coarser {base_interval} bars"
+            )
+
+    data = download_ticker_data(tickers, period, base_interval, **kwargs)
+    return {
+        interval: (
+            data
+            if interval == base_interval
+            else {ticker: resample_ohlcv(df, interval) for ticker, df in data.items()}
+        )
+        for interval in intervals
+    }
+
+
 if __name__ == "__main__":
     tickers = ["AAPL", "MSFT", "NVDA", "GOOGL", "AMZN", "META", "TSLA"]
-    data = download_ticker_data(tickers, period="6mo", interval="1d")
+    data = download_ticker_data(tickers, period="6mo", interval="1d", batch_size=50)
 
     # Print the first few rows of data for each ticker
     for ticker, df in data.items():
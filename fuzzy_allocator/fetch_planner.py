@@ -0,0 +1,84 @@
+import math
+import re
+from typing import List, Optional
+
+import pandas as pd
+
+from fuzzy_allocator.utils.periods import interval_to_timedelta, is_intraday
+from fuzzy_allocator.utils.sessions import SESSION_LENGTH, TRADING_DAYS_PER_YEAR
+
+# yfinance periods from shortest to longest
+PERIODS: List[str] = ["1d", "5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "10y", "max"]
+
+_DAYS_PER_UNIT = {"d": 1.0, "wk": 7.0, "mo": 365.25 / 12, "y": 365.25}
+_TRADING_DAYS_PER_CALENDAR_DAY = TRADING_DAYS_PER_YEAR / 365.25
+
+
+def _calendar_days(period: str) -> float:
+    count, unit = re.match(r"^(\d+)(\D+)$", period).groups()
+    return int(count) * _DAYS_PER_UNIT[unit]
+
+
+def max_period(interval: str) -> Optional[str]:
+    """
+    Returns the longest period yfinance serves for `interval`, or None if any
+    period is available.
+
+    Minute bars only go back about a week, other sub-hourly bars 60 days and
+    hourly bars 730 days. "2y" can reach past that limit, so "1y" is the longest
+    period requested for hourly and longer intraday bars.
+    """
+    if not is_intraday(interval):
+        return None
+    bar = interval_to_timedelta(interval)
+    if bar <= pd.Timedelta(minutes=1):
+        return "5d"
+    if bar < pd.Timedelta(hours=1):
+        return "1mo"
+    return "1y"
+
+
+def expected_bars(period: str, interval: str) -> float:
+    """
+    Estimates how many `interval` bars a download of `period` returns, assuming
+    252 trading days a year and 09:30-16:00 sessions for intraday bars.
+    """
+    days = _calendar_days(period)
+    bar = interval_to_timedelta(interval)
+    if is_intraday(interval):
+        bars_per_session = math.ceil(SESSION_LENGTH / bar)
+        return days * _TRADING_DAYS_PER_CALENDAR_DAY * bars_per_session
+    if interval.endswith("d"):
+        # Daily bars advance by trading days, longer bars by calendar time
+        return days * _TRADING_DAYS_PER_CALENDAR_DAY / (bar / pd.Timedelta(days=1))
+    return days / (bar / pd.Timedelta(days=1))
+
+
+def plan_period(bars: int, interval: str, margin: float = 0.1) -> str:
+    """
+    Returns the shortest yfinance period expected to cover `bars` bars of
+    `interval`.
+
+    Args:
+        bars (int): Bars of history required, e.g. `IndicatorPipeline.warmup_bars`.
+        interval (str): Bar interval to be downloaded.
+        margin (float): Extra fraction of bars asked for to absorb holidays and
+            missing bars.
+
+    Returns:
+        str: The period to pass to `download_ticker_data`. If even the longest
+        period yfinance serves for `interval` is expected to fall short, that
+        period is returned and the shortfall reported.
+    """
+    needed = bars * (1 + margin)
+    limit = max_period(interval)
+    candidates = PERIODS[: PERIODS.index(limit) + 1] if limit else PERIODS
+    for period in candidates:
+        if period == "max" or expected_bars(period, interval) >= needed:
+            return period
+    available = int(expected_bars(candidates[-1], interval))
+    print(
+        f"[ERROR] {bars} bars of {interval} data need more history than yfinance "
+        f"serves; requesting {candidates[-1]} (about {available} bars)."
+    )
+    return candidates[-1]
@@ -0,0 +1,194 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from fuzzy_allocator.utils.periods import interval_to_timedelta, is_intraday
+from fuzzy_allocator.utils.sessions import EXCHANGE_TZ, SESSION_CLOSE, SESSION_OPEN
+
+CacheKey = Tuple[str, str, str, bool]
+
+
+def _next_session_day(day: pd.Timestamp) -> pd.Timestamp:
+    """
+    Returns the first weekday strictly after the tz-naive date `day` (exchange
+    holidays are ignored).
+    """
+    day = day + pd.Timedelta(days=1)
+    while day.weekday() >= 5:
+        day = day + pd.Timedelta(days=1)
+    return day
+
+
+def _session_time(day: pd.Timestamp, offset: pd.Timedelta) -> pd.Timestamp:
+    """
+    Returns the exchange-local time `offset` after midnight of the tz-naive date
+    `day`.
+    """
+    return (day + offset).tz_localize(EXCHANGE_TZ)
+
+
+def next_bar_close(interval: str, now: pd.Timestamp) -> pd.Timestamp:
+    """
+    Returns when the bar of `interval` that is in progress at `now` closes, on the
+    US equity session calendar.
+
+    Intraday bars are laid out from the 09:30 open and the last bar of a session
+    closes at 16:00. Daily bars close at 16:00 and weekly bars at the Friday close.
+    """
+    now = now.tz_convert(EXCHANGE_TZ)
+    # Dates are stepped on the wall-clock calendar: across a DST change a day is
+    # not 24 hours long
+    day = now.tz_localize(None).normalize()
+    if day.weekday() >= 5 or now >= _session_time(day, SESSION_CLOSE):
+        day = _next_session_day(day)
+        if now < _session_time(day, pd.Timedelta(0)):
+            # Weekend or after the close: the next bar is the next session's first
+            now = _session_time(day, SESSION_OPEN)
+
+    if is_intraday(interval):
+        bar = interval_to_timedelta(interval)
+        session_open = _session_time(day, SESSION_OPEN)
+        if now < session_open:
+            return session_open + bar
+        bars_done = (now - session_open) // bar
+        return min(
+            session_open + bar * (bars_done + 1), _session_time(day, SESSION_CLOSE)
+        )
+
+    if interval.endswith("wk"):
+        # Roll forward to the Friday close of the current week
+        day = day + pd.Timedelta(days=4 - day.weekday())
+    return _session_time(day, SESSION_CLOSE)
+
+
+class FrameCache:
+    """
+    In-process LRU cache for downloaded frames, bounded by memory.
+
+    Entries are keyed by (ticker, period, interval, float32), so float32 and
+    full-precision frames of the same download are cached separately. By default an
+    entry expires when the bar that was in progress at insertion time closes, since
+    after that a fresh download would return a new bar. `ttls` overrides this with a fixed
+    time-to-live in seconds for specific intervals.
+
+    Cached frames are shared between callers and must not be modified in place.
+
+    Args:
+        max_bytes (int): Memory budget for cached frames; the least recently used
+            entries are evicted once it is exceeded.
+        ttls (Optional[Dict[str, float]]): Fixed time-to-live in seconds per interval.
+        clock (Callable[[], float]): Returns the current Unix time; injectable for
+            tests.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 512 * 1024**2,
+        ttls: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.ttls = dict(ttls or {})
+        self._clock = clock
+        self._entries: "OrderedDict[CacheKey, Tuple[pd.DataFrame, int, float]]" = (
+            OrderedDict()
+        )
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory currently used by cached frames, in bytes.
+        """
+        return self._bytes
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns hit, miss, eviction and expiration counters plus current usage.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def _expires_at(self, interval: str, now: float) -> float:
+        if interval in self.ttls:
+            return now + self.ttls[interval]
+        close = next_bar_close(interval, pd.Timestamp(now, unit="s", tz="UTC"))
+        return close.timestamp()
+
+    def _remove(self, key: CacheKey) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(
+        self, ticker: str, period: str, interval: str, float32: bool = False
+    ) -> Optional[pd.DataFrame]:
+        """
+        Returns the cached frame for (ticker, period, interval) stored as float32 or
+        not, or None on a miss.
+        """
+        key = (ticker, period, interval, float32)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            df, _, expires_at = entry
+            if self._clock() >= expires_at:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return df
+
+    def put(
+        self,
+        ticker: str,
+        period: str,
+        interval: str,
+        df: pd.DataFrame,
+        float32: bool = False,
+    ) -> None:
+        """
+        Caches `df` for (ticker, period, interval, float32), evicting least recently
+        used entries as needed. Frames larger than the whole budget are not cached.
+        """
+        key = (ticker, period, interval, float32)
+        size = int(df.memory_usage(deep=True, index=True).sum())
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return
+            while self._bytes + size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            now = self._clock()
+            self._entries[key] = (df, size, self._expires_at(interval, now))
+            self._bytes += size
+
+    def clear(self) -> None:
+        """
+        Drops every cached frame. Counters are left untouched.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
@@ -0,0 +1,213 @@
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+from fuzzy_allocator.kernels import (
+    bb_kernel,
+    close_array,
+    ema_trend_kernel,
+    percentile_of_last,
+    pmarp_kernel,
+)
+from fuzzy_allocator.trading_funcs import bb_warmup, ema_trend_warmup, pmarp_warmup
+
+
+class IndicatorResult(NamedTuple):
+    """
+    Everything `analyze_ticker` needs from one ticker's closes.
+
+    `pmarp` and `bb` are (value, percentile) pairs, or None when there is not
+    enough data, exactly as returned by `compute_pmarp` and `compute_bb_percentile`.
+    """
+
+    pmarp: Optional[Tuple[float, float]]
+    bb: Optional[Tuple[float, float]]
+    trend: str
+
+
+def _trend_label(spread: float) -> str:
+    if spread > 0:
+        return "Uptrend"
+    elif spread < 0:
+        return "Downtrend"
+    else:
+        return "Sideways"
+
+
+def _flat_windows(changes: np.ndarray, period: int, lookback: int) -> np.ndarray:
+    """
+    Flags which of the last `lookback` windows of length `period` hold a single
+    price, given the running count of price changes over the closes.
+    """
+    start = changes.shape[0] - lookback
+    return changes[start:] == changes[start - period + 1 :][:lookback]
+
+
+class IndicatorPipeline:
+    """
+    Computes PMARP, the Bollinger Bands position and the EMA trend for a ticker in
+    one fused pass over its closes.
+
+    The Close column is extracted once. Over the tail of closes the windowed
+    indicators need, one pair of prefix sums (of closes and squared closes, taken
+    relative to the first close in the tail to limit cancellation) serves both the
+    PMARP moving average and the Bollinger mean and standard deviation. The short
+    minus long EMA spread is produced by a single second-order filter pass, which
+    is all the trend label depends on. Histories with NaN closes fall back to the
+    per-indicator kernels, which reproduce pandas' NaN handling.
+
+    Args:
+        pmarp_period (int): PMARP moving average period.
+        pmarp_lookback (int): Number of PMARP values the percentile is taken over.
+        bb_period (int): Bollinger Bands period.
+        bb_lookback (int): Number of positions the percentile is taken over.
+        short_period (int): Span of the short-term EMA.
+        long_period (int): Span of the long-term EMA.
+    """
+
+    def __init__(
+        self,
+        pmarp_period: int = 50,
+        pmarp_lookback: int = 100,
+        bb_period: int = 20,
+        bb_lookback: int = 100,
+        short_period: int = 50,
+        long_period: int = 200,
+    ) -> None:
+        self.pmarp_period = pmarp_period
+        self.pmarp_lookback = pmarp_lookback
+        self.bb_period = bb_period
+        self.bb_lookback = bb_lookback
+        self.short_period = short_period
+        self.long_period = long_period
+
+        # EMA_short - EMA_long as one IIR filter: the difference of the two
+        # first-order EMA filters over their common denominator
+        alpha_s = 2.0 / (short_period + 1)
+        alpha_l = 2.0 / (long_period + 1)
+        beta_s, beta_l = 1.0 - alpha_s, 1.0 - alpha_l
+        self._spread_b = np.array(
+            [alpha_s - alpha_l, alpha_l * beta_s - alpha_s * beta_l]
+        )
+        self._spread_a = np.array([1.0, -(beta_s + beta_l), beta_s * beta_l])
+
+    @property
+    def params(self) -> Tuple[int, ...]:
+        """
+        The indicator settings, in constructor order.
+        """
+        return (
+            self.pmarp_period,
+            self.pmarp_lookback,
+            self.bb_period,
+            self.bb_lookback,
+            self.short_period,
+            self.long_period,
+        )
+
+    @property
+    def warmup_bars(self) -> int:
+        """
+        Number of bars of history every indicator of the pipeline needs.
+        """
+        return max(
+            pmarp_warmup(self.pmarp_period, self.pmarp_lookback),
+            bb_warmup(self.bb_period, self.bb_lookback),
+            ema_trend_warmup(self.short_period, self.long_period),
+        )
+
+    def run(self, df: pd.DataFrame) -> IndicatorResult:
+        """
+        Computes all indicators for one ticker's frame.
+        """
+        return self.run_array(close_array(df))
+
+    def run_array(self, close: np.ndarray) -> IndicatorResult:
+        """
+        Computes all indicators from a float64 array of closes.
+        """
+        n = close.shape[0]
+        tail = max(
+            self.pmarp_lookback + self.pmarp_period - 1,
+            self.bb_lookback + self.bb_period - 1,
+        )
+        if n == 0 or np.isnan(close).any():
+            return IndicatorResult(
+                pmarp_kernel(close, self.pmarp_period, self.pmarp_lookback),
+                bb_kernel(close, self.bb_period, self.bb_lookback),
+                ema_trend_kernel(close, self.short_period, self.long_period),
+            )
+
+        recent = close[-tail:]
+        shifted = recent - recent[0]
+        sums = np.concatenate(([0.0], np.cumsum(shifted)))
+        sums_sq = np.concatenate(([0.0], np.cumsum(shifted * shifted)))
+        # The running sums cannot tell a flat window from a nearly flat one, so
+        # price changes are counted as well
+        changes = np.concatenate(([0], np.cumsum(recent[1:] != recent[:-1])))
+
+        pmarp = self._pmarp(recent, sums, changes)
+        bb = self._bb(close, recent, sums, sums_sq, changes)
+        return IndicatorResult(pmarp, bb, self._trend(close))
+
+    def _pmarp(
+        self, recent: np.ndarray, sums: np.ndarray, changes: np.ndarray
+    ) -> Optional[Tuple[float, float]]:
+        period, lookback = self.pmarp_period, self.pmarp_lookback
+        if recent.shape[0] < lookback + period - 1:
+            return None
+        stop = sums.shape[0]
+        window_sums = (
+            sums[stop - lookback : stop] - sums[stop - lookback - period :][:lookback]
+        )
+        ma = recent[0] + window_sums / period
+        ratios = recent[-lookback:] / ma
+        # The sums can miss the mean of a flat window by an ulp, while pandas
+        # gives a ratio of exactly 1, and ties among those ratios set the rank
+        ratios[_flat_windows(changes, period, lookback)] = 1.0
+        return ratios[-1], percentile_of_last(ratios)
+
+    def _bb(
+        self,
+        close: np.ndarray,
+        recent: np.ndarray,
+        sums: np.ndarray,
+        sums_sq: np.ndarray,
+        changes: np.ndarray,
+    ) -> Optional[Tuple[float, float]]:
+        period, lookback = self.bb_period, self.bb_lookback
+        if recent.shape[0] < lookback + period - 1:
+            return None
+        stop = sums.shape[0]
+        s1 = sums[stop - lookback : stop] - sums[stop - lookback - period :][:lookback]
+        s2 = (
+            sums_sq[stop - lookback : stop]
+            - sums_sq[stop - lookback - period :][:lookback]
+        )
+        # Scaled by the period so that, for prices on a tick grid, the numerators
+        # are exact and equal windows give bit-identical positions
+        variance = np.maximum(period * s2 - s1 * s1, 0.0) / (period * (period - 1))
+        std = np.sqrt(variance)
+        deviation = (period * (recent[-lookback:] - recent[0]) - s1) / period
+        with np.errstate(divide="ignore", invalid="ignore"):
+            positions = (deviation + 2 * std) / (4 * std)
+        # A flat window has zero width bands and leaves its position undefined;
+        # let the kernel reach further back if any occur
+        if _flat_windows(changes, period, lookback).any():
+            return bb_kernel(close, period, lookback)
+        return positions[-1], percentile_of_last(positions)
+
+    def ema_spread(self, close: np.ndarray) -> np.ndarray:
+        """
+        Returns EMA(short_period) - EMA(long_period) for every bar, along the
+        first axis of a 1-D array or a (time x ticker) panel of closes.
+        """
+        # The spread is unchanged by shifting every close, and starting from zero
+        # makes the filter's initial state zero and keeps flat histories exactly
+        # flat
+        return lfilter(self._spread_b, self._spread_a, close - close[0], axis=0)
+
+    def _trend(self, close: np.ndarray) -> str:
+        return _trend_label(self.ema_spread(close)[-1])
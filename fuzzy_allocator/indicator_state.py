@@ -0,0 +1,320 @@
+import math
+from array import array
+from typing import Iterable, Optional, Tuple
+
+from fuzzy_allocator.utils.sorted_window import SortedWindow
+
+
+class _RollingWindow:
+    """
+    Fixed-length window of the latest closes with running sums for O(1) mean and
+    sample standard deviation updates.
+
+    Sums are kept relative to the first value seen to limit cancellation, and are
+    recomputed exactly once per full turn of the window so rounding error cannot
+    accumulate. A NaN anywhere in the window makes the window statistics NaN, as
+    with pandas' `rolling`.
+    """
+
+    __slots__ = (
+        "period",
+        "_values",
+        "_head",
+        "_count",
+        "_nans",
+        "_ref",
+        "_s1",
+        "_s2",
+        "_last",
+        "_run",
+    )
+
+    def __init__(self, period: int) -> None:
+        self.period = period
+        self._values = array("d", bytes(8 * period))
+        self._head = 0
+        self._count = 0
+        self._nans = 0
+        self._ref: Optional[float] = None
+        self._s1 = 0.0
+        self._s2 = 0.0
+        self._last = math.nan
+        self._run = 0
+
+    @property
+    def ready(self) -> bool:
+        """
+        True once the window is full and contains no NaN.
+        """
+        return self._count == self.period and not self._nans
+
+    @property
+    def flat(self) -> bool:
+        """
+        True when every value in the full window is the same. The running sums
+        can leave a tiny non-zero variance there, so this is tracked exactly.
+        """
+        return self._run >= self.period
+
+    def _add(self, value: float, sign: float) -> None:
+        if math.isnan(value):
+            self._nans += 1 if sign > 0 else -1
+            return
+        delta = value - self._ref
+        self._s1 += sign * delta
+        self._s2 += sign * delta * delta
+
+    def push(self, value: float) -> None:
+        """
+        Adds `value`, dropping the oldest value once the window is full.
+        """
+        if self._ref is None and not math.isnan(value):
+            self._ref = value
+        if self._count == self.period:
+            self._add(self._values[self._head], -1.0)
+        else:
+            self._count += 1
+        self._values[self._head] = value
+        self._head = (self._head + 1) % self.period
+        # Length of the run of equal values ending with this one
+        self._run = self._run + 1 if value == self._last else 1
+        self._last = value
+        if self._ref is not None:
+            self._add(value, 1.0)
+        elif math.isnan(value):
+            self._nans += 1
+        if self._head == 0:
+            self._resync()
+
+    def _resync(self) -> None:
+        if self._ref is None:
+            return
+        deltas = [value - self._ref for value in self._values[: self._count]]
+        deltas = [delta for delta in deltas if not math.isnan(delta)]
+        self._s1 = math.fsum(deltas)
+        self._s2 = math.fsum(delta * delta for delta in deltas)
+
+    def mean(self) -> float:
+        """
+        Returns the mean of the window (NaN until the window is ready).
+        """
+        if not self.ready:
+            return math.nan
+        return self._ref + self._s1 / self.period
+
+    def std(self) -> float:
+        """
+        Returns the sample (ddof=1) standard deviation of the window.
+        """
+        if not self.ready or self.period < 2:
+            return math.nan
+        variance = (self._s2 - self._s1 * self._s1 / self.period) / (self.period - 1)
+        return math.sqrt(max(variance, 0.0))
+
+
+class PMARPState:
+    """
+    Incremental counterpart of `compute_pmarp`: feed one close per bar to `update`
+    and get the current PMARP value and percentile without recomputing the window.
+
+    Each update is O(1) for the moving average and O(log lookback) for the
+    percentile rank.
+
+    Args:
+        ma_period (int): Moving average period.
+        lookback (int): Number of PMARP values the percentile is taken over.
+    """
+
+    __slots__ = ("ma_period", "lookback", "_closes", "_ratios", "last")
+
+    def __init__(self, ma_period: int = 50, lookback: int = 100) -> None:
+        self.ma_period = ma_period
+        self.lookback = lookback
+        self._closes = _RollingWindow(ma_period)
+        self._ratios = SortedWindow(lookback)
+        self.last: Optional[Tuple[float, float]] = None
+
+    def update(self, close: float) -> Optional[Tuple[float, float]]:
+        """
+        Adds one bar's close.
+
+        Returns:
+            Tuple of the current PMARP value and its percentile rank, or None while
+            fewer than `lookback` PMARP values have been seen.
+        """
+        self._closes.push(close)
+        if not self._closes.ready or math.isnan(close):
+            # No new PMARP value this bar; like the batch version, report the
+            # latest one
+            return self.last
+        if self._closes.flat:
+            # The running sums can miss the mean of a flat window by an ulp; pandas
+            # gives exactly 1, which matters for ties in the rank
+            ratio = 1.0
+        else:
+            ratio = close / self._closes.mean()
+        self._ratios.push(ratio)
+        if not self._ratios.full:
+            return None
+        self.last = (ratio, self._ratios.percentile_rank(ratio))
+        return self.last
+
+    def extend(self, closes: Iterable[float]) -> Optional[Tuple[float, float]]:
+        """
+        Feeds a sequence of closes, e.g. to warm up from history, and returns the
+        result after the last one.
+        """
+        result = None
+        for close in closes:
+            result = self.update(close)
+        return result
+
+
+class BollingerState:
+    """
+    Incremental counterpart of `compute_bb_percentile`: feed one close per bar to
+    `update` and get the current Bollinger Bands position and its percentile.
+
+    Each update is O(1) for the moving average and standard deviation and
+    O(log lookback) for the percentile rank.
+
+    Args:
+        ma_period (int): Bollinger Bands period.
+        lookback (int): Number of positions the percentile is taken over.
+    """
+
+    __slots__ = ("ma_period", "lookback", "_closes", "_positions", "last")
+
+    def __init__(self, ma_period: int = 20, lookback: int = 100) -> None:
+        self.ma_period = ma_period
+        self.lookback = lookback
+        self._closes = _RollingWindow(ma_period)
+        self._positions = SortedWindow(lookback)
+        self.last: Optional[Tuple[float, float]] = None
+
+    def update(self, close: float) -> Optional[Tuple[float, float]]:
+        """
+        Adds one bar's close.
+
+        Returns:
+            Tuple of the current Bollinger Bands position (0-1) and its percentile
+            rank, or None while fewer than `lookback` positions have been seen.
+        """
+        self._closes.push(close)
+        if not self._closes.ready or math.isnan(close):
+            return self.last
+        if self._closes.flat:
+            # Flat window: the position is undefined (0/0) and skipped, as in the
+            # batch version
+            return self.last
+        std = self._closes.std()
+        lower = self._closes.mean() - 2 * std
+        position = (close - lower) / (4 * std)
+        self._positions.push(position)
+        if not self._positions.full:
+            return None
+        self.last = (position, self._positions.percentile_rank(position))
+        return self.last
+
+    def extend(self, closes: Iterable[float]) -> Optional[Tuple[float, float]]:
+        """
+        Feeds a sequence of closes and returns the result after the last one.
+        """
+        result = None
+        for close in closes:
+            result = self.update(close)
+        return result
+
+
+def _ewm_step(ema: float, weight: float, close: float, alpha: float) -> float:
+    """
+    One step of pandas' `adjust=False` EMA: the weighted mean of the current EMA
+    and `close`. An EMA equal to `close` is kept as is, so flat runs stay exact.
+    """
+    if ema == close:
+        return ema
+    return (weight * ema + alpha * close) / (weight + alpha)
+
+
+class EMATrendState:
+    """
+    Incremental counterpart of `compute_ema_trend`: feed one close per bar to
+    `update` and get the current trend label in O(1).
+
+    The EMAs follow pandas' `ewm(span=..., adjust=False)` recursion, seeded with
+    the first close. As with pandas' default `ignore_na=False`, a NaN close leaves
+    both EMAs unchanged but keeps decaying their weight, so the next close after a
+    gap counts for more.
+
+    Args:
+        short_period (int): Span of the short-term EMA.
+        long_period (int): Span of the long-term EMA.
+    """
+
+    __slots__ = (
+        "short_period",
+        "long_period",
+        "_alpha_short",
+        "_alpha_long",
+        "short_ema",
+        "long_ema",
+        "_weight_short",
+        "_weight_long",
+    )
+
+    def __init__(self, short_period: int = 50, long_period: int = 200) -> None:
+        self.short_period = short_period
+        self.long_period = long_period
+        self._alpha_short = 2.0 / (short_period + 1)
+        self._alpha_long = 2.0 / (long_period + 1)
+        self.short_ema = math.nan
+        self.long_ema = math.nan
+        # Weight of the current EMA against `alpha` for the next close
+        self._weight_short = 1.0
+        self._weight_long = 1.0
+
+    def update(self, close: float) -> str:
+        """
+        Adds one bar's close.
+
+        Returns:
+            str: "Uptrend", "Downtrend" or "Sideways", as in `compute_ema_trend`.
+        """
+        if math.isnan(self.short_ema):
+            if not math.isnan(close):
+                self.short_ema = close
+                self.long_ema = close
+            return self.trend
+
+        self._weight_short *= 1.0 - self._alpha_short
+        self._weight_long *= 1.0 - self._alpha_long
+        if not math.isnan(close):
+            self.short_ema = _ewm_step(
+                self.short_ema, self._weight_short, close, self._alpha_short
+            )
+            self.long_ema = _ewm_step(
+                self.long_ema, self._weight_long, close, self._alpha_long
+            )
+            self._weight_short = 1.0
+            self._weight_long = 1.0
+        return self.trend
+
+    @property
+    def trend(self) -> str:
+        """
+        The trend label for the closes seen so far.
+        """
+        if self.short_ema > self.long_ema:
+            return "Uptrend"
+        elif self.short_ema < self.long_ema:
+            return "Downtrend"
+        else:
+            return "Sideways"
+
+    def extend(self, closes: Iterable[float]) -> str:
+        """
+        Feeds a sequence of closes and returns the trend after the last one.
+        """
+        for close in closes:
+            self.update(close)
+        return self.trend
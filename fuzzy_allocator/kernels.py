@@ -0,0 +1,179 @@
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+
+
+def column_array(df: pd.DataFrame, column: str) -> np.ndarray:
+    """
+    Returns one price column as a contiguous float64 array.
+
+    For a normalized float64 frame this is a view of the frame's own data, so
+    nothing is copied; raw `yf.download` frames with (Price, Ticker) columns and
+    float32 frames cost one column copy at most.
+    """
+    values = df[column]
+    if isinstance(values, pd.DataFrame):
+        values = values.iloc[:, 0]
+    return np.ascontiguousarray(values.to_numpy(dtype=np.float64, copy=False))
+
+
+def close_array(df: pd.DataFrame) -> np.ndarray:
+    """
+    Returns the Close column as a contiguous float64 array, see `column_array`.
+    """
+    return column_array(df, "Close")
+
+
+def percentile_of_last(values: np.ndarray) -> float:
+    """
+    Returns the percentile rank of the last value among `values`, matching
+    `percentileofscore(values, values[-1])` with the default "rank" kind.
+
+    A single pass of comparisons, without sorting the window.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    score = values[-1]
+    below = np.count_nonzero(values < score)
+    at_or_below = np.count_nonzero(values <= score)
+    return float((below + at_or_below + 1) * (50.0 / values.shape[0]))
+
+
+def _rolling_windows(close: np.ndarray, period: int, needed: int) -> np.ndarray:
+    """
+    Returns the trailing windows of length `period` needed for the last `needed`
+    valid rolling values, as a strided view.
+
+    When the tail of `close` has no NaN only the last `needed` windows are taken;
+    otherwise every window is returned so NaN windows can be dropped, matching
+    pandas' `rolling(...).dropna()`.
+    """
+    tail = needed + period - 1
+    if close.shape[0] >= tail and not np.isnan(close[-tail:]).any():
+        return sliding_window_view(close[-tail:], period)
+    return sliding_window_view(close, period)
+
+
+def pmarp_kernel(
+    close: np.ndarray, ma_period: int = 50, lookback: int = 100
+) -> Optional[Tuple[float, float]]:
+    """
+    Array counterpart of `compute_pmarp`.
+
+    Only the last `lookback + ma_period - 1` closes are touched when they contain
+    no NaN, and no intermediate MA/PMARP columns are allocated.
+
+    Returns:
+        Tuple of the current PMARP value and its percentile rank, or None if there
+        is insufficient data.
+    """
+    if close.shape[0] < ma_period:
+        return None
+    windows = _rolling_windows(close, ma_period, lookback)
+    ratios = close[ma_period - 1 :][-windows.shape[0] :] / windows.mean(axis=1)
+    ratios = ratios[~np.isnan(ratios)]
+    if ratios.shape[0] < lookback:
+        return None
+    ratios = ratios[-lookback:]
+    return ratios[-1], percentile_of_last(ratios)
+
+
+def _bb_positions(close: np.ndarray, windows: np.ndarray) -> np.ndarray:
+    """
+    Returns the defined Bollinger Bands positions for the trailing `windows`.
+
+    Flat windows have zero-width bands and no position. NumPy's std can leave
+    about 1e-14 there instead of 0, so they are detected from the range and
+    dropped explicitly, as pandas' exact zero std drops them.
+    """
+    ma = windows.mean(axis=1)
+    std = windows.std(axis=1, ddof=1)
+    std[np.ptp(windows, axis=1) == 0] = np.nan
+    lower = ma - 2 * std
+    upper = ma + 2 * std
+    with np.errstate(divide="ignore", invalid="ignore"):
+        positions = (close[windows.shape[1] - 1 :][-windows.shape[0] :] - lower) / (
+            upper - lower
+        )
+    return positions[~np.isnan(positions)]
+
+
+def bb_kernel(
+    close: np.ndarray, ma_period: int = 20, lookback: int = 100
+) -> Optional[Tuple[float, float]]:
+    """
+    Array counterpart of `compute_bb_percentile`.
+
+    Only the last `lookback + ma_period - 1` closes are touched when they contain
+    no NaN, and no band columns are allocated.
+
+    Returns:
+        Tuple of the current Bollinger Bands position (0-1) and its percentile rank,
+        or None if not enough data is available.
+    """
+    if close.shape[0] < ma_period:
+        return None
+    positions = _bb_positions(close, _rolling_windows(close, ma_period, lookback))
+    if positions.shape[0] < lookback and close.shape[0] >= lookback + ma_period:
+        # Flat windows (zero width bands) were dropped from the tail; reach
+        # further back, as `dropna` over the whole history does
+        positions = _bb_positions(close, sliding_window_view(close, ma_period))
+    if positions.shape[0] < lookback:
+        return None
+    positions = positions[-lookback:]
+    return positions[-1], percentile_of_last(positions)
+
+
+def ema_kernel(close: np.ndarray, span: int) -> np.ndarray:
+    """
+    Array counterpart of `Series.ewm(span=span, adjust=False).mean()`.
+
+    Runs the EMA recursion as a first-order IIR filter in compiled code. Arrays
+    containing NaN fall back to pandas, which defines how gaps are weighted.
+    """
+    if close.shape[0] == 0 or np.isnan(close).any():
+        return pd.Series(close).ewm(span=span, adjust=False).mean().to_numpy()
+    alpha = 2.0 / (span + 1)
+    # Filtering the closes relative to the first one seeds the EMA at the first
+    # close with a zero initial state, and keeps a flat history exactly flat
+    return lfilter([alpha], [1.0, alpha - 1.0], close - close[0]) + close[0]
+
+
+def ema_trend_kernel(
+    close: np.ndarray, short_period: int = 50, long_period: int = 200
+) -> str:
+    """
+    Array counterpart of `compute_ema_trend`.
+    """
+    short_last = ema_kernel(close, short_period)[-1]
+    long_last = ema_kernel(close, long_period)[-1]
+    if short_last > long_last:
+        return "Uptrend"
+    elif short_last < long_last:
+        return "Downtrend"
+    else:
+        return "Sideways"
+
+
+def crossover_kernel(spread: np.ndarray) -> np.ndarray:
+    """
+    Marks crossovers in a short minus long EMA spread, along the first axis of a
+    1-D array or a (time x ticker) panel.
+
+    A bar where the spread turns positive is a golden cross (+1), one where it
+    turns negative a death cross (-1); every other bar is 0. Bars where the spread
+    is exactly zero (or NaN) keep the previous side, so touching the long EMA
+    without crossing it is not an event.
+    """
+    side = np.nan_to_num(np.sign(spread))
+    n = side.shape[0]
+    rows = np.arange(n).reshape((n,) + (1,) * (side.ndim - 1))
+    # Carry the last non-zero side forward through zeros
+    last_set = np.maximum.accumulate(np.where(side != 0, rows, 0), axis=0)
+    side = np.take_along_axis(side, last_set, axis=0)
+    events = np.zeros_like(side)
+    flipped = (side[1:] != side[:-1]) & (side[:-1] != 0)
+    events[1:] = np.where(flipped, side[1:], 0)
+    return events
@@ -0,0 +1,188 @@
+import functools
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar, Union
+
+import numpy as np
+import pandas as pd
+
+from fuzzy_allocator.indicator_pipeline import IndicatorPipeline, IndicatorResult
+from fuzzy_allocator.kernels import close_array
+
+DEFAULT_MEMO_PATH = Path("~/.cache/fuzzy_allocator/indicators.pkl").expanduser()
+
+T = TypeVar("T")
+
+
+def fingerprint(close: np.ndarray) -> str:
+    """
+    Returns a content hash of a close array.
+
+    Two arrays share a fingerprint only if they hold the same closes, so results
+    keyed by it stay valid for as long as the bars they were computed from.
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    return hashlib.blake2b(close.data, digest_size=16).hexdigest()
+
+
+class IndicatorMemo:
+    """
+    LRU memo of indicator results keyed by the content of the closes they were
+    computed from plus the parameters used.
+
+    Results for a ticker whose bars have not changed since the last scan are
+    returned without recomputing anything. With `path` set, entries are loaded
+    from that file on construction and written back by `save`, so they carry over
+    between runs.
+
+    Args:
+        max_entries (int): Number of results kept; the least recently used ones are
+            evicted beyond that.
+        path (Optional[Union[str, Path]]): Pickle file to persist entries to.
+    """
+
+    def __init__(
+        self, max_entries: int = 100_000, path: Optional[Union[str, Path]] = None
+    ) -> None:
+        self.max_entries = max_entries
+        self.path = Path(path) if path is not None else None
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if self.path is not None and self.path.exists():
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns hit, miss and eviction counters plus the number of entries.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+        }
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Returns the result stored under `key`, or None on a miss.
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Stores `value` under `key`, evicting least recently used entries as needed.
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._dirty = True
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """
+        Returns the result stored under `key`, calling `compute` and storing its
+        result on a miss.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        # Computed outside the lock; a concurrent miss on the same key just does
+        # the same work twice
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def wrap(self, func: Callable[..., T]) -> Callable[..., T]:
+        """
+        Memoizes an indicator function taking a frame as its first argument, such
+        as `compute_pmarp`, on the frame's closes and the remaining arguments.
+        """
+
+        @functools.wraps(func)
+        def wrapper(df: pd.DataFrame, *args: Any, **kwargs: Any) -> T:
+            key = (
+                func.__qualname__,
+                fingerprint(close_array(df)),
+                args,
+                tuple(sorted(kwargs.items())),
+            )
+            return self.get_or_compute(key, lambda: func(df, *args, **kwargs))
+
+        return wrapper
+
+    def clear(self) -> None:
+        """
+        Drops every entry. Counters are left untouched.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "rb") as f:
+                entries = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            print(f"[ERROR] Ignoring unreadable indicator memo {self.path}: {e}")
+            return
+        # Keep the most recently used entries if the budget has shrunk
+        for key, value in entries[-self.max_entries :]:
+            self._entries[key] = value
+
+    def save(self) -> None:
+        """
+        Writes the entries to `path`, if set and anything changed since loading.
+        """
+        if self.path is None or not self._dirty:
+            return
+        with self._lock:
+            entries = list(self._entries.items())
+            self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so a crash never leaves a truncated memo
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+
+
+def pipeline_key(pipeline: IndicatorPipeline, close: np.ndarray) -> Hashable:
+    """
+    Returns the memo key for running `pipeline` on `close`.
+    """
+    return (type(pipeline).__qualname__, pipeline.params, fingerprint(close))
+
+
+def run_pipeline(
+    pipeline: IndicatorPipeline, df: pd.DataFrame, memo: IndicatorMemo
+) -> IndicatorResult:
+    """
+    Runs `pipeline` on `df` through `memo`, keyed by the pipeline's settings and
+    the frame's closes.
+    """
+    close = close_array(df)
+    return memo.get_or_compute(
+        pipeline_key(pipeline, close), lambda: pipeline.run_array(close)
+    )
@@ -0,0 +1,64 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+
+
+def flatten_columns(df: pd.DataFrame, ticker: Optional[str] = None) -> pd.DataFrame:
+    """
+    Turns `yf.download` (Price, Ticker) `MultiIndex` columns into flat OHLCV columns.
+
+    Args:
+        df (pd.DataFrame): Frame with flat or `MultiIndex` columns.
+        ticker (Optional[str]): Ticker to select when the frame holds several;
+            single-ticker frames simply drop the ticker level.
+    """
+    if isinstance(df.columns, pd.MultiIndex):
+        if ticker is not None and ticker in df.columns.get_level_values(-1):
+            df = df.xs(ticker, axis=1, level=-1)
+        else:
+            df = df.copy()
+            df.columns = df.columns.get_level_values(0)
+    if df.columns.name is not None:
+        # A new frame, so the caller's columns keep their name
+        df = df.rename_axis(columns=None)
+    return df
+
+
+def normalize_frame(
+    df: pd.DataFrame, ticker: Optional[str] = None, float32: bool = False
+) -> pd.DataFrame:
+    """
+    Normalizes a downloaded frame into the layout the rest of the package expects.
+
+    - flat OHLCV columns in Open, High, Low, Close, (Adj Close,) Volume order
+    - a sorted DatetimeIndex with duplicate timestamps removed (last one wins)
+    - rows where every column is NaN dropped
+    - optionally every column stored as float32, halving memory; volumes keep
+      about seven significant digits
+
+    Args:
+        df (pd.DataFrame): Frame as returned by a data source.
+        ticker (Optional[str]): Ticker to select from multi-ticker frames.
+        float32 (bool): Downcast all columns to float32.
+
+    Returns:
+        pd.DataFrame: The normalized frame.
+    """
+    df = flatten_columns(df, ticker)
+    columns = [column for column in OHLCV_COLUMNS if column in df.columns]
+    df = df[columns + [column for column in df.columns if column not in columns]]
+
+    if not isinstance(df.index, pd.DatetimeIndex):
+        df.index = pd.to_datetime(df.index)
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index(kind="stable")
+    if df.index.has_duplicates:
+        df = df[~df.index.duplicated(keep="last")]
+    df = df.dropna(how="all")
+
+    if float32:
+        df = df.astype(np.float32)
+    return df
@@ -0,0 +1,250 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from fuzzy_allocator.indicator_pipeline import IndicatorPipeline
+from fuzzy_allocator.kernels import (
+    bb_kernel,
+    close_array,
+    crossover_kernel,
+    ema_kernel,
+)
+
+PANEL_COLUMNS = [
+    "Bars",
+    "PMARP",
+    "PMARP_Percentile",
+    "BB_Position",
+    "BB_Percentile",
+    "Trend",
+    "Last_Crossover",
+    "Bars_Since_Crossover",
+]
+
+
+def close_panel(
+    data: Dict[str, pd.DataFrame], length: Optional[int] = None
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Aligns every ticker's closes into one (time x ticker) float64 array.
+
+    Columns are aligned on their most recent bar rather than on timestamps, so the
+    last row holds every ticker's latest close and each column is exactly the
+    history per-ticker analysis would see. Shorter histories are padded with NaN
+    at the top.
+
+    Args:
+        data (Dict[str, pd.DataFrame]): Frames keyed by ticker, as returned by
+            `download_ticker_data`.
+        length (Optional[int]): Number of most recent bars kept per ticker.
+            Defaults to the longest history; a shorter panel is enough for PMARP
+            and Bollinger Bands but changes the EMAs, which see all history.
+
+    Returns:
+        Tuple of the panel and the tickers in column order.
+    """
+    tickers = list(data)
+    closes = [close_array(data[ticker]) for ticker in tickers]
+    if length is None:
+        length = max((close.shape[0] for close in closes), default=0)
+    panel = np.full((length, len(tickers)), np.nan)
+    for j, close in enumerate(closes):
+        close = close[close.shape[0] - min(length, close.shape[0]) :]
+        panel[length - close.shape[0] :, j] = close
+    return panel, tickers
+
+
+def _percentile_of_last_rows(values: np.ndarray) -> np.ndarray:
+    """
+    Column-wise `percentile_of_last` for a (window x ticker) array.
+    """
+    score = values[-1]
+    below = np.count_nonzero(values < score, axis=0)
+    at_or_below = np.count_nonzero(values <= score, axis=0)
+    return (below + at_or_below + 1) * (50.0 / values.shape[0])
+
+
+def _window_sums(sums: np.ndarray, period: int, lookback: int) -> np.ndarray:
+    """
+    Returns the sums of the last `lookback` windows of length `period` from
+    column-wise prefix sums with a leading zero row.
+    """
+    stop = sums.shape[0]
+    return sums[stop - lookback : stop] - sums[stop - lookback - period : stop - period]
+
+
+def _last_crossovers(events: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the kind ("Golden", "Death" or None) of the latest crossover in each
+    column of `crossover_kernel` output, and the bars since it (NaN if none).
+    """
+    n_rows = events.shape[0]
+    latest = n_rows - 1 - np.argmax(events[::-1] != 0, axis=0)
+    found = events.any(axis=0)
+    side = np.take_along_axis(events, latest[None], axis=0)[0]
+    kind = np.where(side > 0, "Golden", "Death").astype(object)
+    kind[~found] = None
+    return kind, np.where(found, n_rows - 1 - latest, np.nan)
+
+
+def panel_indicators(
+    panel: np.ndarray,
+    tickers: List[str],
+    pipeline: Optional[IndicatorPipeline] = None,
+) -> pd.DataFrame:
+    """
+    Computes PMARP, the Bollinger Bands position and the EMA trend for every
+    column of a (time x ticker) panel of closes at once.
+
+    Columns whose history has no gaps are handled by broadcasted array operations
+    over the whole universe: one pair of column-wise prefix sums feeds the PMARP
+    and Bollinger windows, and one filter pass along the time axis yields every
+    EMA spread, from which the trend and the latest EMA crossover (as in
+    `compute_ema_crossovers`) are read. Columns with NaN closes inside their
+    history, or with flat Bollinger windows, are handed to
+    `pipeline.run_array`/`bb_kernel` one by one, which reproduce the per-ticker NaN
+    handling.
+
+    Args:
+        panel (np.ndarray): Closes from `close_panel`, NaN-padded at the top.
+        tickers (List[str]): Ticker of each column.
+        pipeline (Optional[IndicatorPipeline]): Indicator settings; defaults to
+            the `analyze_ticker` settings.
+
+    Returns:
+        pd.DataFrame: One row per ticker with the columns in `PANEL_COLUMNS`; PMARP
+        and Bollinger values are NaN where a ticker has insufficient data.
+    """
+    pipeline = pipeline or IndicatorPipeline()
+    n_rows, n_cols = panel.shape
+
+    valid = ~np.isnan(panel)
+    first = np.full(n_cols, n_rows)
+    if n_rows:
+        first = np.where(valid.any(axis=0), valid.argmax(axis=0), n_rows)
+    bars = n_rows - first
+    clean = (valid.sum(axis=0) == bars) & (bars > 0)
+
+    pmarp = np.full((2, n_cols), np.nan)
+    bb = np.full((2, n_cols), np.nan)
+    trend = np.full(n_cols, None, dtype=object)
+    last_crossover = np.full(n_cols, None, dtype=object)
+    bars_since = np.full(n_cols, np.nan)
+
+    cols = np.flatnonzero(clean)
+    if cols.shape[0]:
+        # Avoid copying the panel in the common case of every column being clean
+        closes = panel if cols.shape[0] == n_cols else panel[:, cols]
+        # Leading pads repeat each column's first close: the spread filter sees
+        # them as zeros, so every column starts its EMAs at its own first bar, and
+        # the running sums below stay finite
+        pad = first[cols].max()
+        filled = closes
+        if pad:
+            filled = closes.copy()
+            filled[:pad] = np.where(
+                valid[:pad, cols],
+                closes[:pad],
+                closes[first[cols], np.arange(cols.shape[0])],
+            )
+        p_period, p_lookback = pipeline.pmarp_period, pipeline.pmarp_lookback
+        b_period, b_lookback = pipeline.bb_period, pipeline.bb_lookback
+        p_needed = p_lookback + p_period - 1
+        b_needed = b_lookback + b_period - 1
+
+        tail = filled[n_rows - min(n_rows, max(p_needed, b_needed)) :]
+        # Shifting by the latest close limits cancellation in the running sums.
+        # Windows reaching into the pads belong to short columns, masked out below
+        ref = tail[-1]
+        shifted = tail - ref
+        zeros = np.zeros((1, cols.shape[0]))
+        sums = np.concatenate((zeros, np.cumsum(shifted, axis=0)))
+        sums_sq = np.concatenate((zeros, np.cumsum(shifted * shifted, axis=0)))
+
+        if tail.shape[0] >= p_needed:
+            ratios = tail[-p_lookback:] / (
+                ref + _window_sums(sums, p_period, p_lookback) / p_period
+            )
+            ok = bars[cols] >= p_needed
+            pmarp[0, cols[ok]] = ratios[-1, ok]
+            pmarp[1, cols[ok]] = _percentile_of_last_rows(ratios[:, ok])
+
+        if tail.shape[0] >= b_needed:
+            s1 = _window_sums(sums, b_period, b_lookback)
+            s2 = _window_sums(sums_sq, b_period, b_lookback)
+            # Same exact-numerator arrangement as `IndicatorPipeline`
+            variance = np.maximum(b_period * s2 - s1 * s1, 0.0) / (
+                b_period * (b_period - 1)
+            )
+            std = np.sqrt(variance)
+            deviation = (b_period * shifted[-b_lookback:] - s1) / b_period
+            with np.errstate(divide="ignore", invalid="ignore"):
+                positions = (deviation + 2 * std) / (4 * std)
+            changes = np.concatenate((zeros, np.cumsum(tail[1:] != tail[:-1], axis=0)))
+            flat = (_window_sums(changes, b_period - 1, b_lookback) == 0).any(axis=0)
+            ok = (bars[cols] >= b_needed) & ~flat
+            bb[0, cols[ok]] = positions[-1, ok]
+            bb[1, cols[ok]] = _percentile_of_last_rows(positions[:, ok])
+            for j in cols[(bars[cols] >= b_needed) & flat]:
+                # Flat windows are dropped and the ticker's whole history searched
+                found = bb_kernel(panel[first[j] :, j], b_period, b_lookback)
+                if found is not None:
+                    bb[:, j] = found
+
+        spreads = pipeline.ema_spread(filled)
+        spread = spreads[-1]
+        trend[cols] = np.select(
+            [spread > 0, spread < 0], ["Uptrend", "Downtrend"], "Sideways"
+        )
+        last_crossover[cols], bars_since[cols] = _last_crossovers(
+            crossover_kernel(spreads)
+        )
+
+    for j in np.flatnonzero(~clean & (bars > 0)):
+        found = pipeline.run_array(panel[first[j] :, j])
+        if found.pmarp is not None:
+            pmarp[:, j] = found.pmarp
+        if found.bb is not None:
+            bb[:, j] = found.bb
+        trend[j] = found.trend
+        close = panel[first[j] :, j]
+        events = crossover_kernel(
+            ema_kernel(close, pipeline.short_period)
+            - ema_kernel(close, pipeline.long_period)
+        )
+        kind, since = _last_crossovers(events[:, None])
+        last_crossover[j], bars_since[j] = kind[0], since[0]
+
+    return pd.DataFrame(
+        {
+            "Bars": bars,
+            "PMARP": pmarp[0],
+            "PMARP_Percentile": pmarp[1],
+            "BB_Position": bb[0],
+            "BB_Percentile": bb[1],
+            "Trend": trend,
+            "Last_Crossover": last_crossover,
+            "Bars_Since_Crossover": bars_since,
+        },
+        index=pd.Index(tickers, name="Ticker"),
+        columns=PANEL_COLUMNS,
+    )
+
+
+def compute_panel(
+    data: Dict[str, pd.DataFrame], pipeline: Optional[IndicatorPipeline] = None
+) -> pd.DataFrame:
+    """
+    Computes the `analyze_ticker` indicators for a whole universe at once.
+
+    Args:
+        data (Dict[str, pd.DataFrame]): Frames keyed by ticker, as returned by
+            `download_ticker_data`.
+        pipeline (Optional[IndicatorPipeline]): Indicator settings.
+
+    Returns:
+        pd.DataFrame: One row per ticker, see `panel_indicators`.
+    """
+    panel, tickers = close_panel(data)
+    return panel_indicators(panel, tickers, pipeline)
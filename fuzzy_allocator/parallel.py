@@ -0,0 +1,184 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from fuzzy_allocator.indicator_pipeline import IndicatorPipeline
+from fuzzy_allocator.kernels import column_array
+from fuzzy_allocator.memo import IndicatorMemo, pipeline_key
+from fuzzy_allocator.signals import TickerAnalysis, evaluate_signals
+
+OHLC_COLUMNS = ["Open", "High", "Low", "Close"]
+
+
+class SharedPrices:
+    """
+    The OHLC arrays of a whole universe, published once in a single shared memory
+    block that worker processes map without copying.
+
+    Only the `OHLC_COLUMNS` present in every frame are shared, so a Close-only
+    download works. Row r of the (len(columns) x total bars) float64 block holds
+    `columns[r]` for every ticker back to back; `bounds[i]` is the (start, stop)
+    slice of `tickers[i]`. Use as a context manager so the block is released on
+    exit.
+
+    Args:
+        data (Dict[str, pd.DataFrame]): Frames keyed by ticker, as returned by
+            `download_ticker_data`.
+
+    Raises:
+        KeyError: If a frame has no Close column.
+    """
+
+    def __init__(self, data: Dict[str, pd.DataFrame]) -> None:
+        self.tickers = list(data)
+        frames = [data[ticker] for ticker in self.tickers]
+        self.columns = [
+            column
+            for column in OHLC_COLUMNS
+            if all(column in df.columns for df in frames)
+        ]
+        if frames and "Close" not in self.columns:
+            missing = [
+                t for t, df in zip(self.tickers, frames) if "Close" not in df.columns
+            ]
+            raise KeyError(f"No Close column for {', '.join(missing)}")
+        lengths = np.array([len(df) for df in frames], dtype=int)
+        stops = np.cumsum(lengths)
+        self.bounds: List[Tuple[int, int]] = list(
+            zip((stops - lengths).tolist(), stops.tolist())
+        )
+        self.n_bars = int(stops[-1]) if lengths.shape[0] else 0
+        # Zero-size blocks are not allowed
+        size = max(1, len(self.columns) * self.n_bars * 8)
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        prices = self.prices()
+        for df, (start, stop) in zip(frames, self.bounds):
+            for row, column in enumerate(self.columns):
+                prices[row, start:stop] = column_array(df, column)
+        del prices
+
+    @property
+    def name(self) -> str:
+        """
+        Name under which worker processes attach to the block.
+        """
+        return self._shm.name
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """
+        Shape of the price array, (len(columns), total bars).
+        """
+        return len(self.columns), self.n_bars
+
+    def prices(self) -> np.ndarray:
+        """
+        Returns the (len(columns) x total bars) array backed by the shared block.
+        Views must be dropped before the block is closed.
+        """
+        return np.ndarray(self.shape, dtype=np.float64, buffer=self._shm.buf)
+
+    def close(self) -> None:
+        """
+        Releases and removes the shared block.
+        """
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedPrices":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def _analyze_chunk(
+    name: str,
+    shape: Tuple[int, int],
+    close_row: int,
+    chunk: List[Tuple[int, int]],
+    pipeline: IndicatorPipeline,
+) -> List[TickerAnalysis]:
+    """
+    Worker task: maps the shared block named `name`, computes indicators and
+    signals for the tickers stored at each (start, stop) of `chunk` and unmaps
+    it again. Only offsets and the small results cross the process boundary.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        prices = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        return [
+            evaluate_signals(pipeline.run_array(prices[close_row, start:stop]))
+            for start, stop in chunk
+        ]
+    finally:
+        # Views of the block must be dropped before it can be closed
+        prices = None
+        shm.close()
+
+
+def analyze_parallel(
+    data: Dict[str, pd.DataFrame],
+    processes: Optional[int] = None,
+    pipeline: Optional[IndicatorPipeline] = None,
+    memo: Optional[IndicatorMemo] = None,
+) -> Dict[str, TickerAnalysis]:
+    """
+    Computes the `analyze_ticker` indicators and signals for every ticker on a
+    pool of worker processes.
+
+    Prices are copied once into shared memory and workers read them in place, so
+    no DataFrame is pickled; each task is a chunk of (start, stop) offsets and maps
+    the block only while it runs. Tickers found in `memo` are answered in this
+    process and never dispatched.
+
+    Args:
+        data (Dict[str, pd.DataFrame]): Frames keyed by ticker.
+        processes (Optional[int]): Number of worker processes; defaults to the
+            number of CPUs.
+        pipeline (Optional[IndicatorPipeline]): Indicator settings.
+        memo (Optional[IndicatorMemo]): Indicator results reused across scans.
+
+    Returns:
+        Dict[str, TickerAnalysis]: Results in the order of `data`.
+    """
+    pipeline = pipeline or IndicatorPipeline()
+    processes = processes or os.cpu_count() or 1
+    results: Dict[str, Optional[TickerAnalysis]] = dict.fromkeys(data)
+    keys = {}
+    if memo is not None:
+        for ticker, df in data.items():
+            keys[ticker] = pipeline_key(pipeline, column_array(df, "Close"))
+            indicators = memo.get(keys[ticker])
+            if indicators is not None:
+                results[ticker] = evaluate_signals(indicators)
+
+    pending = {ticker: df for ticker, df in data.items() if results[ticker] is None}
+    if pending:
+        with SharedPrices(pending) as shared:
+            # A few chunks per worker balances load without a round trip per ticker
+            size = max(1, len(pending) // (4 * processes))
+            chunks = [shared.bounds[i : i + size] for i in range(0, len(pending), size)]
+            close_row = shared.columns.index("Close")
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                futures = [
+                    executor.submit(
+                        _analyze_chunk,
+                        shared.name,
+                        shared.shape,
+                        close_row,
+                        chunk,
+                        pipeline,
+                    )
+                    for chunk in chunks
+                ]
+                analyses = (a for future in futures for a in future.result())
+                for ticker, analysis in zip(shared.tickers, analyses):
+                    results[ticker] = analysis
+                    if memo is not None:
+                        memo.put(keys[ticker], analysis.indicators)
+    return results
@@ -0,0 +1,76 @@
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from fuzzy_allocator.normalize import flatten_columns
+from fuzzy_allocator.utils.periods import interval_to_timedelta, is_intraday
+
+# How each OHLCV column combines when several bars merge into one
+OHLCV_AGG: Dict[str, str] = {
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Adj Close": "last",
+    "Volume": "sum",
+}
+
+
+def _bin_labels(index: pd.DatetimeIndex, interval: str) -> pd.DatetimeIndex:
+    """
+    Maps every timestamp in `index` to the start of the `interval` bar it belongs to.
+
+    Intraday bins are anchored at each session's first bar, so 4h bars built from
+    1h bars start at the open (09:30, 13:30 on the US session) rather than on a
+    midnight-aligned grid. Daily bins are session dates, weekly bins start on
+    Monday and monthly bins on the 1st, all tz-naive like yfinance's daily bars.
+    """
+    days = index.normalize()
+    if is_intraday(interval):
+        bar = interval_to_timedelta(interval) // pd.Timedelta(1, unit=index.unit)
+        stamps = index.asi8
+        # First timestamp of each session date, broadcast back to every bar
+        day_codes, first_positions = np.unique(days.asi8, return_index=True)
+        session_open = stamps[first_positions][np.searchsorted(day_codes, days.asi8)]
+        labels = session_open + (stamps - session_open) // bar * bar
+        labels = pd.DatetimeIndex(labels.astype(f"M8[{index.unit}]"))
+        if index.tz is not None:
+            # The integer stamps are UTC; restore the exchange time zone
+            labels = labels.tz_localize("UTC").tz_convert(index.tz)
+        return labels
+
+    days = days.tz_localize(None)
+    if interval.endswith("wk"):
+        return days - pd.to_timedelta(days.weekday, unit="D")
+    if interval.endswith("mo"):
+        return days.to_period("M").to_timestamp()
+    return days
+
+
+def resample_ohlcv(df: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """
+    Builds coarser OHLCV bars (e.g. "4h", "1d", "1wk") from finer ones.
+
+    Open is the first open in each bin, High the maximum high, Low the minimum low,
+    Close the last close and Volume the sum. Bins follow session boundaries (see
+    `_bin_labels`); a bin still in progress at the end of the data is returned as
+    a partial bar, the same way yfinance returns the current bar.
+
+    Args:
+        df (pd.DataFrame): Fine-grained bars indexed by timestamp. Intraday bars
+            should be indexed in the exchange's time zone, as yfinance returns them.
+        interval (str): Target yfinance interval string.
+
+    Returns:
+        pd.DataFrame: Resampled bars with flat OHLCV columns.
+    """
+    df = flatten_columns(df)
+    if df.empty:
+        return df
+    agg = {column: how for column, how in OHLCV_AGG.items() if column in df.columns}
+    labels = _bin_labels(df.index, interval)
+    resampled = df.groupby(labels, sort=True).agg(agg)
+    resampled = resampled[[column for column in df.columns if column in agg]]
+    resampled.index.name = "Datetime" if is_intraday(interval) else "Date"
+    return resampled
@@ -0,0 +1,148 @@
+import heapq
+from operator import attrgetter
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from fuzzy_allocator.bar_store import BarStore
+from fuzzy_allocator.data_sources import DataSource
+from fuzzy_allocator.fetch_historical_data import iter_ticker_data
+from fuzzy_allocator.fetch_planner import plan_period
+from fuzzy_allocator.frame_cache import FrameCache
+from fuzzy_allocator.indicator_pipeline import IndicatorPipeline
+from fuzzy_allocator.memo import IndicatorMemo, run_pipeline
+
+# Score points added in an uptrend and removed in a downtrend
+TREND_BONUS = 10.0
+
+
+class ScreenResult(NamedTuple):
+    """
+    One ticker's screening score and the indicators it was computed from.
+    """
+
+    score: float
+    ticker: str
+    pmarp_percentile: float
+    bb_percentile: float
+    trend: str
+
+
+def buy_score(pmarp_percentile: float, bb_percentile: float, trend: str) -> float:
+    """
+    Scores a buy candidate: the lower both percentiles, the higher the score
+    (100 minus their mean), with `TREND_BONUS` for an uptrend and against a
+    downtrend.
+    """
+    score = 100.0 - (pmarp_percentile + bb_percentile) / 2
+    if trend == "Uptrend":
+        score += TREND_BONUS
+    elif trend == "Downtrend":
+        score -= TREND_BONUS
+    return score
+
+
+def sell_score(pmarp_percentile: float, bb_percentile: float, trend: str) -> float:
+    """
+    Scores a take profit candidate: the higher both percentiles, the higher the
+    score, with `TREND_BONUS` against an uptrend that may still run.
+    """
+    score = (pmarp_percentile + bb_percentile) / 2
+    if trend == "Uptrend":
+        score -= TREND_BONUS
+    elif trend == "Downtrend":
+        score += TREND_BONUS
+    return score
+
+
+def _scored(
+    stream: Iterable[Tuple[str, pd.DataFrame]],
+    pipeline: IndicatorPipeline,
+    score: Callable[[float, float, str], float],
+    memo: Optional[IndicatorMemo],
+) -> Iterator[ScreenResult]:
+    for ticker, df in stream:
+        if memo is not None:
+            pmarp, bb, trend = run_pipeline(pipeline, df, memo)
+        else:
+            pmarp, bb, trend = pipeline.run(df)
+        if pmarp is None or bb is None:
+            print(f"[ERROR] Insufficient data to screen {ticker}.")
+            continue
+        yield ScreenResult(
+            score(pmarp[1], bb[1], trend), ticker, pmarp[1], bb[1], trend
+        )
+
+
+def top_k(
+    stream: Iterable[Tuple[str, pd.DataFrame]],
+    k: int = 10,
+    score: Callable[[float, float, str], float] = buy_score,
+    pipeline: Optional[IndicatorPipeline] = None,
+    memo: Optional[IndicatorMemo] = None,
+) -> List[ScreenResult]:
+    """
+    Scores every (ticker, frame) pair of `stream` and keeps the `k` best.
+
+    Only a heap of the best `k` results so far is held while streaming, so memory
+    stays O(k) however many tickers are scanned. Tickers with insufficient data
+    for either percentile are skipped.
+
+    Returns:
+        List[ScreenResult]: The best `k` results, highest score first; ties keep
+        stream order.
+    """
+    pipeline = pipeline or IndicatorPipeline()
+    return heapq.nlargest(
+        k, _scored(stream, pipeline, score, memo), key=attrgetter("score")
+    )
+
+
+def screen(
+    tickers: List[str],
+    period: Optional[str],
+    interval: str,
+    k: int = 10,
+    score: Callable[[float, float, str], float] = buy_score,
+    store: Optional[BarStore] = None,
+    source: Optional[DataSource] = None,
+    cache: Optional[FrameCache] = None,
+    memo: Optional[IndicatorMemo] = None,
+) -> List[ScreenResult]:
+    """
+    Downloads the universe one ticker at a time and prints the `k` best tickers
+    by `score`.
+
+    With `period` None, only as much history as the indicators need is
+    requested.
+
+    Returns:
+        List[ScreenResult]: The best `k` results, highest score first.
+    """
+    pipeline = IndicatorPipeline()
+    if period is None:
+        period = plan_period(pipeline.warmup_bars, interval)
+    stream = iter_ticker_data(
+        tickers, period, interval, store=store, source=source, cache=cache
+    )
+    results = top_k(stream, k, score, pipeline, memo)
+    if memo is not None:
+        memo.save()
+
+    print(f"\n=== Top {len(results)} of {len(tickers)} tickers ({score.__name__}) ===")
+    for rank, result in enumerate(results, start=1):
+        print(
+            f"[INFO] {rank:>3}. {result.ticker:<8} Score: {result.score:6.1f}  "
+            f"PMARP: {result.pmarp_percentile:5.1f}%  "
+            f"BB: {result.bb_percentile:5.1f}%  Trend: {result.trend}"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    from fuzzy_allocator.fetch_historical_data import tickers
+    from fuzzy_allocator.utils.cache_dir import cache_dir
+
+    root = cache_dir()
+    store = BarStore(root / "bars") if root else None
+    screen(tickers, period=None, interval="4h", k=10, store=store)
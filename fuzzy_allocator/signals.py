@@ -0,0 +1,255 @@
+from enum import IntEnum
+from typing import NamedTuple, Optional, Union
+
+import numpy as np
+
+from fuzzy_allocator.indicator_pipeline import IndicatorResult
+
+
+class TakeProfitLevel(IntEnum):
+    """
+    Strength of a take profit signal, ordered from none to strongest.
+    """
+
+    NONE = 0
+    STANDARD = 1
+    LONG_TERM = 2
+
+
+class FinalSignal(IntEnum):
+    """
+    Combined PMARP and Bollinger Bands signal. Prints as "Buy", "Sell" or "Hold".
+    """
+
+    HOLD = 0
+    BUY = 1
+    SELL = -1
+
+    def __str__(self) -> str:
+        return self.name.title()
+
+    def __format__(self, format_spec: str) -> str:
+        return format(str(self), format_spec)
+
+
+# Labels indexed by FinalSignal code - FinalSignal.SELL
+_LABELS_BY_CODE = np.array(
+    [str(signal) for signal in sorted(FinalSignal)], dtype=object
+)
+
+
+class TakeProfitSignal:
+    """
+    Take profit signal for a PMARP percentile. The message is only built when the
+    signal is formatted.
+    """
+
+    __slots__ = ("level", "percentile", "standard_threshold", "long_term_threshold")
+
+    def __init__(
+        self,
+        level: TakeProfitLevel,
+        percentile: float,
+        standard_threshold: float,
+        long_term_threshold: float,
+    ) -> None:
+        self.level = level
+        self.percentile = percentile
+        self.standard_threshold = standard_threshold
+        self.long_term_threshold = long_term_threshold
+
+    def __repr__(self) -> str:
+        return f"TakeProfitSignal({self.level.name}, percentile={self.percentile!r})"
+
+    def __str__(self) -> str:
+        if self.level is TakeProfitLevel.LONG_TERM:
+            return f"Long-term signal: PMARP percentile at {self.percentile:.1f}%. Consider selling (take profit)."
+        elif self.level is TakeProfitLevel.STANDARD:
+            return f"Standard signal: PMARP percentile at {self.percentile:.1f}%. Potential take profit signal."
+        else:
+            return f"No take profit signal: PMARP percentile at {self.percentile:.1f}%."
+
+
+class BuySignal:
+    """
+    Buy signal for a PMARP percentile; truthy when triggered. The message is only
+    built when the signal is formatted.
+    """
+
+    __slots__ = ("triggered", "percentile", "buy_threshold")
+
+    def __init__(
+        self, triggered: bool, percentile: float, buy_threshold: float
+    ) -> None:
+        self.triggered = triggered
+        self.percentile = percentile
+        self.buy_threshold = buy_threshold
+
+    def __bool__(self) -> bool:
+        return self.triggered
+
+    def __repr__(self) -> str:
+        return f"BuySignal(triggered={self.triggered}, percentile={self.percentile!r})"
+
+    def __str__(self) -> str:
+        if self.triggered:
+            return f"Buy signal: PMARP percentile is {self.percentile:.1f}%, which is below the buy threshold of {self.buy_threshold}%."
+        else:
+            return f"No buy signal: PMARP percentile is {self.percentile:.1f}% (buy threshold is {self.buy_threshold}%)."
+
+
+def take_profit_signal(
+    pmarp_percentile: float,
+    standard_threshold: float = 75,
+    long_term_threshold: float = 90,
+) -> TakeProfitSignal:
+    """
+    Classifies a PMARP percentile into a take profit level.
+    """
+    if pmarp_percentile >= long_term_threshold:
+        level = TakeProfitLevel.LONG_TERM
+    elif pmarp_percentile >= standard_threshold:
+        level = TakeProfitLevel.STANDARD
+    else:
+        level = TakeProfitLevel.NONE
+    return TakeProfitSignal(
+        level, pmarp_percentile, standard_threshold, long_term_threshold
+    )
+
+
+def buy_signal(pmarp_percentile: float, buy_threshold: float = 25) -> BuySignal:
+    """
+    Checks a PMARP percentile against the buy threshold.
+    """
+    return BuySignal(
+        bool(pmarp_percentile <= buy_threshold), pmarp_percentile, buy_threshold
+    )
+
+
+def final_signal(
+    pmarp_percentile: float,
+    bb_percentile: float,
+    buy_threshold: float = 25,
+    sell_threshold: float = 90,
+) -> FinalSignal:
+    """
+    Combines the PMARP and Bollinger Bands percentiles: Buy if both are at or below
+    the buy threshold, Sell if both are at or above the sell threshold, Hold
+    otherwise.
+    """
+    if pmarp_percentile <= buy_threshold and bb_percentile <= buy_threshold:
+        return FinalSignal.BUY
+    elif pmarp_percentile >= sell_threshold and bb_percentile >= sell_threshold:
+        return FinalSignal.SELL
+    else:
+        return FinalSignal.HOLD
+
+
+def classify_take_profit(
+    pmarp_percentiles: np.ndarray,
+    standard_threshold: float = 75,
+    long_term_threshold: float = 90,
+) -> np.ndarray:
+    """
+    Vectorized `take_profit_signal`: classifies a whole array of PMARP percentiles
+    at once.
+
+    Returns:
+        np.ndarray: `TakeProfitLevel` codes as int8; NaN percentiles get NONE.
+    """
+    pmarp_percentiles = np.asarray(pmarp_percentiles, dtype=np.float64)
+    levels = np.full(pmarp_percentiles.shape, TakeProfitLevel.NONE, dtype=np.int8)
+    levels[pmarp_percentiles >= standard_threshold] = TakeProfitLevel.STANDARD
+    levels[pmarp_percentiles >= long_term_threshold] = TakeProfitLevel.LONG_TERM
+    return levels
+
+
+def classify_buy(
+    pmarp_percentiles: np.ndarray, buy_threshold: float = 25
+) -> np.ndarray:
+    """
+    Vectorized `buy_signal`.
+
+    Returns:
+        np.ndarray: True where the buy signal triggers; False for NaN percentiles.
+    """
+    return np.asarray(pmarp_percentiles, dtype=np.float64) <= buy_threshold
+
+
+def classify_final(
+    pmarp_percentiles: np.ndarray,
+    bb_percentiles: np.ndarray,
+    buy_thresholds: Union[float, np.ndarray] = 25,
+    sell_thresholds: Union[float, np.ndarray] = 90,
+) -> np.ndarray:
+    """
+    Vectorized `final_signal` for a whole universe in one pass of NumPy masks.
+
+    Args:
+        pmarp_percentiles (np.ndarray): PMARP percentile per ticker.
+        bb_percentiles (np.ndarray): Bollinger Bands percentile per ticker, aligned
+            with `pmarp_percentiles`.
+        buy_thresholds (Union[float, np.ndarray]): Buy threshold, either shared or
+            one per ticker.
+        sell_thresholds (Union[float, np.ndarray]): Sell threshold, either shared
+            or one per ticker.
+
+    Returns:
+        np.ndarray: `FinalSignal` codes as int8. Tickers with a NaN percentile get
+        HOLD; as in `final_signal`, Buy wins if both conditions hold.
+    """
+    pmarp_percentiles = np.asarray(pmarp_percentiles, dtype=np.float64)
+    bb_percentiles = np.asarray(bb_percentiles, dtype=np.float64)
+    buy_thresholds = np.asarray(buy_thresholds, dtype=np.float64)
+    sell_thresholds = np.asarray(sell_thresholds, dtype=np.float64)
+    # Both percentiles clear a threshold when the weaker of the two does; NaN
+    # compares False and stays HOLD
+    low = np.maximum(pmarp_percentiles, bb_percentiles)
+    high = np.minimum(pmarp_percentiles, bb_percentiles)
+    codes = np.zeros(np.broadcast(low, buy_thresholds, sell_thresholds).shape, np.int8)
+    codes[high >= sell_thresholds] = FinalSignal.SELL
+    codes[low <= buy_thresholds] = FinalSignal.BUY
+    return codes
+
+
+def final_signal_labels(codes: np.ndarray) -> np.ndarray:
+    """
+    Turns `classify_final` codes into "Buy", "Sell" and "Hold" labels.
+    """
+    return _LABELS_BY_CODE[np.asarray(codes) - FinalSignal.SELL]
+
+
+class TickerAnalysis(NamedTuple):
+    """
+    A ticker's indicators together with the signals derived from them, as printed
+    by `analyze_ticker`. Signals that need a missing indicator are None.
+    """
+
+    indicators: IndicatorResult
+    take_profit: Optional[TakeProfitSignal]
+    buy: Optional[BuySignal]
+    final: Optional[FinalSignal]
+
+
+def evaluate_signals(
+    indicators: IndicatorResult,
+    buy_threshold: float = 25,
+    sell_threshold: float = 90,
+) -> TickerAnalysis:
+    """
+    Derives the take profit, buy and final signals `analyze_ticker` reports from a
+    ticker's indicators.
+    """
+    take_profit = buy = final = None
+    if indicators.pmarp:
+        pmarp_percentile = indicators.pmarp[1]
+        take_profit = take_profit_signal(pmarp_percentile)
+        buy = buy_signal(pmarp_percentile, buy_threshold=buy_threshold)
+        if indicators.bb:
+            final = final_signal(
+                pmarp_percentile,
+                indicators.bb[1],
+                buy_threshold=buy_threshold,
+                sell_threshold=sell_threshold,
+            )
+    return TickerAnalysis(indicators, take_profit, buy, final)
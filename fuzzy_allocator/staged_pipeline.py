@@ -0,0 +1,201 @@
+import heapq
+import queue
+import threading
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+# Marks the end of a queue's input
+_DONE = object()
+
+
+class Stage:
+    """
+    One step of a staged pipeline.
+
+    Attributes:
+        name (str): Name used in error reports.
+        func (Callable[[Any], Any]): Turns the value from the previous stage into
+            the value handed to the next one.
+        workers (int): Threads running `func` concurrently; at least one.
+        maxsize (int): Capacity of the queue feeding this stage; a full queue
+            blocks the stage before it, so a slow stage holds back its producers
+            instead of letting work pile up in memory.
+
+    Raises:
+        ValueError: If `workers` or `maxsize` is below one; a stage without
+            workers would never close its output and the run would hang.
+    """
+
+    __slots__ = ("name", "func", "workers", "maxsize")
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Any], Any],
+        workers: int = 1,
+        maxsize: int = 16,
+    ) -> None:
+        if workers < 1:
+            raise ValueError(f"stage {name!r} needs at least one worker")
+        if maxsize < 1:
+            raise ValueError(f"stage {name!r} needs a queue size of at least one")
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.maxsize = maxsize
+
+    def __repr__(self) -> str:
+        return f"Stage({self.name!r}, workers={self.workers}, maxsize={self.maxsize})"
+
+
+class StageError(NamedTuple):
+    """
+    Stands in for the value of an item whose stage raised; later stages pass it on
+    untouched so the sink still sees the item in order.
+    """
+
+    stage: str
+    error: Exception
+
+
+def _feed(
+    items: Iterable[Tuple[Hashable, Any]],
+    inbox: queue.Queue,
+    workers: int,
+    admitted: threading.Semaphore,
+) -> None:
+    for seq, (key, value) in enumerate(items):
+        # Released by the sink loop once the item has been handed to `sink`
+        admitted.acquire()
+        inbox.put((seq, key, value))
+    for _ in range(workers):
+        inbox.put(_DONE)
+
+
+def _work(
+    stage: Stage,
+    inbox: queue.Queue,
+    outbox: queue.Queue,
+    downstream_workers: int,
+    finished: List[int],
+    lock: threading.Lock,
+) -> None:
+    while True:
+        envelope = inbox.get()
+        if envelope is _DONE:
+            break
+        seq, key, value = envelope
+        if not isinstance(value, StageError):
+            try:
+                value = stage.func(value)
+            except Exception as exc:  # pylint: disable=broad-except
+                value = StageError(stage.name, exc)
+        outbox.put((seq, key, value))
+    # The last worker of a stage to finish closes the next queue
+    with lock:
+        finished[0] += 1
+        last = finished[0] == stage.workers
+    if last:
+        for _ in range(downstream_workers):
+            outbox.put(_DONE)
+
+
+def run_stages(
+    items: Iterable[Tuple[Hashable, Any]],
+    stages: List[Stage],
+    sink: Callable[[Hashable, Any], None],
+    ordered: bool = True,
+    max_in_flight: Optional[int] = None,
+) -> Dict[Hashable, StageError]:
+    """
+    Streams (key, value) items through `stages` on worker threads connected by
+    bounded queues, handing each result to `sink` in the calling thread.
+
+    Every stage works on the next items while later stages are still busy with
+    earlier ones, so downloads, computation and output overlap. A stage that
+    raises for an item does not stop the run: the item reaches `sink` with a
+    `StageError` in place of its value.
+
+    Args:
+        items (Iterable[Tuple[Hashable, Any]]): Input items, consumed lazily by a
+            feeder thread.
+        stages (List[Stage]): Stages in order.
+        sink (Callable[[Hashable, Any], None]): Called with each item's key and
+            final value; the only place results are consumed, so it needs no
+            locking.
+        ordered (bool): Hand items to `sink` in input order. Results that finish
+            early wait in a buffer for the ones before them, so keep the last
+            stage's values small.
+        max_in_flight (Optional[int]): Items fed in but not yet handed to `sink`;
+            the feeder waits beyond that, which also caps the reorder buffer when
+            a slow item holds back the ones after it. Defaults to the total
+            capacity of the stages' queues and workers.
+
+    Returns:
+        Dict[Hashable, StageError]: The failed items by key.
+    """
+    if not stages:
+        raise ValueError("at least one stage is required")
+    if max_in_flight is None:
+        max_in_flight = sum(stage.maxsize + stage.workers for stage in stages)
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least one")
+    admitted = threading.Semaphore(max_in_flight)
+
+    queues = [queue.Queue(maxsize=stage.maxsize) for stage in stages]
+    results: queue.Queue = queue.Queue(maxsize=stages[-1].maxsize)
+    threads = [
+        threading.Thread(
+            target=_feed,
+            args=(items, queues[0], stages[0].workers, admitted),
+            daemon=True,
+        )
+    ]
+    for i, stage in enumerate(stages):
+        outbox = queues[i + 1] if i + 1 < len(stages) else results
+        downstream_workers = stages[i + 1].workers if i + 1 < len(stages) else 1
+        finished, lock = [0], threading.Lock()
+        for _ in range(stage.workers):
+            threads.append(
+                threading.Thread(
+                    target=_work,
+                    args=(stage, queues[i], outbox, downstream_workers, finished, lock),
+                    daemon=True,
+                )
+            )
+    # Daemon threads: an exception in `sink` leaves blocked workers behind
+    # instead of hanging interpreter exit
+    for thread in threads:
+        thread.start()
+
+    errors: Dict[Hashable, StageError] = {}
+    pending: List[Tuple[int, Hashable, Any]] = []
+    next_seq = 0
+    while True:
+        envelope = results.get()
+        if envelope is _DONE:
+            break
+        if not ordered:
+            pending = [envelope]
+        else:
+            heapq.heappush(pending, envelope)
+        while pending and (not ordered or pending[0][0] == next_seq):
+            _, key, value = heapq.heappop(pending)
+            next_seq += 1
+            if isinstance(value, StageError):
+                errors[key] = value
+            sink(key, value)
+            admitted.release()
+
+    for thread in threads:
+        thread.join()
+    return errors
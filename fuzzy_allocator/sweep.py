@@ -0,0 +1,312 @@
+from itertools import product
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from fuzzy_allocator.kernels import (
+    bb_kernel,
+    close_array,
+    percentile_of_last,
+    pmarp_kernel,
+)
+from fuzzy_allocator.trading_funcs import (
+    compute_pmarp_series,
+    rolling_percentile_rank,
+)
+
+_GRID_NAMES = ["ma_period", "lookback"]
+# Bars per set of prefix sums in the series sweeps; longer stretches let the
+# rounding error of the sums grow with the drift of the closes
+_SERIES_CHUNK = 1 << 12
+
+
+class _PrefixSums:
+    """
+    Cumulative sums and sums of squares of a NaN-free close array, shared by every
+    window length of a sweep.
+
+    Values are taken relative to the latest close to limit cancellation, so the
+    array should span no more bars than the windows need. Each window length then
+    costs one O(n) difference of prefix sums.
+    """
+
+    def __init__(self, close: np.ndarray) -> None:
+        self.close = close
+        self.ref = close[-1]
+        shifted = close - self.ref
+        self.sums = np.concatenate(([0.0], np.cumsum(shifted)))
+        self.sums_sq = np.concatenate(([0.0], np.cumsum(shifted * shifted)))
+        self.changes = np.concatenate(([0], np.cumsum(close[1:] != close[:-1])))
+
+    def window_sums(self, period: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the sums and sums of squares (relative to `ref`) of every window
+        of length `period`, aligned with `close[period - 1:]`.
+        """
+        s1 = self.sums[period:] - self.sums[:-period]
+        s2 = self.sums_sq[period:] - self.sums_sq[:-period]
+        return s1, s2
+
+    def pmarp(self, period: int) -> np.ndarray:
+        """
+        Returns Close / MA(period) for every bar from `period - 1` on.
+        """
+        s1, _ = self.window_sums(period)
+        ratios = self.close[period - 1 :] / (self.ref + s1 / period)
+        # Exactly 1 on flat windows, as with pandas, whatever the rounding of the
+        # sums; ties among these ratios set the rank
+        ratios[self._flat(period)] = 1.0
+        return ratios
+
+    def bb_positions(self, period: int) -> np.ndarray:
+        """
+        Returns the Bollinger Bands position for every bar from `period - 1` on,
+        NaN for flat windows, where the position is undefined.
+        """
+        s1, s2 = self.window_sums(period)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Exact numerators for prices on a tick grid, as in `IndicatorPipeline`
+            variance = np.maximum(period * s2 - s1 * s1, 0.0) / (period * (period - 1))
+            std = np.sqrt(variance)
+            deviation = (period * (self.close[period - 1 :] - self.ref) - s1) / period
+            positions = (deviation + 2 * std) / (4 * std)
+        positions[self._flat(period)] = np.nan
+        return positions
+
+    def _flat(self, period: int) -> np.ndarray:
+        return self.changes[period - 1 :] == self.changes[: -period + 1 or None]
+
+
+def _chunked(
+    values: np.ndarray, ma_periods: List[int], name: str
+) -> Dict[int, np.ndarray]:
+    """
+    Evaluates the `_PrefixSums` method `name` for every period in `ma_periods` over
+    the whole of `values`, with fresh prefix sums for every `_SERIES_CHUNK` bars.
+
+    Returns:
+        Dict[int, np.ndarray]: Per period, the values aligned with
+        `values[period - 1:]`; periods longer than `values` are left out.
+    """
+    longest = max(ma_periods, default=1)
+    step = max(_SERIES_CHUNK, longest)
+    pieces = {period: [] for period in ma_periods if values.shape[0] >= period}
+    for start in range(0, values.shape[0], step):
+        stop = min(start + step, values.shape[0])
+        # Reach back far enough for the longest window ending on `start`
+        first = max(0, start - longest + 1)
+        sums = _PrefixSums(values[first:stop])
+        for period, chunks in pieces.items():
+            found = getattr(sums, name)(period)
+            chunks.append(found[max(0, start - first - period + 1) :])
+    return {period: np.concatenate(chunks) for period, chunks in pieces.items()}
+
+
+def _grid_frame(
+    rows: List[Tuple[float, float]],
+    ma_periods: List[int],
+    lookbacks: List[int],
+    value_name: str,
+) -> pd.DataFrame:
+    index = pd.MultiIndex.from_product([ma_periods, lookbacks], names=_GRID_NAMES)
+    return pd.DataFrame(rows, index=index, columns=[value_name, "Percentile"])
+
+
+def _last_ranked(values: np.ndarray, lookback: int) -> Tuple[float, float]:
+    if values.shape[0] < lookback:
+        return np.nan, np.nan
+    window = values[-lookback:]
+    return window[-1], percentile_of_last(window)
+
+
+def _bb_percentile_series(
+    df: pd.DataFrame, ma_period: int, lookback: int
+) -> np.ndarray:
+    """
+    Bollinger Bands position percentile for every bar through pandas' rolling
+    windows, for histories with gaps.
+    """
+    close = pd.Series(close_array(df), index=df.index)
+    rolling = close.rolling(window=ma_period)
+    ma = rolling.mean()
+    std = rolling.std()
+    lower = ma - 2 * std
+    upper = ma + 2 * std
+    position = ((close - lower) / (upper - lower)).dropna()
+    ranks = rolling_percentile_rank(position.to_numpy(), lookback)
+    return pd.Series(ranks, index=position.index).reindex(df.index).to_numpy()
+
+
+def sweep_pmarp(
+    df: pd.DataFrame, ma_periods: Iterable[int], lookbacks: Iterable[int]
+) -> pd.DataFrame:
+    """
+    Evaluates `compute_pmarp` for every combination of `ma_periods` and
+    `lookbacks`.
+
+    The prefix sums are built once over the closes the longest combination needs;
+    each moving average period then costs one pass over them and each lookback a
+    single O(lookback) rank.
+
+    Args:
+        df (pd.DataFrame): Historical price data containing the 'Close' column.
+        ma_periods (Iterable[int]): Moving average periods to try.
+        lookbacks (Iterable[int]): Percentile lookbacks to try.
+
+    Returns:
+        pd.DataFrame: "PMARP" and "Percentile" per (ma_period, lookback), NaN
+        where there is insufficient data.
+    """
+    ma_periods, lookbacks = list(ma_periods), list(lookbacks)
+    close = close_array(df)
+    rows = []
+    if np.isnan(close).any():
+        # Gaps change which windows exist; let the kernel handle each combination
+        for ma_period, lookback in product(ma_periods, lookbacks):
+            rows.append(pmarp_kernel(close, ma_period, lookback) or (np.nan, np.nan))
+        return _grid_frame(rows, ma_periods, lookbacks, "PMARP")
+
+    recent = close[-(max(lookbacks, default=1) + max(ma_periods, default=1) - 1) :]
+    sums = _PrefixSums(recent) if close.shape[0] else None
+    for ma_period in ma_periods:
+        ratios = sums.pmarp(ma_period) if close.shape[0] >= ma_period else close[:0]
+        rows.extend(_last_ranked(ratios, lookback) for lookback in lookbacks)
+    return _grid_frame(rows, ma_periods, lookbacks, "PMARP")
+
+
+def sweep_bb_percentile(
+    df: pd.DataFrame, ma_periods: Iterable[int], lookbacks: Iterable[int]
+) -> pd.DataFrame:
+    """
+    Evaluates `compute_bb_percentile` for every combination of `ma_periods` and
+    `lookbacks`, sharing one set of prefix sums, over the closes the longest
+    combination needs, across all periods.
+
+    Args:
+        df (pd.DataFrame): Historical price data containing the 'Close' column.
+        ma_periods (Iterable[int]): Bollinger Bands periods to try.
+        lookbacks (Iterable[int]): Percentile lookbacks to try.
+
+    Returns:
+        pd.DataFrame: "BB_Position" and "Percentile" per (ma_period, lookback), NaN
+        where there is insufficient data.
+    """
+    ma_periods, lookbacks = list(ma_periods), list(lookbacks)
+    close = close_array(df)
+    rows = []
+    if np.isnan(close).any():
+        for ma_period, lookback in product(ma_periods, lookbacks):
+            rows.append(bb_kernel(close, ma_period, lookback) or (np.nan, np.nan))
+        return _grid_frame(rows, ma_periods, lookbacks, "BB_Position")
+
+    recent = close[-(max(lookbacks, default=1) + max(ma_periods, default=1) - 1) :]
+    sums = _PrefixSums(recent) if close.shape[0] else None
+    for ma_period in ma_periods:
+        if close.shape[0] >= ma_period:
+            positions = sums.bb_positions(ma_period)
+            positions = positions[~np.isnan(positions)]
+        else:
+            positions = close[:0]
+        for lookback in lookbacks:
+            if positions.shape[0] < lookback and recent.shape[0] < close.shape[0]:
+                # Flat windows were dropped from the tail; let the kernel reach
+                # further back, as `dropna` over the whole history does
+                rows.append(bb_kernel(close, ma_period, lookback) or (np.nan, np.nan))
+            else:
+                rows.append(_last_ranked(positions, lookback))
+    return _grid_frame(rows, ma_periods, lookbacks, "BB_Position")
+
+
+def sweep_pmarp_series(
+    df: pd.DataFrame, ma_periods: Iterable[int], lookbacks: Iterable[int]
+) -> pd.DataFrame:
+    """
+    Computes `compute_pmarp_series` for every combination of `ma_periods` and
+    `lookbacks`, for backtesting thresholds across parameters.
+
+    Returns:
+        pd.DataFrame: One PMARP percentile column per (ma_period, lookback),
+        indexed like `df`.
+    """
+    ma_periods, lookbacks = list(ma_periods), list(lookbacks)
+    values = close_array(df)
+    columns = {}
+    if np.isnan(values).any() or not values.shape[0]:
+        for ma_period, lookback in product(ma_periods, lookbacks):
+            columns[(ma_period, lookback)] = compute_pmarp_series(
+                df, ma_period, lookback
+            ).to_numpy()
+    else:
+        all_ratios = _chunked(values, ma_periods, "pmarp")
+        for ma_period in ma_periods:
+            ratios = all_ratios.get(ma_period)
+            for lookback in lookbacks:
+                ranks = np.full(values.shape[0], np.nan)
+                if ratios is not None:
+                    ranks[ma_period - 1 :] = rolling_percentile_rank(ratios, lookback)
+                columns[(ma_period, lookback)] = ranks
+    result = pd.DataFrame(columns, index=df.index)
+    result.columns = pd.MultiIndex.from_tuples(result.columns, names=_GRID_NAMES)
+    return result
+
+
+def sweep_bb_percentile_series(
+    df: pd.DataFrame, ma_periods: Iterable[int], lookbacks: Iterable[int]
+) -> pd.DataFrame:
+    """
+    Computes the Bollinger Bands position percentile for every bar, as
+    `compute_bb_percentile` would report it on the history up to that bar, for
+    every combination of `ma_periods` and `lookbacks`.
+
+    Returns:
+        pd.DataFrame: One Bollinger Bands percentile column per
+        (ma_period, lookback), indexed like `df`.
+    """
+    ma_periods, lookbacks = list(ma_periods), list(lookbacks)
+    values = close_array(df)
+    columns = {}
+    if np.isnan(values).any() or not values.shape[0]:
+        for ma_period, lookback in product(ma_periods, lookbacks):
+            columns[(ma_period, lookback)] = _bb_percentile_series(
+                df, ma_period, lookback
+            )
+    else:
+        all_positions = _chunked(values, ma_periods, "bb_positions")
+        for ma_period in ma_periods:
+            positions = all_positions.get(ma_period)
+            if positions is not None:
+                defined = np.flatnonzero(~np.isnan(positions)) + ma_period - 1
+                positions = positions[~np.isnan(positions)]
+            for lookback in lookbacks:
+                ranks = np.full(values.shape[0], np.nan)
+                if positions is not None:
+                    ranks[defined] = rolling_percentile_rank(positions, lookback)
+                columns[(ma_period, lookback)] = ranks
+    result = pd.DataFrame(columns, index=df.index)
+    result.columns = pd.MultiIndex.from_tuples(result.columns, names=_GRID_NAMES)
+    return result
+
+
+if __name__ == "__main__":
+    import time
+
+    from fuzzy_allocator.synthetic import generate_ohlcv
+
+    df = generate_ohlcv("SYN", n_bars=2_000, interval="4h", seed=0)
+    ma_periods, lookbacks = range(10, 101, 5), range(50, 301, 25)
+
+    start = time.perf_counter()
+    grid = sweep_pmarp(df, ma_periods, lookbacks)
+    print(
+        f"[INFO] PMARP sweep of {len(grid)} combinations in "
+        f"{time.perf_counter() - start:.3f}s"
+    )
+    print(grid.sort_values("Percentile").tail())
+
+    start = time.perf_counter()
+    series = sweep_bb_percentile_series(df, ma_periods, lookbacks)
+    print(
+        f"[INFO] Bollinger Bands percentile series for {series.shape[1]} "
+        f"combinations in {time.perf_counter() - start:.3f}s"
+    )
@@ -0,0 +1,286 @@
+import time
+from typing import Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from fuzzy_allocator.utils.periods import interval_to_timedelta, is_intraday
+from fuzzy_allocator.utils.sessions import (
+    EXCHANGE_TZ,
+    SESSION_LENGTH,
+    SESSION_OPEN,
+    TRADING_DAYS_PER_YEAR,
+)
+
+# Default (annual drift, annual volatility) regimes: calm bull, choppy, bear
+DEFAULT_REGIMES: Sequence[Tuple[float, float]] = (
+    (0.15, 0.15),
+    (0.0, 0.25),
+    (-0.25, 0.45),
+)
+
+
+def bars_per_year(interval: str) -> float:
+    """
+    Returns the number of `interval` bars in a trading year.
+    """
+    bar = interval_to_timedelta(interval)
+    if is_intraday(interval):
+        bars_per_session = int(np.ceil(SESSION_LENGTH / bar))
+        return TRADING_DAYS_PER_YEAR * bars_per_session
+    return TRADING_DAYS_PER_YEAR / (bar / pd.Timedelta(days=1))
+
+
+def synthetic_index(
+    n_bars: int, interval: str = "1d", start: str = "2000-01-03"
+) -> pd.DatetimeIndex:
+    """
+    Builds a timestamp index shaped like yfinance's: business days for daily and
+    longer bars (tz-naive, named "Date"), and regular-session bars in
+    America/New_York for intraday intervals (named "Datetime").
+
+    Very long histories that do not fit nanosecond timestamps fall back to second
+    resolution.
+    """
+    bar = interval_to_timedelta(interval)
+    if is_intraday(interval):
+        bars_per_session = int(np.ceil(SESSION_LENGTH / bar))
+        n_sessions = -(-n_bars // bars_per_session)
+        sessions = pd.bdate_range(start, periods=n_sessions, unit="s")
+        # Offsets of each bar from midnight, in seconds to match `sessions`
+        offsets = SESSION_OPEN.total_seconds() + bar.total_seconds() * np.arange(
+            bars_per_session
+        )
+        stamps = (sessions.asi8[:, None] + offsets.astype(np.int64)).ravel()[:n_bars]
+        index = pd.DatetimeIndex(stamps.astype("M8[s]")).tz_localize(EXCHANGE_TZ)
+        name = "Datetime"
+    else:
+        # yfinance labels weekly bars by their Monday and monthly bars by the 1st
+        count = interval.rstrip("dwkmo")
+        if interval.endswith("wk"):
+            freq = f"{count}W-MON"
+        elif interval.endswith("mo"):
+            freq = f"{count}MS"
+        else:
+            freq = f"{count}B"
+        index = pd.date_range(start, periods=n_bars, freq=freq, unit="s")
+        name = "Date"
+
+    # Use yfinance's nanosecond resolution when the range allows it
+    try:
+        index = index.as_unit("ns")
+    except pd.errors.OutOfBoundsDatetime:
+        pass
+    index.name = name
+    return index
+
+
+def simulate_log_returns(
+    rng: np.random.Generator,
+    n_bars: int,
+    n_paths: int,
+    interval: str = "1d",
+    drift: float = 0.08,
+    volatility: float = 0.2,
+    regimes: Optional[Sequence[Tuple[float, float]]] = None,
+    regime_switch_prob: float = 0.0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Simulates per-bar geometric Brownian motion log returns for `n_paths` paths.
+
+    With `regimes` and a non-zero `regime_switch_prob`, each path follows a Markov
+    chain over the (annual drift, annual volatility) pairs, jumping to a different
+    regime with probability `regime_switch_prob` on every bar.
+
+    Returns:
+        Tuple containing:
+          - log returns, shape (n_bars, n_paths)
+          - per-bar volatility, shape (n_bars, n_paths), used to size bar ranges
+    """
+    dt = 1.0 / bars_per_year(interval)
+    if regimes and regime_switch_prob > 0:
+        params = np.asarray(regimes, dtype=np.float64)
+        n_regimes = len(params)
+        switches = rng.random((n_bars, n_paths)) < regime_switch_prob
+        # Each switch moves to a different regime: step by 1..n_regimes-1 (mod n)
+        steps = np.where(switches, rng.integers(1, n_regimes, (n_bars, n_paths)), 0)
+        state = (rng.integers(0, n_regimes, n_paths) + np.cumsum(steps, axis=0)) % (
+            n_regimes
+        )
+        mu = params[state, 0]
+        sigma = params[state, 1]
+    else:
+        mu = np.full((n_bars, n_paths), drift)
+        sigma = np.full((n_bars, n_paths), volatility)
+
+    bar_sigma = sigma * np.sqrt(dt)
+    log_returns = (mu - 0.5 * sigma**2) * dt + bar_sigma * rng.standard_normal(
+        (n_bars, n_paths)
+    )
+    return log_returns, bar_sigma
+
+
+def simulate_close_panel(
+    n_bars: int,
+    n_tickers: int,
+    interval: str = "1d",
+    seed: Optional[int] = None,
+    start_price: float = 100.0,
+    **kwargs,
+) -> np.ndarray:
+    """
+    Simulates a (time x ticker) array of closing prices in one vectorized pass.
+
+    Keyword arguments are forwarded to `simulate_log_returns`.
+    """
+    rng = np.random.default_rng(seed)
+    log_returns, _ = simulate_log_returns(rng, n_bars, n_tickers, interval, **kwargs)
+    return start_price * np.exp(np.cumsum(log_returns, axis=0))
+
+
+def generate_ohlcv(
+    ticker: str = "SYN",
+    n_bars: int = 1000,
+    interval: str = "1d",
+    seed: Optional[int] = None,
+    start: str = "2000-01-03",
+    start_price: float = 100.0,
+    drift: float = 0.08,
+    volatility: float = 0.2,
+    regimes: Optional[Sequence[Tuple[float, float]]] = None,
+    regime_switch_prob: float = 0.0,
+    gap_prob: float = 0.0,
+    gap_scale: float = 0.03,
+    multi_level_index: bool = True,
+) -> pd.DataFrame:
+    """
+    Generates a synthetic OHLCV frame in the shape `yf.download` returns for a
+    single ticker.
+
+    Prices follow geometric Brownian motion, optionally with regime switches (see
+    `simulate_log_returns`). With `gap_prob` > 0, the first bar of a session opens
+    away from the previous close by a normal jump of scale `gap_scale`, with that
+    probability.
+
+    Args:
+        ticker (str): Ticker name used in the column index.
+        n_bars (int): Number of bars.
+        interval (str): yfinance interval string, controls timestamps and scaling.
+        seed (Optional[int]): Seed for reproducible output.
+        start (str): First session date.
+        start_price (float): Price before the first bar.
+        drift (float): Annual drift when regimes are not used.
+        volatility (float): Annual volatility when regimes are not used.
+        regimes (Optional[Sequence[Tuple[float, float]]]): (annual drift, annual
+            volatility) pairs, e.g. `DEFAULT_REGIMES`.
+        regime_switch_prob (float): Per-bar probability of changing regime.
+        gap_prob (float): Per-session probability of an opening gap.
+        gap_scale (float): Standard deviation of an opening gap, in log terms.
+        multi_level_index (bool): Return (Price, Ticker) `MultiIndex` columns like
+            `yf.download`; set False for flat OHLCV columns.
+
+    Returns:
+        pd.DataFrame: Close, High, Low, Open and Volume columns.
+    """
+    rng = np.random.default_rng(seed)
+    log_returns, bar_sigma = simulate_log_returns(
+        rng,
+        n_bars,
+        1,
+        interval,
+        drift=drift,
+        volatility=volatility,
+        regimes=regimes,
+        regime_switch_prob=regime_switch_prob,
+    )
+    log_returns = log_returns[:, 0]
+    bar_sigma = bar_sigma[:, 0]
+    index = synthetic_index(n_bars, interval, start)
+
+    gaps = np.zeros(n_bars)
+    if gap_prob > 0:
+        # Every daily bar opens a session; intraday bars only on a new date
+        session_open = np.ones(n_bars, dtype=bool)
+        if is_intraday(interval):
+            dates = index.normalize().asi8
+            session_open[1:] = dates[1:] != dates[:-1]
+        has_gap = session_open & (rng.random(n_bars) < gap_prob)
+        gaps[has_gap] = gap_scale * rng.standard_normal(has_gap.sum())
+
+    # The close-to-close move is the opening gap plus the move within the bar
+    log_close = np.log(start_price) + np.cumsum(gaps + log_returns)
+    close = np.exp(log_close)
+    prev_close = np.exp(np.concatenate(([np.log(start_price)], log_close[:-1])))
+    open_ = prev_close * np.exp(gaps)
+
+    wick = bar_sigma * 0.5
+    high = np.maximum(open_, close) * np.exp(np.abs(rng.standard_normal(n_bars)) * wick)
+    low = np.minimum(open_, close) * np.exp(-np.abs(rng.standard_normal(n_bars)) * wick)
+
+    # Volume is lognormal around a base level and rises with the size of the move
+    move = np.abs(gaps + log_returns) / bar_sigma
+    volume = (
+        1e6 * np.exp(0.3 * rng.standard_normal(n_bars)) * (1 + 0.5 * move)
+    ).astype(np.int64)
+
+    df = pd.DataFrame(
+        {"Close": close, "High": high, "Low": low, "Open": open_, "Volume": volume},
+        index=index,
+    )
+    if multi_level_index:
+        df.columns = pd.MultiIndex.from_product(
+            [df.columns, [ticker]], names=["Price", "Ticker"]
+        )
+    return df
+
+
+def generate_universe(
+    n_tickers: int, seed: Optional[int] = None, **kwargs
+) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    Lazily generates `n_tickers` synthetic tickers named "SYN00000", "SYN00001", ...
+
+    Each ticker draws from its own child seed, so a ticker's bars depend only on
+    `seed` and its position, not on how many tickers are generated. Frames are
+    produced one at a time so universes far larger than memory can be streamed.
+    Keyword arguments are forwarded to `generate_ohlcv`.
+
+    Yields:
+        Tuple of (ticker, DataFrame).
+    """
+    width = max(5, len(str(n_tickers - 1)))
+    for i, child in enumerate(np.random.SeedSequence(seed).spawn(n_tickers)):
+        ticker = f"SYN{i:0{width}d}"
+        yield ticker, generate_ohlcv(
+            ticker, seed=np.random.default_rng(child).integers(2**63), **kwargs
+        )
+
+
+if __name__ == "__main__":
+    from fuzzy_allocator.trading_funcs import (
+        compute_bb_percentile,
+        compute_ema_trend,
+        compute_pmarp,
+    )
+
+    # Scale these up (e.g. 10_000 tickers x 1_000_000 bars) for full-size runs
+    n_tickers, n_bars = 20, 100_000
+    funcs = (compute_pmarp, compute_bb_percentile, compute_ema_trend)
+    timings = {func.__name__: 0.0 for func in funcs}
+    for ticker, df in generate_universe(
+        n_tickers,
+        seed=42,
+        n_bars=n_bars,
+        interval="1h",
+        regimes=DEFAULT_REGIMES,
+        regime_switch_prob=0.002,
+        gap_prob=0.3,
+    ):
+        for func in funcs:
+            start_time = time.perf_counter()
+            func(df)
+            timings[func.__name__] += time.perf_counter() - start_time
+
+    print(f"{n_tickers} tickers x {n_bars} bars")
+    for name, seconds in timings.items():
+        print(f"{name}: {seconds:.3f}s total, {seconds / n_tickers * 1e3:.2f}ms/ticker")
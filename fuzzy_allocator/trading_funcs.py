@@ -1,7 +1,44 @@
 from typing import Optional, Tuple
 
+import numpy as np
 import pandas as pd
-from scipy.stats import percentileofscore
+from numpy.lib.stride_tricks import sliding_window_view
+
+from fuzzy_allocator.kernels import (
+    bb_kernel,
+    close_array,
+    crossover_kernel,
+    ema_kernel,
+    ema_trend_kernel,
+    pmarp_kernel,
+)
+from fuzzy_allocator.utils.sorted_window import SortedWindow
+
+# Upper bound on window elements compared at once by `rolling_percentile_rank`
+_RANK_CHUNK_ELEMENTS = 1 << 22
+# From this window size on, the O(log w) sorted window beats O(w) vectorized scans
+_SORTED_WINDOW_MIN_LOOKBACK = 4096
+
+
+def _close_series(df: pd.DataFrame) -> pd.Series:
+    """
+    Returns the Close column as a Series.
+
+    Frames from `download_ticker_data` are already normalized to flat columns; raw
+    `yf.download` frames carry (Price, Ticker) columns, so "Close" selects a
+    single-column DataFrame that has to be squeezed.
+    """
+    close = df["Close"]
+    if isinstance(close, pd.DataFrame):
+        close = close.iloc[:, 0]
+    return close
+
+
+def pmarp_warmup(ma_period: int = 50, lookback: int = 100) -> int:
+    """
+    Returns the number of bars `compute_pmarp` needs to produce a result.
+    """
+    return ma_period + lookback - 1
 
 
 def compute_pmarp(
@@ -19,36 +56,78 @@ def compute_pmarp(
           - percentile rank (float)
         Returns None if there's insufficient data.
     """
-    # Work on a copy of the DataFrame
-    df = df.copy()
-
-    # Get the Close column; if it's a DataFrame, squeeze it to a Series.
-    close = df["Close"]
-    if isinstance(close, pd.DataFrame):
-        close = close.squeeze()  # Alternatively: close = close.iloc[:, 0]
+    # Runs on a view of the Close column; the frame is neither copied nor extended
+    return pmarp_kernel(close_array(df), ma_period, lookback)
 
-    # Calculate the moving average
-    ma = close.rolling(window=ma_period).mean()
-    df["MA"] = ma
 
-    # Calculate PMARP as the ratio of the close price to the moving average
-    df["PMARP"] = close / ma
+def rolling_percentile_rank(values: np.ndarray, lookback: int) -> np.ndarray:
+    """
+    Computes, for every point, the percentile rank of that point within the
+    trailing `lookback` values (itself included).
 
-    # Ensure we have enough data points
-    if df["PMARP"].dropna().shape[0] < lookback:
-        return None
+    Matches `percentileofscore(window, window[-1])` with the default "rank" kind,
+    evaluated for every window. Small windows compare all windows at once on
+    strided views, in chunks to keep temporary memory bounded (O(n * lookback)
+    vectorized work). Large windows slide a `SortedWindow` over the values instead,
+    which costs O(n log lookback).
 
-    historical_ratios = df["PMARP"].dropna().iloc[-lookback:]
-    current_ratio = historical_ratios.iloc[-1]
-    pmarp_percentile = percentileofscore(historical_ratios, current_ratio)
+    Returns:
+        np.ndarray: Percentile ranks (0-100); the first `lookback - 1` entries are NaN.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    ranks = np.full(values.shape[0], np.nan)
+    if values.shape[0] < lookback:
+        return ranks
+
+    if lookback >= _SORTED_WINDOW_MIN_LOOKBACK:
+        window = SortedWindow(lookback)
+        for i, value in enumerate(values.tolist()):
+            window.push(value)
+            if i >= lookback - 1:
+                ranks[i] = window.percentile_rank(value)
+        return ranks
+
+    windows = sliding_window_view(values, lookback)
+    current = values[lookback - 1 :]
+    chunk = max(1, _RANK_CHUNK_ELEMENTS // lookback)
+    for start in range(0, windows.shape[0], chunk):
+        block = windows[start : start + chunk]
+        score = current[start : start + chunk, None]
+        below = np.count_nonzero(block < score, axis=1)
+        at_or_below = np.count_nonzero(block <= score, axis=1)
+        # The score is always in its own window, so "rank" adds one for the tie
+        ranks[lookback - 1 + start : lookback - 1 + start + block.shape[0]] = (
+            below + at_or_below + 1
+        ) * (50.0 / lookback)
+    return ranks
+
+
+def compute_pmarp_series(
+    df: pd.DataFrame, ma_period: int = 50, lookback: int = 100
+) -> pd.Series:
+    """
+    Computes the PMARP percentile for every bar, for backtesting thresholds.
 
-    return current_ratio, pmarp_percentile
+    Each value is what `compute_pmarp` would return as its percentile if called on
+    the history up to and including that bar.
 
+    Returns:
+        pd.Series: PMARP percentile per bar, NaN until `lookback` PMARP values are
+        available.
+    """
+    close = _close_series(df)
+    ratio = (close / close.rolling(window=ma_period).mean()).dropna()
+    ranks = rolling_percentile_rank(ratio.to_numpy(), lookback)
+    return pd.Series(ranks, index=ratio.index, name="PMARP_Percentile").reindex(
+        close.index
+    )
 
-from typing import Optional, Tuple
 
-import pandas as pd
-from scipy.stats import percentileofscore
+def bb_warmup(ma_period: int = 20, lookback: int = 100) -> int:
+    """
+    Returns the number of bars `compute_bb_percentile` needs to produce a result.
+    """
+    return ma_period + lookback - 1
 
 
 def compute_bb_percentile(
@@ -66,30 +145,16 @@ def compute_bb_percentile(
         Tuple of the current Bollinger Bands position (0-1) and its percentile rank.
         Returns None if not enough data is available.
     """
-    df = df.copy()
-
-    # Ensure the 'Close' column is a Series
-    close = df["Close"]
-    if isinstance(close, pd.DataFrame):
-        close = close.squeeze()  # Alternatively: close = close.iloc[:, 0]
+    # Runs on a view of the Close column; the frame is neither copied nor extended
+    return bb_kernel(close_array(df), ma_period, lookback)
 
-    # Calculate the moving average and standard deviation for Bollinger Bands
-    df["MA_bb"] = close.rolling(window=ma_period).mean()
-    df["std_bb"] = close.rolling(window=ma_period).std()
-    df["UpperBand"] = df["MA_bb"] + 2 * df["std_bb"]
-    df["LowerBand"] = df["MA_bb"] - 2 * df["std_bb"]
 
-    # Calculate the position within the Bollinger Bands
-    df["BB_Pos"] = (close - df["LowerBand"]) / (df["UpperBand"] - df["LowerBand"])
-
-    if df["BB_Pos"].dropna().shape[0] < lookback:
-        return None
-
-    historical_pos = df["BB_Pos"].dropna().iloc[-lookback:]
-    current_pos = historical_pos.iloc[-1]
-    bb_percentile = percentileofscore(historical_pos, current_pos)
-
-    return current_pos, bb_percentile
+def ema_trend_warmup(short_period: int = 50, long_period: int = 200) -> int:
+    """
+    Returns the number of bars after which `compute_ema_trend` is considered
+    warmed up: one span of the slower EMA.
+    """
+    return max(short_period, long_period)
 
 
 def compute_ema_trend(
@@ -108,20 +173,44 @@ def compute_ema_trend(
              "Downtrend" if the short EMA is below the long EMA,
              "Sideways" otherwise.
     """
-    # Ensure we work with a Series for Close
-    close = df["Close"]
-    if isinstance(close, pd.DataFrame):
-        close = close.squeeze()
+    return ema_trend_kernel(close_array(df), short_period, long_period)
+
+
+def compute_ema_crossovers(
+    df: pd.DataFrame, short_period: int = 50, long_period: int = 200
+) -> Tuple[pd.DataFrame, Optional[int]]:
+    """
+    Finds every crossover of the short-term EMA over the long-term EMA in the whole
+    history in one vectorized pass.
 
-    short_ema = close.ewm(span=short_period, adjust=False).mean()
-    long_ema = close.ewm(span=long_period, adjust=False).mean()
+    A golden cross is the bar where `compute_ema_trend` would switch to "Uptrend",
+    a death cross the bar where it would switch to "Downtrend".
 
-    short_last = short_ema.iloc[-1]
-    long_last = long_ema.iloc[-1]
+    Args:
+        df (pd.DataFrame): Historical price data containing at least the 'Close' column.
+        short_period (int): The period for the short-term EMA.
+        long_period (int): The period for the long-term EMA.
 
-    if short_last > long_last:
-        return "Uptrend"
-    elif short_last < long_last:
-        return "Downtrend"
-    else:
-        return "Sideways"
+    Returns:
+        Tuple containing:
+          - a DataFrame indexed by the timestamp of each crossover, with the
+            "Crossover" ("Golden" or "Death") and the "Short_EMA" and "Long_EMA"
+            values on that bar
+          - the number of bars since the last crossover (0 if it happened on the
+            latest bar), or None if there has been none
+    """
+    close = close_array(df)
+    short_ema = ema_kernel(close, short_period)
+    long_ema = ema_kernel(close, long_period)
+    events = crossover_kernel(short_ema - long_ema)
+    at = np.flatnonzero(events)
+    crossovers = pd.DataFrame(
+        {
+            "Crossover": np.where(events[at] > 0, "Golden", "Death"),
+            "Short_EMA": short_ema[at],
+            "Long_EMA": long_ema[at],
+        },
+        index=df.index[at],
+    )
+    bars_since = int(close.shape[0] - 1 - at[-1]) if at.shape[0] else None
+    return crossovers, bars_since
@@ -0,0 +1,16 @@
+import os
+from pathlib import Path
+from typing import Optional
+
+# Environment variable naming the directory the script entry points persist bars
+# and indicator results under
+CACHE_DIR_ENV = "FUZZY_ALLOCATOR_CACHE"
+
+
+def cache_dir() -> Optional[Path]:
+    """
+    Returns the directory named by `FUZZY_ALLOCATOR_CACHE`, or None when it is
+    unset, in which case the script entry points keep nothing on disk.
+    """
+    root = os.environ.get(CACHE_DIR_ENV)
+    return Path(root).expanduser() if root else None
@@ -0,0 +1,74 @@
+import re
+from typing import Optional
+
+import pandas as pd
+
+_PERIOD_RE = re.compile(r"^(\d+)(d|wk|mo|y)$")
+_INTERVAL_RE = re.compile(r"^(\d+)(m|h|d|wk|mo)$")
+
+
+def period_to_offset(period: str) -> Optional[pd.DateOffset]:
+    """
+    Converts a yfinance period string (e.g. "5d", "6mo", "1y") to a DateOffset.
+
+    Returns:
+        The corresponding offset, or None for "max".
+    Raises:
+        ValueError: If the period string is not recognised.
+    """
+    if period == "max":
+        return None
+    match = _PERIOD_RE.match(period)
+    if not match:
+        raise ValueError(f"Unsupported period: {period!r}")
+    count, unit = int(match.group(1)), match.group(2)
+    if unit == "d":
+        return pd.DateOffset(days=count)
+    if unit == "wk":
+        return pd.DateOffset(weeks=count)
+    if unit == "mo":
+        return pd.DateOffset(months=count)
+    return pd.DateOffset(years=count)
+
+
+def period_start(period: str, now: pd.Timestamp) -> Optional[pd.Timestamp]:
+    """
+    Returns the first timestamp covered by `period` when measured back from `now`,
+    or None if the period is unbounded. "ytd" starts at January 1st of `now`'s year.
+    """
+    if period == "ytd":
+        return now.normalize().replace(month=1, day=1)
+    offset = period_to_offset(period)
+    if offset is None:
+        return None
+    return now - offset
+
+
+def interval_to_timedelta(interval: str) -> pd.Timedelta:
+    """
+    Converts a yfinance interval string (e.g. "1h", "4h", "1d", "1wk") to the
+    nominal length of one bar. Months are approximated as 30 days.
+
+    Raises:
+        ValueError: If the interval string is not recognised.
+    """
+    match = _INTERVAL_RE.match(interval)
+    if not match:
+        raise ValueError(f"Unsupported interval: {interval!r}")
+    count, unit = int(match.group(1)), match.group(2)
+    if unit == "m":
+        return pd.Timedelta(minutes=count)
+    if unit == "h":
+        return pd.Timedelta(hours=count)
+    if unit == "d":
+        return pd.Timedelta(days=count)
+    if unit == "wk":
+        return pd.Timedelta(weeks=count)
+    return pd.Timedelta(days=30 * count)
+
+
+def is_intraday(interval: str) -> bool:
+    """
+    Returns True if bars of `interval` are shorter than one trading day.
+    """
+    return interval_to_timedelta(interval) < pd.Timedelta(days=1)
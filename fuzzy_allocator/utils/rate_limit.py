@@ -0,0 +1,66 @@
+import threading
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `capacity`. Each call
+    to `acquire()` consumes one token, blocking until one is available.
+
+    Args:
+        rate (float): Tokens added per second.
+        capacity (float): Maximum number of tokens the bucket can hold (burst size).
+        clock (Callable[[], float]): Monotonic clock; injectable for tests.
+        sleep (Callable[[float], None]): Sleep function; injectable for tests.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def try_acquire(self) -> bool:
+        """
+        Consumes a token if one is available without blocking.
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self) -> None:
+        """
+        Blocks until a token is available, then consumes it.
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
@@ -0,0 +1,9 @@
+import pandas as pd
+
+# Regular US equity session, which is what yfinance's intraday bars cover
+# (exchange holidays are ignored)
+EXCHANGE_TZ = "America/New_York"
+SESSION_OPEN = pd.Timedelta(hours=9, minutes=30)
+SESSION_CLOSE = pd.Timedelta(hours=16)
+SESSION_LENGTH = SESSION_CLOSE - SESSION_OPEN
+TRADING_DAYS_PER_YEAR = 252
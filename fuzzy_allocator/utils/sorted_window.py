@@ -0,0 +1,135 @@
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from typing import List, Optional
+
+
+class SortedWindow:
+    """
+    Fixed-capacity sliding window that keeps its values sorted for rank queries.
+
+    Values are held twice: in arrival order in an array-backed ring buffer, so the
+    oldest value can be evicted, and in a blocked sorted list (sorted blocks of at
+    most `2 * load` values, indexed by their maxima). Locating a value is a binary
+    search over the block maxima followed by one within a block, so inserts,
+    evictions and rank queries cost O(log w) comparisons plus a short in-block
+    shift; counting the values in earlier blocks adds O(w / load).
+
+    NaN values have no rank and must be filtered out before pushing.
+
+    Args:
+        capacity (int): Number of most recent values kept in the window.
+        load (Optional[int]): Target block size. Defaults to `capacity // 16` (at
+            least 64), which keeps the number of blocks small for large windows.
+    """
+
+    __slots__ = ("capacity", "_load", "_ring", "_head", "_size", "_blocks", "_maxes")
+
+    def __init__(self, capacity: int, load: Optional[int] = None) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._load = load or max(64, capacity // 16)
+        self._ring = array("d", bytes(8 * capacity))
+        self._head = 0
+        self._size = 0
+        self._blocks: List[List[float]] = []
+        self._maxes: List[float] = []
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def full(self) -> bool:
+        """
+        True once the window holds `capacity` values.
+        """
+        return self._size == self.capacity
+
+    def oldest(self) -> float:
+        """
+        Returns the value that the next push would evict from a full window.
+        """
+        if not self._size:
+            raise IndexError("window is empty")
+        return self._ring[(self._head - self._size) % self.capacity]
+
+    def push(self, value: float) -> Optional[float]:
+        """
+        Adds `value`, evicting and returning the oldest value if the window is full.
+        """
+        evicted = None
+        if self._size == self.capacity:
+            evicted = self._ring[self._head]
+            self._remove(evicted)
+            self._size -= 1
+        self._ring[self._head] = value
+        self._head = (self._head + 1) % self.capacity
+        self._size += 1
+        self._insert(value)
+        return evicted
+
+    def clear(self) -> None:
+        """
+        Empties the window.
+        """
+        self._head = 0
+        self._size = 0
+        self._blocks = []
+        self._maxes = []
+
+    def _insert(self, value: float) -> None:
+        if not self._blocks:
+            self._blocks.append([value])
+            self._maxes.append(value)
+            return
+        i = bisect_left(self._maxes, value)
+        if i == len(self._maxes):
+            i -= 1
+        block = self._blocks[i]
+        insort(block, value)
+        self._maxes[i] = block[-1]
+        if len(block) > 2 * self._load:
+            # Split oversized blocks so in-block shifts stay short
+            self._blocks[i : i + 1] = [block[: self._load], block[self._load :]]
+            self._maxes[i : i + 1] = [block[self._load - 1], block[-1]]
+
+    def _remove(self, value: float) -> None:
+        i = bisect_left(self._maxes, value)
+        block = self._blocks[i]
+        del block[bisect_left(block, value)]
+        if block:
+            self._maxes[i] = block[-1]
+        else:
+            del self._blocks[i]
+            del self._maxes[i]
+
+    def count_less(self, value: float) -> int:
+        """
+        Returns how many values in the window are strictly less than `value`.
+        """
+        i = bisect_left(self._maxes, value)
+        count = sum(len(block) for block in self._blocks[:i])
+        if i < len(self._blocks):
+            count += bisect_left(self._blocks[i], value)
+        return count
+
+    def count_less_equal(self, value: float) -> int:
+        """
+        Returns how many values in the window are less than or equal to `value`.
+        """
+        i = bisect_right(self._maxes, value)
+        count = sum(len(block) for block in self._blocks[:i])
+        if i < len(self._blocks):
+            count += bisect_right(self._blocks[i], value)
+        return count
+
+    def percentile_rank(self, value: float) -> float:
+        """
+        Returns the percentile rank of `value` within the window, matching
+        `scipy.stats.percentileofscore(window, value)` with the default "rank" kind.
+        """
+        if not self._size:
+            raise IndexError("window is empty")
+        below = self.count_less(value)
+        at_or_below = self.count_less_equal(value)
+        return (below + at_or_below + (at_or_below > below)) * (50.0 / self._size)
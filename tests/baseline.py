@@ -0,0 +1,108 @@
+"""
+The original pandas implementations of the indicators, kept as the reference the
+optimized kernels, pipeline, panel, sweeps and states are checked against.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.stats import percentileofscore
+
+from fuzzy_allocator.synthetic import generate_ohlcv
+
+
+def _close(df: pd.DataFrame) -> pd.Series:
+    close = df["Close"]
+    if isinstance(close, pd.DataFrame):
+        close = close.squeeze()
+    return close
+
+
+def compute_pmarp(
+    df: pd.DataFrame, ma_period: int = 50, lookback: int = 100
+) -> Optional[Tuple[float, float]]:
+    close = _close(df)
+    ratios = (close / close.rolling(window=ma_period).mean()).dropna()
+    if ratios.shape[0] < lookback:
+        return None
+    historical = ratios.iloc[-lookback:]
+    return historical.iloc[-1], percentileofscore(historical, historical.iloc[-1])
+
+
+def compute_bb_percentile(
+    df: pd.DataFrame, ma_period: int = 20, lookback: int = 100
+) -> Optional[Tuple[float, float]]:
+    close = _close(df)
+    ma = close.rolling(window=ma_period).mean()
+    std = close.rolling(window=ma_period).std()
+    upper = ma + 2 * std
+    lower = ma - 2 * std
+    positions = ((close - lower) / (upper - lower)).dropna()
+    if positions.shape[0] < lookback:
+        return None
+    historical = positions.iloc[-lookback:]
+    return historical.iloc[-1], percentileofscore(historical, historical.iloc[-1])
+
+
+def compute_ema_trend(
+    df: pd.DataFrame, short_period: int = 50, long_period: int = 200
+) -> str:
+    close = _close(df)
+    short_last = close.ewm(span=short_period, adjust=False).mean().iloc[-1]
+    long_last = close.ewm(span=long_period, adjust=False).mean().iloc[-1]
+    if short_last > long_last:
+        return "Uptrend"
+    elif short_last < long_last:
+        return "Downtrend"
+    else:
+        return "Sideways"
+
+
+def close_frame(close: np.ndarray) -> pd.DataFrame:
+    """
+    Wraps closes in a frame with a daily index.
+    """
+    index = pd.date_range("2020-01-01", periods=len(close), freq="D")
+    return pd.DataFrame({"Close": np.asarray(close, dtype=np.float64)}, index=index)
+
+
+def random_closes(seed: int, n_bars: int = 400) -> np.ndarray:
+    """
+    Unrounded synthetic closes, free of the ties tick rounding produces.
+    """
+    df = generate_ohlcv("SYN", n_bars, "1d", seed=seed, multi_level_index=False)
+    jitter = 1e-7 * np.random.default_rng(seed).random(n_bars)
+    return df["Close"].to_numpy() * (1 + jitter)
+
+
+def flat_run_closes(
+    seed: int,
+    level: float,
+    n_bars: int = 300,
+    run: int = 60,
+    after: Optional[int] = None,
+) -> np.ndarray:
+    """
+    A random walk around `level` with a flat run of `run` bars followed by `after`
+    more bars; by default the run ends shortly before the last bar.
+    """
+    rng = np.random.default_rng(seed)
+    close = level * np.exp(np.cumsum(rng.normal(0, 0.01, n_bars)))
+    if after is None:
+        after = int(rng.integers(1, 15))
+    end = n_bars - after
+    close[end - run : end] = level
+    return close
+
+
+def assert_same_result(actual, expected, rtol=1e-9):
+    """
+    Compares two (value, percentile) results, either of which may be None.
+    """
+    if expected is None:
+        assert actual is None
+        return
+    assert actual is not None
+    np.testing.assert_allclose(actual[0], expected[0], rtol=rtol)
+    np.testing.assert_allclose(actual[1], expected[1], rtol=rtol)
@@ -0,0 +1,46 @@
+import pandas as pd
+
+from fuzzy_allocator.bar_store import BarStore
+from fuzzy_allocator.data_sources import InMemorySource
+from fuzzy_allocator.fetch_historical_data import fetch_bars
+from fuzzy_allocator.synthetic import generate_ohlcv
+
+
+class CountingStore(BarStore):
+    """
+    Bar store that counts how often the Parquet file is read.
+    """
+
+    def __init__(self, root):
+        super().__init__(root)
+        self.loads = 0
+
+    def load(self, ticker, interval):
+        self.loads += 1
+        return super().load(ticker, interval)
+
+
+def test_top_up_reads_the_store_once(tmp_path):
+    full = generate_ohlcv("SYN", 120, "1d", seed=4, multi_level_index=False)
+    store = CountingStore(tmp_path)
+
+    seeded = fetch_bars("SYN", "max", "1d", InMemorySource({"SYN": full[:100]}), store)
+    assert store.loads == 1
+    pd.testing.assert_frame_equal(seeded, full[:100], check_freq=False)
+
+    store.loads = 0
+    topped_up = fetch_bars("SYN", "max", "1d", InMemorySource({"SYN": full}), store)
+    assert store.loads == 1
+    pd.testing.assert_frame_equal(topped_up, full, check_freq=False)
+    pd.testing.assert_frame_equal(store.load("SYN", "1d"), full, check_freq=False)
+
+
+def test_newest_stored_bar_is_replaced(tmp_path):
+    full = generate_ohlcv("SYN", 50, "1d", seed=5, multi_level_index=False)
+    partial = full[:30].copy()
+    partial.iloc[-1, partial.columns.get_loc("Close")] += 1.0
+    store = BarStore(tmp_path)
+    store.append("SYN", "1d", partial)
+
+    merged = store.append("SYN", "1d", full[29:])
+    pd.testing.assert_frame_equal(merged, full, check_freq=False)
@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fuzzy_allocator import data_sources
+from fuzzy_allocator.data_sources import LocalDirectorySource, YFinanceSource
+from fuzzy_allocator.fetch_historical_data import download_ticker_data
+from fuzzy_allocator.frame_cache import FrameCache
+from fuzzy_allocator.normalize import normalize_frame
+from fuzzy_allocator.synthetic import generate_ohlcv
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def _grouped_by_ticker(frames):
+    """
+    Builds a frame shaped like `yf.download(..., group_by="ticker")`: (Ticker,
+    Price) columns over the union of the tickers' timestamps.
+    """
+    raw = pd.concat(frames, axis=1)
+    return raw.rename_axis(columns=["Ticker", "Price"])
+
+
+def _flat(ticker, seed, n_bars=30):
+    return generate_ohlcv(ticker, n_bars, "1d", seed=seed, multi_level_index=False)
+
+
+def test_fetch_many_splits_batches_into_flat_frames(monkeypatch):
+    good = _flat("AAA", 0)
+    failed = pd.DataFrame(np.nan, index=good.index, columns=PRICE_COLUMNS)
+    single = _flat("DDD", 1)
+    responses = {
+        ("AAA", "BBB", "CCC"): _grouped_by_ticker({"AAA": good, "BBB": failed}),
+        # A one-ticker batch may come back with flat columns
+        ("DDD",): single,
+    }
+    calls = []
+
+    def download(batch, **kwargs):
+        calls.append(kwargs)
+        return responses[tuple(batch)]
+
+    monkeypatch.setattr(data_sources.yf, "download", download)
+    data = YFinanceSource().fetch_many(
+        ["AAA", "BBB", "CCC", "DDD"], "1y", "1d", batch_size=3
+    )
+    # BBB downloaded only NaN rows and CCC is absent: both are skipped
+    assert list(data) == ["AAA", "DDD"]
+    assert all(call["group_by"] == "ticker" for call in calls)
+    for ticker, expected in (("AAA", good), ("DDD", single)):
+        frame = data[ticker]
+        assert not isinstance(frame.columns, pd.MultiIndex)
+        assert frame.columns.name is None
+        pd.testing.assert_frame_equal(frame, expected, check_names=False)
+
+
+def test_fetch_many_without_rows(monkeypatch):
+    monkeypatch.setattr(data_sources.yf, "download", lambda *a, **k: pd.DataFrame())
+    assert YFinanceSource().fetch_many(["AAA"], "1y", "1d", batch_size=5) == {}
+
+
+def test_batched_download_keeps_caller_order_through_the_cache(monkeypatch):
+    frames = {"AAA": _flat("AAA", 2), "CCC": _flat("CCC", 3)}
+    requested = []
+
+    def download(batch, **kwargs):
+        requested.append(list(batch))
+        return _grouped_by_ticker({t: frames[t] for t in batch if t in frames})
+
+    monkeypatch.setattr(data_sources.yf, "download", download)
+    cache = FrameCache()
+    cached = normalize_frame(_flat("BBB", 4))
+    cache.put("BBB", "1y", "1d", cached)
+    data = download_ticker_data(
+        ["CCC", "BBB", "MISSING", "AAA"],
+        "1y",
+        "1d",
+        batch_size=2,
+        source=YFinanceSource(),
+        cache=cache,
+    )
+    # Only the misses are requested; the failed ticker is left out
+    assert requested == [["CCC", "MISSING"], ["AAA"]]
+    assert list(data) == ["CCC", "BBB", "AAA"]
+    assert data["BBB"] is cached
+    assert cache.get("AAA", "1y", "1d") is data["AAA"]
+    for ticker in ("AAA", "CCC"):
+        pd.testing.assert_frame_equal(
+            data[ticker], normalize_frame(frames[ticker]), check_names=False
+        )
+
+
+def test_local_directory_csv_across_a_dst_change(tmp_path):
+    # One week of hourly bars around the November DST change: -04:00 and -05:00
+    df = generate_ohlcv(
+        "AAA", 35, "1h", seed=5, multi_level_index=False, start="2024-10-31"
+    )
+    assert len({ts.utcoffset() for ts in df.index}) == 2
+    source = LocalDirectorySource(tmp_path, file_format="csv")
+    path = source.path("AAA", "1h")
+    path.parent.mkdir(parents=True)
+    df.to_csv(path)
+
+    loaded = source.fetch("AAA", "max", "1h")
+    assert str(loaded.index.tz) == "UTC"
+    pd.testing.assert_frame_equal(
+        loaded, df.tz_convert("UTC"), check_names=False, check_freq=False
+    )
+    start = df.index[20]
+    window = source.fetch("AAA", "1y", "1h", start=start)
+    assert window.index[0] == start and len(window) == 15
+
+
+def test_local_directory_parquet_period_window(tmp_path):
+    df = _flat("AAA", 6, n_bars=300)
+    source = LocalDirectorySource(tmp_path)
+    path = source.path("AAA", "1d")
+    path.parent.mkdir(parents=True)
+    df.to_parquet(path)
+
+    pd.testing.assert_frame_equal(
+        source.fetch("AAA", "max", "1d"), df, check_freq=False
+    )
+    # The period is measured back from the newest bar, not from today
+    recent = source.fetch("AAA", "1mo", "1d")
+    assert recent.index[-1] == df.index[-1]
+    assert recent.index[0] >= df.index[-1] - pd.DateOffset(months=1)
+    assert 15 < len(recent) < 25
+    with pytest.raises(FileNotFoundError):
+        source.fetch("BBB", "1y", "1d")
@@ -0,0 +1,17 @@
+import asyncio
+
+from fuzzy_allocator.data_sources import InMemorySource
+from fuzzy_allocator.fetch import main_async
+from fuzzy_allocator.synthetic import generate_universe
+
+
+def test_main_async_analyzes_every_downloaded_ticker(capsys):
+    frames = dict(generate_universe(3, seed=2, n_bars=400, interval="1d"))
+    source = InMemorySource(frames, latency=0.01)
+    asyncio.run(main_async(list(frames) + ["MISSING"], "2y", "1d", source=source))
+    out = capsys.readouterr().out
+    for ticker in frames:
+        assert f"=== {ticker} Analysis ===" in out
+    assert "=== MISSING Analysis ===" not in out
+    assert "[ERROR] Failed to download MISSING" in out
+    assert out.count("PMARP:") == len(frames)
@@ -0,0 +1,201 @@
+import asyncio
+import threading
+import time
+
+from fuzzy_allocator.data_sources import InMemorySource
+from fuzzy_allocator.fetch_historical_data import (
+    download_ticker_data_async,
+    download_ticker_data_concurrent,
+    iter_ticker_data,
+)
+from fuzzy_allocator.frame_cache import FrameCache
+from fuzzy_allocator.synthetic import generate_universe
+from fuzzy_allocator.utils.rate_limit import TokenBucket
+
+
+class CountingSource(InMemorySource):
+    """
+    In-memory source with latency that records the peak number of concurrent
+    fetches and the time each fetch started.
+    """
+
+    def __init__(self, frames, latency=0.0):
+        super().__init__(frames, latency)
+        self._lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.started = []
+
+    def fetch(self, ticker, period, interval, start=None):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.started.append(time.monotonic())
+        try:
+            return super().fetch(ticker, period, interval, start)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class StaggeredSource(CountingSource):
+    """
+    Counting source whose fetches take a different time per ticker.
+    """
+
+    def __init__(self, frames, latencies):
+        super().__init__(frames)
+        self.latencies = latencies
+
+    def fetch(self, ticker, period, interval, start=None):
+        time.sleep(self.latencies.get(ticker, 0.0))
+        return super().fetch(ticker, period, interval, start)
+
+
+def _frames(n):
+    return dict(generate_universe(n, seed=1, n_bars=50, interval="1d"))
+
+
+def test_in_flight_requests_are_bounded():
+    frames = _frames(12)
+    source = CountingSource(frames, latency=0.02)
+    data, errors = download_ticker_data_concurrent(
+        list(frames), "1y", "1d", max_workers=8, max_in_flight=3, source=source
+    )
+    assert sorted(data) == sorted(frames)
+    assert not errors
+    assert 1 < source.peak <= 3
+
+
+def test_rate_limiter_paces_requests():
+    frames = _frames(6)
+    source = CountingSource(frames)
+    limiter = TokenBucket(rate=50.0, capacity=1)
+    download_ticker_data_concurrent(
+        list(frames), "1y", "1d", max_workers=6, rate_limiter=limiter, source=source
+    )
+    # One token up front, then one every 1/50 s
+    assert source.started[-1] - source.started[0] >= 5 / 50 * 0.9
+
+
+def test_token_bucket_with_fake_clock():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = TokenBucket(rate=2.0, capacity=2, clock=lambda: now[0], sleep=sleep)
+    for _ in range(4):
+        limiter.acquire()
+    # The burst of two is free, the next two wait half a second each
+    assert now[0] == 1.0
+    assert not limiter.try_acquire()
+
+
+def test_failed_ticker_does_not_affect_the_others():
+    frames = _frames(5)
+    source = CountingSource(frames, latency=0.01)
+    tickers = list(frames) + ["MISSING"]
+    data, errors = download_ticker_data_concurrent(
+        tickers, "1y", "1d", max_workers=3, source=source
+    )
+    assert sorted(data) == sorted(frames)
+    assert list(errors) == ["MISSING"]
+    assert isinstance(errors["MISSING"], KeyError)
+
+
+def test_timeout_reports_stragglers():
+    frames = _frames(4)
+    source = CountingSource(frames, latency=0.5)
+    data, errors = download_ticker_data_concurrent(
+        list(frames), "1y", "1d", max_workers=2, timeout=0.1, source=source
+    )
+    assert not data
+    assert all(isinstance(exc, TimeoutError) for exc in errors.values())
+    assert sorted(errors) == sorted(frames)
+
+
+def test_iter_skips_failures_and_fills_the_cache(capsys):
+    frames = _frames(3)
+    tickers = list(frames)
+    source = CountingSource(frames)
+    cache = FrameCache()
+    stream = iter_ticker_data(
+        [tickers[0], "MISSING", *tickers[1:]], "1y", "1d", source=source, cache=cache
+    )
+    assert [ticker for ticker, _ in stream] == tickers
+    assert "[ERROR] Failed to download MISSING" in capsys.readouterr().out
+    assert len(source.started) == 4
+    assert len(cache) == 3
+
+    # A second pass is served from the cache, float32 frames are fetched again
+    again = dict(iter_ticker_data(tickers, "1y", "1d", source=source, cache=cache))
+    assert all(again[t] is cache.get(t, "1y", "1d") for t in tickers)
+    assert len(source.started) == 4
+    first = next(
+        iter_ticker_data(tickers, "1y", "1d", source=source, cache=cache, float32=True)
+    )
+    assert first[1]["Close"].dtype == "float32"
+    assert len(source.started) == 5
+
+
+def test_iter_is_lazy():
+    frames = _frames(3)
+    source = CountingSource(frames)
+    stream = iter_ticker_data(list(frames), "1y", "1d", source=source)
+    next(stream)
+    assert len(source.started) == 1
+
+
+async def _collect(stream, limit=None):
+    collected = []
+    async for ticker, _ in stream:
+        collected.append(ticker)
+        if len(collected) == limit:
+            break
+    await stream.aclose()
+    return collected
+
+
+def test_async_yields_in_completion_order():
+    frames = _frames(4)
+    tickers = list(frames)
+    latencies = dict(zip(tickers, [0.3, 0.1, 0.2, 0.0]))
+    source = StaggeredSource(frames, latencies)
+    start = time.monotonic()
+    stream = download_ticker_data_async(tickers, "1y", "1d", source=source)
+    collected = asyncio.run(_collect(stream))
+    elapsed = time.monotonic() - start
+    assert collected == sorted(tickers, key=latencies.get)
+    # All downloads overlap, so the wall time is about that of the slowest one
+    assert elapsed < 0.3 + 0.15
+
+
+def test_async_skips_failed_tickers(capsys):
+    frames = _frames(3)
+    source = CountingSource(frames, latency=0.01)
+    stream = download_ticker_data_async(
+        list(frames) + ["MISSING"], "1y", "1d", source=source
+    )
+    assert sorted(asyncio.run(_collect(stream))) == sorted(frames)
+    assert "[ERROR] Failed to download MISSING" in capsys.readouterr().out
+
+
+def test_async_cancels_pending_downloads_when_the_consumer_stops():
+    frames = _frames(6)
+    source = CountingSource(frames, latency=0.05)
+    stream = download_ticker_data_async(
+        list(frames), "1y", "1d", max_concurrency=1, source=source
+    )
+
+    async def consume_one():
+        collected = await _collect(stream, limit=1)
+        # Give cancelled downloads the chance to start if they were not cancelled
+        await asyncio.sleep(0.2)
+        return collected
+
+    assert len(asyncio.run(consume_one())) == 1
+    # The first download and at most the one that took its slot
+    assert len(source.started) <= 2
@@ -0,0 +1,26 @@
+from fuzzy_allocator.fetch_planner import expected_bars, max_period, plan_period
+from fuzzy_allocator.synthetic import bars_per_year
+
+
+def test_max_period_stays_within_yfinance_limits():
+    assert max_period("1d") is None
+    assert max_period("1m") == "5d"
+    assert max_period("15m") == "1mo"
+    # Hourly bars go back 730 days, which "2y" overshoots
+    assert max_period("1h") == "1y"
+
+
+def test_planner_and_generator_share_the_session_calendar():
+    for interval in ["15m", "1h", "4h", "1d"]:
+        assert expected_bars("1y", interval) == bars_per_year(interval)
+
+
+def test_plan_period_covers_the_requested_bars():
+    assert plan_period(200, "1d") == "1y"
+    assert plan_period(300, "1d") == "2y"
+    assert expected_bars(plan_period(500, "1h"), "1h") >= 550
+
+
+def test_plan_period_caps_at_the_longest_period(capsys):
+    assert plan_period(100_000, "1h") == "1y"
+    assert "[ERROR]" in capsys.readouterr().out
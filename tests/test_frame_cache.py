@@ -0,0 +1,105 @@
+import pandas as pd
+import pytest
+from baseline import close_frame, random_closes
+
+from fuzzy_allocator.frame_cache import FrameCache, next_bar_close
+
+
+def _et(stamp):
+    return pd.Timestamp(stamp, tz="America/New_York")
+
+
+@pytest.mark.parametrize(
+    "interval, now, expected",
+    [
+        # Weekend ending DST: Friday after the close to Monday's first bars
+        ("1h", "2024-11-01 17:00", "2024-11-04 10:30"),
+        ("1d", "2024-11-01 17:00", "2024-11-04 16:00"),
+        # Weekend starting DST
+        ("1h", "2024-03-08 17:00", "2024-03-11 10:30"),
+        ("1d", "2024-03-08 17:00", "2024-03-11 16:00"),
+        ("15m", "2024-03-09 12:00", "2024-03-11 09:45"),
+        # Within a session and before the open
+        ("1h", "2024-03-11 11:10", "2024-03-11 11:30"),
+        ("4h", "2024-03-11 14:00", "2024-03-11 16:00"),
+        ("1h", "2024-03-11 07:00", "2024-03-11 10:30"),
+        # Weekly bars close on Friday
+        ("1wk", "2024-11-04 12:00", "2024-11-08 16:00"),
+        ("1wk", "2024-11-01 17:00", "2024-11-08 16:00"),
+    ],
+)
+def test_next_bar_close_on_wall_clock_time(interval, now, expected):
+    assert next_bar_close(interval, _et(now).tz_convert("UTC")) == _et(expected)
+
+
+class FakeClock:
+    def __init__(self, start):
+        self.now = _et(start).timestamp()
+
+    def __call__(self):
+        return self.now
+
+    def set(self, stamp):
+        self.now = _et(stamp).timestamp()
+
+
+def _frame(seed=0, n_bars=100):
+    return close_frame(random_closes(seed, n_bars))
+
+
+def test_entries_expire_when_the_bar_closes_across_dst():
+    clock = FakeClock("2024-11-01 17:00")
+    cache = FrameCache(clock=clock)
+    df = _frame()
+    cache.put("AAA", "1mo", "1h", df)
+    clock.set("2024-11-04 10:29")
+    assert cache.get("AAA", "1mo", "1h") is df
+    clock.set("2024-11-04 10:30")
+    assert cache.get("AAA", "1mo", "1h") is None
+    assert cache.stats()["expirations"] == 1
+    assert len(cache) == 0
+
+
+def test_fixed_ttls_override_the_calendar():
+    clock = FakeClock("2024-03-11 11:00")
+    cache = FrameCache(ttls={"1d": 60.0}, clock=clock)
+    cache.put("AAA", "1y", "1d", _frame())
+    clock.now += 59
+    assert cache.get("AAA", "1y", "1d") is not None
+    clock.now += 1
+    assert cache.get("AAA", "1y", "1d") is None
+
+
+def test_least_recently_used_frames_are_evicted_by_bytes():
+    frames = {ticker: _frame(seed) for seed, ticker in enumerate("ABCD")}
+    size = int(frames["A"].memory_usage(deep=True, index=True).sum())
+    cache = FrameCache(max_bytes=3 * size)
+    for ticker in "ABC":
+        cache.put(ticker, "1y", "1d", frames[ticker])
+    assert cache.nbytes == 3 * size
+    cache.get("A", "1y", "1d")
+    cache.put("D", "1y", "1d", frames["D"])
+    # B was the least recently used entry
+    assert cache.get("B", "1y", "1d") is None
+    assert all(cache.get(t, "1y", "1d") is frames[t] for t in "ACD")
+    assert cache.stats()["evictions"] == 1
+    assert cache.nbytes == 3 * size
+
+    cache.put("BIG", "1y", "1d", _frame(n_bars=1_000))
+    assert cache.get("BIG", "1y", "1d") is None
+    assert len(cache) == 3
+
+
+def test_counters_and_keys():
+    cache = FrameCache()
+    df, df32 = _frame(), _frame().astype("float32")
+    cache.put("AAA", "1y", "1d", df)
+    cache.put("AAA", "1y", "1d", df32, float32=True)
+    assert cache.get("AAA", "1y", "1d") is df
+    assert cache.get("AAA", "1y", "1d", float32=True) is df32
+    assert cache.get("AAA", "6mo", "1d") is None
+    assert cache.get("AAA", "1y", "1h") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 2, 2)
+    cache.clear()
+    assert len(cache) == 0 and cache.nbytes == 0
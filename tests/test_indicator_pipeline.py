@@ -0,0 +1,64 @@
+import baseline
+import numpy as np
+import pytest
+from baseline import assert_same_result, close_frame, flat_run_closes, random_closes
+
+from fuzzy_allocator.indicator_pipeline import IndicatorPipeline
+
+CASES = (
+    [random_closes(seed, 500) for seed in range(4)]
+    + [flat_run_closes(seed, level) for seed in range(6) for level in (0.1, 0.3, 7.77)]
+    # Flat runs up to the last bar leave a few flat PMARP windows in the lookback
+    + [
+        flat_run_closes(seed, level, run=55, after=0)
+        for seed in (1, 4, 7)
+        for level in (0.1, 3.3, 7.77)
+    ]
+    + [np.full(300, 0.1), random_closes(9, 120)]
+)
+
+
+def _expected(df, pipeline):
+    return (
+        baseline.compute_pmarp(df, pipeline.pmarp_period, pipeline.pmarp_lookback),
+        baseline.compute_bb_percentile(df, pipeline.bb_period, pipeline.bb_lookback),
+        baseline.compute_ema_trend(df, pipeline.short_period, pipeline.long_period),
+    )
+
+
+@pytest.mark.parametrize("close", CASES)
+@pytest.mark.parametrize(
+    "pipeline", [IndicatorPipeline(), IndicatorPipeline(10, 40, 5, 60, 8, 21)]
+)
+def test_pipeline_matches_pandas(close, pipeline):
+    df = close_frame(close)
+    pmarp, bb, trend = pipeline.run(df)
+    expected_pmarp, expected_bb, expected_trend = _expected(df, pipeline)
+    assert_same_result(pmarp, expected_pmarp)
+    assert_same_result(bb, expected_bb, rtol=1e-6)
+    assert trend == expected_trend
+
+
+def test_pipeline_with_gaps():
+    close = random_closes(5, 500)
+    close[[10, 200, 480]] = np.nan
+    df = close_frame(close)
+    pipeline = IndicatorPipeline()
+    pmarp, bb, trend = pipeline.run(df)
+    expected_pmarp, expected_bb, expected_trend = _expected(df, pipeline)
+    assert_same_result(pmarp, expected_pmarp)
+    assert_same_result(bb, expected_bb, rtol=1e-6)
+    assert trend == expected_trend
+
+
+def test_ema_spread_on_a_panel():
+    pipeline = IndicatorPipeline(short_period=8, long_period=21)
+    panel = np.column_stack([random_closes(seed, 200) for seed in range(3)])
+    spread = pipeline.ema_spread(panel)
+    for j in range(panel.shape[1]):
+        close = close_frame(panel[:, j])["Close"]
+        expected = (
+            close.ewm(span=8, adjust=False).mean()
+            - close.ewm(span=21, adjust=False).mean()
+        )
+        np.testing.assert_allclose(spread[:, j], expected, atol=1e-9)
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+from baseline import (
+    assert_same_result,
+    close_frame,
+    compute_bb_percentile,
+    compute_ema_trend,
+    compute_pmarp,
+    flat_run_closes,
+    random_closes,
+)
+
+from fuzzy_allocator.indicator_state import BollingerState, EMATrendState, PMARPState
+
+
+def _with_gaps(close, seed):
+    close = close.copy()
+    rng = np.random.default_rng(seed)
+    close[rng.choice(np.arange(30, len(close)), 12, replace=False)] = np.nan
+    return close
+
+
+def _check_every_prefix(state, reference, close, **params):
+    df = close_frame(close)
+    for end in range(1, len(close) + 1):
+        result = state.update(close[end - 1])
+        if end % 7 and end != len(close):
+            continue
+        assert_same_result(result, reference(df.iloc[:end], **params))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_pmarp_state(seed):
+    close = random_closes(seed, 250)
+    params = dict(ma_period=20, lookback=60)
+    _check_every_prefix(PMARPState(**params), compute_pmarp, close, **params)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_bollinger_state(seed):
+    close = random_closes(seed, 250)
+    params = dict(ma_period=20, lookback=60)
+    _check_every_prefix(
+        BollingerState(**params), compute_bb_percentile, close, **params
+    )
+
+
+@pytest.mark.parametrize("level", [0.1, 0.3, 7.77, 1234.5])
+def test_bollinger_state_skips_flat_windows(level):
+    close = flat_run_closes(3, level, n_bars=260, run=60)
+    params = dict(ma_period=20, lookback=60)
+    _check_every_prefix(
+        BollingerState(**params), compute_bb_percentile, close, **params
+    )
+
+
+@pytest.mark.parametrize("seed", [4, 7])
+@pytest.mark.parametrize("level", [0.1, 3.3, 7.77, 1234.5])
+@pytest.mark.parametrize("ma_period,lookback", [(20, 60), (50, 100)])
+def test_pmarp_state_on_a_flat_run_to_the_last_bar(seed, level, ma_period, lookback):
+    # A run only a few bars longer than the MA period leaves a handful of flat
+    # windows in the lookback, so their ratios tie with each other
+    close = flat_run_closes(seed, level, n_bars=300, run=ma_period + 5, after=0)
+    params = dict(ma_period=ma_period, lookback=lookback)
+    _check_every_prefix(PMARPState(**params), compute_pmarp, close, **params)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_states_with_gaps(seed):
+    close = _with_gaps(random_closes(seed, 250), seed)
+    params = dict(ma_period=20, lookback=60)
+    _check_every_prefix(PMARPState(**params), compute_pmarp, close, **params)
+    _check_every_prefix(
+        BollingerState(**params), compute_bb_percentile, close, **params
+    )
+
+
+@pytest.mark.parametrize("gaps", [False, True])
+def test_ema_trend_state_follows_pandas(gaps):
+    close = random_closes(4, 400)
+    if gaps:
+        close = _with_gaps(close, 4)
+        close[:3] = np.nan
+    state = EMATrendState(10, 30)
+    short = pd.Series(close).ewm(span=10, adjust=False).mean().to_numpy()
+    long = pd.Series(close).ewm(span=30, adjust=False).mean().to_numpy()
+    df = close_frame(close)
+    for i, value in enumerate(close):
+        trend = state.update(value)
+        if np.isnan(short[i]):
+            assert np.isnan(state.short_ema)
+            continue
+        assert state.short_ema == pytest.approx(short[i], rel=1e-12)
+        assert state.long_ema == pytest.approx(long[i], rel=1e-12)
+        assert trend == compute_ema_trend(df.iloc[: i + 1], 10, 30)
+
+
+def test_ema_trend_state_on_a_flat_history():
+    assert EMATrendState(5, 20).extend([0.1] * 50) == "Sideways"
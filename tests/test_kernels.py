@@ -0,0 +1,79 @@
+import baseline
+import numpy as np
+import pytest
+from baseline import assert_same_result, close_frame, flat_run_closes, random_closes
+from scipy.stats import percentileofscore
+
+from fuzzy_allocator.kernels import (
+    bb_kernel,
+    ema_kernel,
+    ema_trend_kernel,
+    percentile_of_last,
+    pmarp_kernel,
+)
+from fuzzy_allocator.trading_funcs import (
+    compute_bb_percentile,
+    compute_ema_trend,
+    compute_pmarp,
+)
+
+
+def _near_flat(seed, level):
+    close = flat_run_closes(seed, level)
+    # One tick of movement inside the flat run
+    close[-30] += 0.01
+    return close
+
+
+CASES = (
+    [random_closes(seed) for seed in range(4)]
+    + [flat_run_closes(seed, level) for seed in range(6) for level in (0.1, 0.3, 7.77)]
+    + [_near_flat(seed, level) for seed in range(3) for level in (0.1, 52.37)]
+    + [np.full(200, 0.1), np.full(200, 123.45)]
+)
+
+
+@pytest.mark.parametrize("close", CASES)
+def test_pmarp_kernel_matches_pandas(close):
+    df = close_frame(close)
+    assert_same_result(pmarp_kernel(close), baseline.compute_pmarp(df))
+    assert_same_result(compute_pmarp(df, 20, 50), baseline.compute_pmarp(df, 20, 50))
+
+
+@pytest.mark.parametrize("close", CASES)
+def test_bb_kernel_matches_pandas(close):
+    df = close_frame(close)
+    assert_same_result(bb_kernel(close), baseline.compute_bb_percentile(df), 1e-6)
+    assert_same_result(
+        compute_bb_percentile(df, 10, 50),
+        baseline.compute_bb_percentile(df, 10, 50),
+        1e-6,
+    )
+
+
+@pytest.mark.parametrize("close", CASES)
+def test_ema_trend_kernel_matches_pandas(close):
+    df = close_frame(close)
+    assert ema_trend_kernel(close, 10, 40) == baseline.compute_ema_trend(df, 10, 40)
+    assert compute_ema_trend(df) == baseline.compute_ema_trend(df)
+
+
+def test_kernels_with_gaps():
+    close = random_closes(7)
+    close[[5, 150, 330, 398]] = np.nan
+    df = close_frame(close)
+    assert_same_result(pmarp_kernel(close), baseline.compute_pmarp(df))
+    assert_same_result(bb_kernel(close), baseline.compute_bb_percentile(df), 1e-6)
+    expected = df["Close"].ewm(span=30, adjust=False).mean().to_numpy()
+    np.testing.assert_allclose(ema_kernel(close, 30), expected)
+
+
+def test_insufficient_data():
+    close = random_closes(8, 60)
+    assert pmarp_kernel(close) is None
+    assert bb_kernel(close[:19]) is None
+
+
+def test_percentile_of_last_counts_ties():
+    values = np.array([1.0, 2.0, 2.0, 3.0, 2.0])
+    assert percentile_of_last(values) == pytest.approx(percentileofscore(values, 2.0))
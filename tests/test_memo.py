@@ -0,0 +1,50 @@
+from baseline import assert_same_result, close_frame, random_closes
+
+from fuzzy_allocator.indicator_pipeline import IndicatorPipeline
+from fuzzy_allocator.memo import IndicatorMemo, pipeline_key, run_pipeline
+
+
+def test_run_pipeline_reuses_results_until_the_closes_change():
+    memo = IndicatorMemo()
+    pipeline = IndicatorPipeline()
+    close = random_closes(0)
+    first = run_pipeline(pipeline, close_frame(close), memo)
+    again = run_pipeline(pipeline, close_frame(close.copy()), memo)
+    assert again is first
+    assert memo.stats()["hits"] == 1
+
+    close[-1] *= 1.01
+    changed = run_pipeline(pipeline, close_frame(close), memo)
+    assert memo.stats()["misses"] == 2
+    assert_same_result(changed.pmarp, pipeline.run_array(close).pmarp)
+
+
+def test_keys_separate_pipeline_settings():
+    close = random_closes(1)
+    assert pipeline_key(IndicatorPipeline(), close) != pipeline_key(
+        IndicatorPipeline(pmarp_period=20), close
+    )
+
+
+def test_least_recently_used_entry_is_evicted():
+    memo = IndicatorMemo(max_entries=2)
+    memo.put("a", 1)
+    memo.put("b", 2)
+    memo.get("a")
+    memo.put("c", 3)
+    assert memo.get("b") is None
+    assert memo.get("a") == 1 and memo.get("c") == 3
+
+
+def test_entries_persist_between_runs(tmp_path):
+    path = tmp_path / "memo" / "indicators.pkl"
+    memo = IndicatorMemo(path=path)
+    pipeline = IndicatorPipeline()
+    close = random_closes(2)
+    result = run_pipeline(pipeline, close_frame(close), memo)
+    memo.save()
+    reloaded = IndicatorMemo(path=path)
+    assert len(reloaded) == 1
+    stored = reloaded.get(pipeline_key(pipeline, close))
+    assert_same_result(stored.pmarp, result.pmarp)
+    assert_same_result(stored.bb, result.bb)
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from fuzzy_allocator.frame_cache import FrameCache
+from fuzzy_allocator.normalize import flatten_columns, normalize_frame
+from fuzzy_allocator.synthetic import generate_ohlcv
+
+
+def test_flatten_columns_leaves_the_input_untouched():
+    df = generate_ohlcv("SYN", 20, "1d", seed=1, multi_level_index=False)
+    df.columns.name = "Price"
+    flat = flatten_columns(df)
+    assert flat.columns.name is None
+    assert df.columns.name == "Price"
+
+
+def test_flatten_columns_selects_a_ticker():
+    df = generate_ohlcv("SYN", 20, "1d", seed=1)
+    flat = flatten_columns(df, "SYN")
+    assert list(flat.columns) == list(df.columns.get_level_values(0))
+    assert flat.columns.name is None
+
+
+def test_normalize_frame_sorts_and_deduplicates():
+    df = generate_ohlcv("SYN", 20, "1d", seed=2, multi_level_index=False)
+    shuffled = pd.concat([df.iloc[10:], df.iloc[:10], df.iloc[[5]]])
+    normalized = normalize_frame(shuffled, "SYN", float32=True)
+    assert normalized.index.is_monotonic_increasing
+    assert not normalized.index.has_duplicates
+    assert (normalized.dtypes == np.float32).all()
+    np.testing.assert_allclose(normalized["Close"], df["Close"], rtol=1e-6)
+
+
+def test_frame_cache_keeps_float32_apart():
+    df = generate_ohlcv("SYN", 20, "1d", seed=3, multi_level_index=False)
+    cache = FrameCache(ttls={"1d": 60})
+    cache.put("SYN", "1mo", "1d", df)
+    assert cache.get("SYN", "1mo", "1d", float32=True) is None
+    cache.put("SYN", "1mo", "1d", df.astype(np.float32), float32=True)
+    assert (cache.get("SYN", "1mo", "1d", float32=True).dtypes == np.float32).all()
+    assert cache.get("SYN", "1mo", "1d") is df
@@ -0,0 +1,106 @@
+import baseline
+import numpy as np
+import pandas as pd
+from baseline import close_frame, flat_run_closes, random_closes
+
+from fuzzy_allocator.indicator_pipeline import IndicatorPipeline
+from fuzzy_allocator.panel import close_panel, compute_panel
+from fuzzy_allocator.trading_funcs import compute_ema_crossovers
+
+
+def _universe():
+    with_gap = random_closes(3, 400)
+    with_gap[[50, 300]] = np.nan
+    closes = {
+        "CLEAN0": random_closes(0, 400),
+        "CLEAN1": random_closes(1, 500),
+        "SHORT": random_closes(2, 150),
+        "TINY": random_closes(4, 10),
+        "GAP": with_gap,
+        "FLAT_RUN": flat_run_closes(5, 0.3, n_bars=400),
+        "FLAT_RUN_LOW": flat_run_closes(6, 0.1, n_bars=450),
+        "FLAT": np.full(300, 7.77),
+    }
+    return {ticker: close_frame(close) for ticker, close in closes.items()}
+
+
+def _check_value(actual, expected, index, rtol):
+    if expected is None:
+        assert np.isnan(actual)
+    else:
+        np.testing.assert_allclose(actual, expected[index], rtol=rtol)
+
+
+def test_panel_matches_per_ticker_pandas():
+    data = _universe()
+    pipeline = IndicatorPipeline(20, 100, 20, 100, 10, 40)
+    result = compute_panel(data, pipeline)
+    assert list(result.index) == list(data)
+    for ticker, df in data.items():
+        row = result.loc[ticker]
+        pmarp = baseline.compute_pmarp(df, 20, 100)
+        bb = baseline.compute_bb_percentile(df, 20, 100)
+        assert row["Bars"] == len(df)
+        _check_value(row["PMARP"], pmarp, 0, 1e-9)
+        _check_value(row["PMARP_Percentile"], pmarp, 1, 1e-9)
+        _check_value(row["BB_Position"], bb, 0, 1e-6)
+        _check_value(row["BB_Percentile"], bb, 1, 1e-6)
+        assert row["Trend"] == baseline.compute_ema_trend(df, 10, 40), ticker
+
+
+def _last_crossover(close, short_period, long_period):
+    """
+    Brute force: walks the pandas EMAs bar by bar and records the last bar where
+    the short EMA moved to the other side of the long one.
+    """
+    close = pd.Series(close)
+    spread = (
+        close.ewm(span=short_period, adjust=False).mean()
+        - close.ewm(span=long_period, adjust=False).mean()
+    )
+    side, last = 0, None
+    for i, value in enumerate(spread):
+        new_side = int(np.sign(value)) if not np.isnan(value) else 0
+        if new_side and side and new_side != side:
+            last = ("Golden" if new_side > 0 else "Death", len(close) - 1 - i)
+        side = new_side or side
+    return last
+
+
+def test_panel_crossovers_match_per_ticker():
+    data = _universe()
+    result = compute_panel(data, IndicatorPipeline(20, 100, 20, 100, 10, 40))
+    for ticker, df in data.items():
+        row = result.loc[ticker]
+        crossovers, bars_since = compute_ema_crossovers(df, 10, 40)
+        expected = _last_crossover(df["Close"].to_numpy(), 10, 40)
+        if expected is None:
+            assert bars_since is None and crossovers.empty
+            assert row["Last_Crossover"] is None
+            assert np.isnan(row["Bars_Since_Crossover"])
+        else:
+            assert (crossovers["Crossover"].iloc[-1], bars_since) == expected
+            assert (row["Last_Crossover"], row["Bars_Since_Crossover"]) == expected
+
+
+def test_close_panel_aligns_on_the_latest_bar():
+    data = {"A": close_frame([1.0, 2.0, 3.0]), "B": close_frame([4.0])}
+    panel, tickers = close_panel(data)
+    assert tickers == ["A", "B"]
+    np.testing.assert_array_equal(panel[:, 0], [1.0, 2.0, 3.0])
+    assert np.isnan(panel[:2, 1]).all() and panel[2, 1] == 4.0
+    short, _ = close_panel(data, length=2)
+    np.testing.assert_array_equal(short[:, 0], [2.0, 3.0])
+
+
+def test_empty_universe():
+    result = compute_panel({})
+    assert result.empty
+    assert isinstance(result, pd.DataFrame)
+
+
+def test_tickers_without_bars():
+    data = {"EMPTY": close_frame([]), "ONE": close_frame([1.0])}
+    result = compute_panel(data)
+    assert list(result["Bars"]) == [0, 1]
+    assert result["PMARP"].isna().all()
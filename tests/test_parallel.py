@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from baseline import assert_same_result, close_frame, random_closes
+
+from fuzzy_allocator.indicator_pipeline import IndicatorPipeline
+from fuzzy_allocator.memo import IndicatorMemo
+from fuzzy_allocator.parallel import SharedPrices, analyze_parallel
+from fuzzy_allocator.signals import evaluate_signals
+from fuzzy_allocator.synthetic import generate_universe
+
+PIPELINE = IndicatorPipeline(20, 100, 20, 100, 10, 40)
+
+
+def _assert_same_analysis(actual, expected):
+    assert_same_result(actual.indicators.pmarp, expected.indicators.pmarp)
+    assert_same_result(actual.indicators.bb, expected.indicators.bb)
+    assert actual.indicators.trend == expected.indicators.trend
+    assert actual.final == expected.final
+
+
+def test_matches_serial_analysis():
+    data = dict(generate_universe(9, seed=0, n_bars=300, interval="1d"))
+    results = analyze_parallel(data, processes=2, pipeline=PIPELINE)
+    assert list(results) == list(data)
+    for ticker, df in data.items():
+        _assert_same_analysis(results[ticker], evaluate_signals(PIPELINE.run(df)))
+
+
+def test_close_only_frames():
+    data = {f"T{i}": close_frame(random_closes(i, 250)) for i in range(3)}
+    with SharedPrices(data) as shared:
+        assert shared.columns == ["Close"]
+        np.testing.assert_array_equal(
+            shared.prices()[0, slice(*shared.bounds[1])], data["T1"]["Close"]
+        )
+    results = analyze_parallel(data, processes=2, pipeline=PIPELINE)
+    for ticker, df in data.items():
+        _assert_same_analysis(results[ticker], evaluate_signals(PIPELINE.run(df)))
+
+
+def test_missing_close_column():
+    data = {"A": close_frame(random_closes(0, 10)).rename(columns={"Close": "Open"})}
+    with pytest.raises(KeyError):
+        SharedPrices(data)
+
+
+def test_memo_hits_are_not_dispatched():
+    data = {f"T{i}": close_frame(random_closes(i, 250)) for i in range(4)}
+    memo = IndicatorMemo()
+    first = analyze_parallel(data, processes=2, pipeline=PIPELINE, memo=memo)
+    assert len(memo) == 4
+    again = analyze_parallel(data, processes=2, pipeline=PIPELINE, memo=memo)
+    assert memo.stats()["hits"] == 4
+    for ticker in data:
+        _assert_same_analysis(again[ticker], first[ticker])
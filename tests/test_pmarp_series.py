@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+from baseline import close_frame, compute_pmarp, random_closes
+from scipy.stats import percentileofscore
+
+from fuzzy_allocator.trading_funcs import compute_pmarp_series, rolling_percentile_rank
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_series_matches_pmarp_on_every_prefix(seed):
+    df = close_frame(random_closes(seed, 260))
+    series = compute_pmarp_series(df, ma_period=20, lookback=50)
+    for end in range(1, len(df) + 1):
+        expected = compute_pmarp(df.iloc[:end], ma_period=20, lookback=50)
+        if expected is None:
+            assert np.isnan(series.iloc[end - 1])
+        else:
+            assert series.iloc[end - 1] == pytest.approx(expected[1])
+
+
+def test_rolling_rank_counts_ties_like_percentileofscore():
+    values = np.random.default_rng(0).integers(0, 5, 200).astype(float)
+    ranks = rolling_percentile_rank(values, 30)
+    assert np.isnan(ranks[:29]).all()
+    for i in range(29, 200):
+        window = values[i - 29 : i + 1]
+        assert ranks[i] == pytest.approx(percentileofscore(window, window[-1]))
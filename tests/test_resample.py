@@ -0,0 +1,91 @@
+from collections import defaultdict
+
+import pandas as pd
+import pytest
+
+from fuzzy_allocator.data_sources import InMemorySource
+from fuzzy_allocator.fetch_historical_data import download_multi_interval
+from fuzzy_allocator.resample import resample_ohlcv
+from fuzzy_allocator.synthetic import generate_ohlcv
+
+
+def _hourly(n_bars=70, start="2024-03-04"):
+    # Two weeks of 1h bars, the DST change falling on the weekend between them
+    return generate_ohlcv(
+        "AAA", n_bars, "1h", seed=9, start=start, multi_level_index=False
+    )
+
+
+def _label(ts, interval):
+    """
+    Start of the bin `ts` falls in, worked out on its wall-clock time.
+    """
+    day = ts.tz_localize(None).normalize()
+    if interval == "4h":
+        session_open = (day + pd.Timedelta(hours=9, minutes=30)).tz_localize(ts.tz)
+        return session_open + pd.Timedelta(hours=4) * (
+            (ts - session_open) // pd.Timedelta(hours=4)
+        )
+    if interval == "1d":
+        return day
+    return day - pd.Timedelta(days=day.weekday())
+
+
+def _expected(df, interval):
+    bins = defaultdict(list)
+    for ts, row in df.iterrows():
+        bins[_label(ts, interval)].append(row)
+    rows = {
+        label: {
+            "Close": rows[-1]["Close"],
+            "High": max(row["High"] for row in rows),
+            "Low": min(row["Low"] for row in rows),
+            "Open": rows[0]["Open"],
+            "Volume": sum(row["Volume"] for row in rows),
+        }
+        for label, rows in bins.items()
+    }
+    return pd.DataFrame.from_dict(rows, orient="index")
+
+
+@pytest.mark.parametrize("interval", ["4h", "1d", "1wk"])
+def test_resample_matches_hand_built_bins(interval):
+    df = _hourly()
+    resampled = resample_ohlcv(df, interval)
+    pd.testing.assert_frame_equal(
+        resampled,
+        _expected(df, interval),
+        check_names=False,
+        check_dtype=False,
+        check_freq=False,
+        check_index_type=False,
+    )
+
+
+def test_four_hour_bins_start_at_the_open_across_dst():
+    resampled = resample_ohlcv(_hourly(), "4h")
+    local = {ts.strftime("%H:%M") for ts in resampled.index}
+    assert local == {"09:30", "13:30"}
+    assert resampled.index.name == "Datetime"
+    assert str(resampled.index.tz) == "America/New_York"
+    # Ten sessions of two bins each
+    assert len(resampled) == 20
+
+
+def test_partial_last_bin():
+    df = _hourly(n_bars=9)
+    daily = resample_ohlcv(df, "1d")
+    assert len(daily) == 2
+    assert daily["Close"].iloc[-1] == df["Close"].iloc[-1]
+    assert daily["Open"].iloc[-1] == df["Open"].iloc[7]
+
+
+def test_download_multi_interval():
+    df = _hourly()
+    source = InMemorySource({"AAA": df})
+    data = download_multi_interval(["AAA"], "1mo", ["1h", "1d"], source=source)
+    hourly = data["1h"]["AAA"]
+    assert len(hourly) == len(df)
+    pd.testing.assert_frame_equal(data["1d"]["AAA"], resample_ohlcv(hourly, "1d"))
+    with pytest.raises(ValueError):
+        download_multi_interval(["AAA"], "1mo", ["15m", "1h"], source=source)
@@ -0,0 +1,28 @@
+from baseline import close_frame, random_closes
+
+from fuzzy_allocator.indicator_pipeline import IndicatorPipeline
+from fuzzy_allocator.screener import buy_score, sell_score, top_k
+
+
+def _stream(n):
+    for i in range(n):
+        yield f"T{i}", close_frame(random_closes(i, 300))
+
+
+def test_top_k_matches_a_full_sort():
+    pipeline = IndicatorPipeline(20, 100, 20, 100, 10, 40)
+    for score in (buy_score, sell_score):
+        everything = top_k(_stream(40), k=40, score=score, pipeline=pipeline)
+        best = top_k(_stream(40), k=5, score=score, pipeline=pipeline)
+        assert len(everything) == 40
+        assert best == everything[:5]
+        assert [r.score for r in everything] == sorted(
+            (r.score for r in everything), reverse=True
+        )
+
+
+def test_tickers_without_enough_data_are_skipped(capsys):
+    stream = [("SHORT", close_frame(random_closes(0, 50))), *_stream(2)]
+    results = top_k(stream, k=5, pipeline=IndicatorPipeline(20, 100, 20, 100))
+    assert sorted(r.ticker for r in results) == ["T0", "T1"]
+    assert "SHORT" in capsys.readouterr().out
@@ -0,0 +1,85 @@
+import numpy as np
+
+from fuzzy_allocator.fetch import (
+    generate_buy_signal,
+    generate_final_signal,
+    generate_take_profit_signal,
+)
+from fuzzy_allocator.signals import (
+    FinalSignal,
+    buy_signal,
+    classify_buy,
+    classify_final,
+    classify_take_profit,
+    final_signal,
+    final_signal_labels,
+    take_profit_signal,
+)
+
+
+def _percentiles(rng, n):
+    # Whole numbers hit the thresholds exactly; NaN marks missing indicators
+    values = rng.integers(0, 101, n).astype(float)
+    values[rng.random(n) < 0.05] = np.nan
+    return values
+
+
+def test_classify_final_matches_final_signal():
+    rng = np.random.default_rng(0)
+    n = 5_000
+    pmarp, bb = _percentiles(rng, n), _percentiles(rng, n)
+    # Per-ticker thresholds, some crossing so that Buy and Sell both hold
+    buy = rng.integers(10, 60, n).astype(float)
+    sell = rng.integers(40, 95, n).astype(float)
+    codes = classify_final(pmarp, bb, buy, sell)
+    expected = [final_signal(*args) for args in zip(pmarp, bb, buy, sell)]
+    np.testing.assert_array_equal(codes, expected)
+    shared = classify_final(pmarp, bb)
+    np.testing.assert_array_equal(
+        shared, [final_signal(p, b) for p, b in zip(pmarp, bb)]
+    )
+
+
+def test_classify_take_profit_and_buy_match_the_scalar_signals():
+    rng = np.random.default_rng(1)
+    pmarp = _percentiles(rng, 2_000)
+    np.testing.assert_array_equal(
+        classify_take_profit(pmarp), [take_profit_signal(p).level for p in pmarp]
+    )
+    np.testing.assert_array_equal(
+        classify_buy(pmarp, 30), [bool(buy_signal(p, 30)) for p in pmarp]
+    )
+
+
+def test_final_signal_labels():
+    codes = np.array([FinalSignal.BUY, FinalSignal.HOLD, FinalSignal.SELL])
+    assert list(final_signal_labels(codes)) == ["Buy", "Hold", "Sell"]
+
+
+def test_messages_match_the_original_strings():
+    for p in [0.0, 12.5, 25.0, 25.04, 50.0, 74.96, 75.0, 89.9, 90.0, 100.0]:
+        if p >= 90:
+            take_profit = (
+                f"Long-term signal: PMARP percentile at {p:.1f}%. "
+                "Consider selling (take profit)."
+            )
+        elif p >= 75:
+            take_profit = (
+                f"Standard signal: PMARP percentile at {p:.1f}%. "
+                "Potential take profit signal."
+            )
+        else:
+            take_profit = f"No take profit signal: PMARP percentile at {p:.1f}%."
+        if p <= 25:
+            buy = (
+                f"Buy signal: PMARP percentile is {p:.1f}%, which is below the buy "
+                "threshold of 25%."
+            )
+        else:
+            buy = f"No buy signal: PMARP percentile is {p:.1f}% (buy threshold is 25%)."
+        assert generate_take_profit_signal(p) == take_profit
+        assert generate_buy_signal(p) == buy
+        assert generate_final_signal(p, p) == (
+            "Buy" if p <= 25 else "Sell" if p >= 90 else "Hold"
+        )
+        assert f"{final_signal(p, 50.0)}" == "Hold"
@@ -0,0 +1,48 @@
+from collections import deque
+
+import numpy as np
+import pytest
+from scipy.stats import percentileofscore
+
+from fuzzy_allocator import trading_funcs
+from fuzzy_allocator.trading_funcs import rolling_percentile_rank
+from fuzzy_allocator.utils.sorted_window import SortedWindow
+
+
+@pytest.mark.parametrize("load", [None, 2])
+def test_matches_a_brute_force_window(load):
+    rng = np.random.default_rng(0)
+    window = SortedWindow(50, load=load)
+    reference = deque(maxlen=50)
+    # Few distinct values, so ties and block splits are exercised
+    for value in rng.integers(0, 20, 2000).astype(float).tolist():
+        expected_eviction = reference[0] if len(reference) == 50 else None
+        assert window.push(value) == expected_eviction
+        reference.append(value)
+        assert len(window) == len(reference)
+        assert window.count_less(value) == sum(v < value for v in reference)
+        assert window.count_less_equal(value) == sum(v <= value for v in reference)
+        assert window.percentile_rank(value) == pytest.approx(
+            percentileofscore(list(reference), value)
+        )
+    assert window.full
+    assert window.oldest() == reference[0]
+
+
+def test_empty_window():
+    window = SortedWindow(3)
+    with pytest.raises(IndexError):
+        window.percentile_rank(1.0)
+    window.push(1.0)
+    window.clear()
+    assert len(window) == 0
+    with pytest.raises(ValueError):
+        SortedWindow(0)
+
+
+def test_rolling_rank_paths_agree(monkeypatch):
+    values = np.random.default_rng(1).normal(size=600).round(1)
+    vectorized = rolling_percentile_rank(values, 64)
+    monkeypatch.setattr(trading_funcs, "_SORTED_WINDOW_MIN_LOOKBACK", 1)
+    sorted_window = rolling_percentile_rank(values, 64)
+    np.testing.assert_allclose(sorted_window, vectorized)
@@ -0,0 +1,82 @@
+import time
+
+import pytest
+
+from fuzzy_allocator.staged_pipeline import Stage, StageError, run_stages
+
+
+def _jittered(value):
+    # Later items finish first, so ordering has to be restored
+    time.sleep(0.001 * (value % 5))
+    return value
+
+
+def test_items_reach_the_sink_in_input_order():
+    seen = []
+    stages = [Stage("slow", _jittered, workers=4), Stage("double", lambda v: 2 * v)]
+    errors = run_stages(
+        ((i, i) for i in range(50)), stages, lambda k, v: seen.append((k, v))
+    )
+    assert not errors
+    assert seen == [(i, 2 * i) for i in range(50)]
+
+
+def test_unordered_delivers_every_item():
+    seen = []
+    stages = [Stage("slow", _jittered, workers=4)]
+    run_stages(
+        ((i, i) for i in range(30)), stages, lambda k, v: seen.append(k), ordered=False
+    )
+    assert sorted(seen) == list(range(30))
+
+
+def test_failed_item_skips_later_stages():
+    def fail_on_three(value):
+        if value == 3:
+            raise RuntimeError("boom")
+        return value
+
+    calls = []
+
+    def record(value):
+        calls.append(value)
+        return value
+
+    seen = {}
+    stages = [Stage("check", fail_on_three, workers=2), Stage("record", record)]
+    errors = run_stages(((i, i) for i in range(6)), stages, seen.__setitem__)
+    assert list(errors) == [3]
+    assert errors[3].stage == "check"
+    assert isinstance(seen[3], StageError)
+    assert 3 not in calls and sorted(calls) == [0, 1, 2, 4, 5]
+
+
+def test_stage_needs_a_worker():
+    with pytest.raises(ValueError):
+        Stage("none", lambda v: v, workers=0)
+    with pytest.raises(ValueError):
+        Stage("no queue", lambda v: v, maxsize=0)
+
+
+def test_reorder_buffer_is_bounded():
+    fed = []
+    fed_while_held = []
+
+    def items():
+        for i in range(40):
+            fed.append(i)
+            yield i, i
+
+    def hold_first(value):
+        # Every later item could finish and queue up behind the first one
+        if value == 0:
+            time.sleep(0.2)
+            fed_while_held.append(len(fed))
+        return value
+
+    seen = []
+    stages = [Stage("hold", hold_first, workers=4, maxsize=2)]
+    run_stages(items(), stages, lambda k, v: seen.append(k), max_in_flight=5)
+    assert seen == list(range(40))
+    # The feeder pulls one item ahead, then waits for a free slot
+    assert fed_while_held[0] <= 6
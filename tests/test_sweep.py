@@ -0,0 +1,111 @@
+import baseline
+import numpy as np
+import pandas as pd
+import pytest
+from baseline import close_frame, flat_run_closes, random_closes
+
+from fuzzy_allocator.sweep import (
+    sweep_bb_percentile,
+    sweep_bb_percentile_series,
+    sweep_pmarp,
+    sweep_pmarp_series,
+)
+
+MA_PERIODS = [5, 10, 20]
+LOOKBACKS = [30, 60]
+
+
+def _with_gaps(close):
+    close = close.copy()
+    close[[20, 150, 290]] = np.nan
+    return close
+
+
+CASES = {
+    "random": random_closes(0, 300),
+    "gaps": _with_gaps(random_closes(1, 300)),
+    "flat_run": flat_run_closes(2, 0.1, n_bars=300, run=50),
+    "flat_run_gaps": _with_gaps(flat_run_closes(3, 0.3, n_bars=300, run=50)),
+}
+
+
+def _check_grid(grid, reference, df, rtol):
+    for (ma_period, lookback), row in grid.iterrows():
+        expected = reference(df, ma_period, lookback)
+        if expected is None:
+            assert row.isna().all()
+        else:
+            np.testing.assert_allclose(row.to_numpy(), expected, rtol=rtol)
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_sweep_pmarp(name):
+    df = close_frame(CASES[name])
+    grid = sweep_pmarp(df, MA_PERIODS, LOOKBACKS)
+    _check_grid(grid, baseline.compute_pmarp, df, 1e-9)
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_sweep_bb_percentile(name):
+    df = close_frame(CASES[name])
+    grid = sweep_bb_percentile(df, MA_PERIODS, LOOKBACKS)
+    _check_grid(grid, baseline.compute_bb_percentile, df, 1e-6)
+
+
+def _bar_values(close, ma_period):
+    """
+    The PMARP ratio and Bollinger Bands position of every bar, NaN where the
+    bar's own window is incomplete, gapped or flat.
+    """
+    close = pd.Series(close)
+    ma = close.rolling(ma_period).mean()
+    std = close.rolling(ma_period).std()
+    return close / ma, (close - (ma - 2 * std)) / (4 * std)
+
+
+@pytest.mark.parametrize("name", CASES)
+def test_series_sweeps_match_every_prefix(name):
+    df = close_frame(CASES[name])
+    pmarp = sweep_pmarp_series(df, [10], [30])[(10, 30)].to_numpy()
+    bb = sweep_bb_percentile_series(df, [10], [30])[(10, 30)].to_numpy()
+    ratios, positions = _bar_values(CASES[name], 10)
+    for series, bar_values, reference in (
+        (pmarp, ratios, baseline.compute_pmarp),
+        (bb, positions, baseline.compute_bb_percentile),
+    ):
+        for end in range(1, len(df) + 1, 3):
+            expected = reference(df.iloc[:end], 10, 30)
+            # The series only has a value on bars that add one to the history
+            if expected is None or np.isnan(bar_values.iloc[end - 1]):
+                assert np.isnan(series[end - 1])
+            else:
+                assert series[end - 1] == pytest.approx(expected[1], rel=1e-6)
+
+
+def test_sweeps_on_a_long_drifting_history():
+    # Prices drifting from 500 down to about 1 over many bars: sums over the
+    # whole history would lose the precision the late windows need
+    rng = np.random.default_rng(11)
+    n_bars = 300_000
+    close = 500 * np.exp(np.cumsum(rng.normal(np.log(0.01) / n_bars, 0.002, n_bars)))
+    # Minute bars: a daily index would run past the last representable date
+    index = pd.date_range("2020-01-01", periods=n_bars, freq="min")
+    df = pd.DataFrame({"Close": close}, index=index)
+    # pandas' own running sums drift over the whole history as well, so the
+    # reference only sees a recent stretch of it, which is all the windows need
+    recent = df.iloc[-500:]
+    for sweep, reference, rtol in (
+        (sweep_pmarp, baseline.compute_pmarp, 1e-9),
+        (sweep_bb_percentile, baseline.compute_bb_percentile, 1e-6),
+    ):
+        _check_grid(sweep(df, MA_PERIODS, LOOKBACKS), reference, recent, rtol)
+
+    pmarp = sweep_pmarp_series(df, [20], [100])[(20, 100)].to_numpy()
+    bb = sweep_bb_percentile_series(df, [20], [100])[(20, 100)].to_numpy()
+    for series, reference in (
+        (pmarp, baseline.compute_pmarp),
+        (bb, baseline.compute_bb_percentile),
+    ):
+        for end in range(n_bars - 300, n_bars + 1):
+            expected = reference(df.iloc[end - 500 : end], 20, 100)
+            assert series[end - 1] == pytest.approx(expected[1], rel=1e-6)
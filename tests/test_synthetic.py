@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from fuzzy_allocator.synthetic import generate_ohlcv, generate_universe, synthetic_index
+
+
+def test_same_seed_same_bars():
+    first = generate_ohlcv("AAA", 200, "1h", seed=3, gap_prob=0.2)
+    pd.testing.assert_frame_equal(
+        first, generate_ohlcv("AAA", 200, "1h", seed=3, gap_prob=0.2)
+    )
+    other = generate_ohlcv("AAA", 200, "1h", seed=4, gap_prob=0.2)
+    assert not np.allclose(first["Close"], other["Close"])
+
+
+def test_shape_like_yfinance():
+    df = generate_ohlcv("AAA", 50, "1d", seed=0)
+    assert df.columns.names == ["Price", "Ticker"]
+    assert df.index.name == "Date" and df.index.tz is None
+    close, high, low, open_ = (df[c]["AAA"] for c in ["Close", "High", "Low", "Open"])
+    assert (high >= np.maximum(open_, close)).all()
+    assert (low <= np.minimum(open_, close)).all()
+
+    hourly = synthetic_index(14, "1h", start="2024-03-08")
+    assert hourly.name == "Datetime" and str(hourly.tz) == "America/New_York"
+    # Sessions open at 09:30 local time on both sides of the March DST change
+    opens = hourly[::7]
+    assert [ts.strftime("%a %H:%M") for ts in opens] == ["Fri 09:30", "Mon 09:30"]
+
+
+def test_universe_tickers_do_not_depend_on_universe_size():
+    small = dict(generate_universe(3, seed=11, n_bars=60))
+    large = dict(generate_universe(8, seed=11, n_bars=60))
+    assert list(small) == ["SYN00000", "SYN00001", "SYN00002"]
+    for ticker, df in small.items():
+        pd.testing.assert_frame_equal(df, large[ticker])
+    assert not small["SYN00000"].equals(small["SYN00001"])
+
+
+def test_long_histories_fall_back_to_second_resolution():
+    assert synthetic_index(1_000, "1d").unit == "ns"
+    # Business days from 2000 run past the nanosecond limit in 2262
+    long = synthetic_index(70_000, "1d")
+    assert long.unit == "s"
+    assert long[-1].year > 2262
+    assert long.is_monotonic_increasing and long.is_unique